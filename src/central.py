@@ -1,22 +1,54 @@
+import argparse
+import os
 from collections import defaultdict
 from datetime import datetime
 from pathlib import Path
+from typing import Optional
 
 import matplotlib
 matplotlib.use("Agg")
-import matplotlib.pyplot as plt
 import networkx as nx
 import numpy as np
 import pandas as pd
 from tqdm import tqdm
 
 import shopy as sp
-from shopy import ExtractFilesInfo, GetName, path_config
+from shopy import (
+    IMPORT_MODES,
+    CentralityMatrix,
+    CentralityPlotRenderer,
+    DependencyGraphBuilder,
+    GetName,
+    GitSnapshotReader,
+    JavaAnalyzerPool,
+    JavaFileInfo,
+    PageRankEngine,
+    ParseCache,
+    PipelineRunner,
+    SnapshotScheduler,
+    Stage,
+    path_config,
+    select_classes,
+)
+from shopy.utils.java_info import REFERENCES_VERSION
+
+
+# main で実行できるステージ（実行順）
+PIPELINE_STAGES = ["metadata", "dependency", "centrality", "timeseries", "plot"]
 
 
 class CalcCentrality:
+    def __init__(self):
+        # スナップショット間でファイルごとのエンコーディングを覚えておくため使い回す
+        self.get_name = GetName()
+
     def write_repo_metadata(
-        self, input_dir: Path, start_date: str, end_date: str, output_dir: Path
+        self,
+        input_dir: Path,
+        start_date: str,
+        end_date: str,
+        output_dir: Path,
+        granularity: str = "month",
     ) -> None:
         """リポジトリの月次データを取得し、CSVに保存する
 
@@ -24,12 +56,14 @@ class CalcCentrality:
             input_dir (Path): リポジトリまでのパス
             start_date (str): 収集の開始日
             end_date (str): 収集の終了日
+            granularity (str, optional): 集計単位（day, week, month, quarter）. Defaults to "month".
         """
         # リポジトリの月次データを取得
         filtered_hashes, filtered_dates = sp.get_monthly_commits(
             repo_path=input_dir,
             start_date=start_date,
             end_date=end_date,
+            granularity=granularity,
         )
         # CSVに保存
         repo_metadata_df = pd.DataFrame(
@@ -71,90 +105,438 @@ class CalcCentrality:
         max_files: int = 20000,
         output_dir: Path = path_config.CENTRALITY_DATA_DIR,
         state: str = "HEAD",
-    ) -> None:
+        reader: Optional[GitSnapshotReader] = None,
+        cache: Optional[ParseCache] = None,
+        jobs: int = 1,
+        parser: str = "full",
+        output_format: str = "json",
+        references: bool = False,
+        analyzer: Optional[JavaAnalyzerPool] = None,
+    ) -> dict[str, dict]:
         """ファイルの依存関係を取得する
 
+        リポジトリを state の状態に戻すのではなく、git のオブジェクトから
+        直接ファイル内容を読み出すため、ワークツリーは変更しない。
+        cache を渡すと、以前のスナップショットで解析済みの blob はパースしない。
+
         Args:
             cwd (Path, optional): リポジトリまでのパス. Defaults to path_config.REPO_DIR.
             language (str, optional): 対象言語. Defaults to "java".
             max_files (int, optional): 最大ファイル数. Defaults to 20000.
+            state (str, optional): 対象のコミット. Defaults to "HEAD".
+            reader (Optional[GitSnapshotReader], optional): 使い回すスナップショットリーダー
+            cache (Optional[ParseCache], optional): blobハッシュをキーにした解析結果のキャッシュ
+            jobs (int, optional): パースに使うプロセス数. Defaults to 1.
+            parser (str, optional): "full"（構文解析）か "header"（先頭の宣言のみ）. Defaults to "full".
+            output_format (str, optional): "json" か "binary"（write_dependency の形式）. Defaults to "json".
+            references (bool, optional): 同じパッケージのクラスへの参照を調べるため、
+                本文の型名らしい識別子を "ref" に記録するか. Defaults to False.
+            analyzer (Optional[JavaAnalyzerPool], optional): 使い回すプロセスプール。
+                指定しない場合、jobs が2以上なら呼び出しごとに起動する. Defaults to None.
 
         Returns:
             dict: ファイルの依存関係
         """
-        # コミットハッシュの状態にリポジトリを戻す
-        sp.reset_repo_state(
-            repo_path=path_config.REPO_DIR,
-            commit_hash=state,
-        )
+        reader = reader or GitSnapshotReader(input_dir)
 
-        # ファイル情報を取得
-        ef = ExtractFilesInfo(path_config.REPO_DIR, path_config.DATA_DIR)
-        file_df = ef.extract_file_info(cwd=input_dir, language=language)
-
-        # ファイルのパスを取得
-        file_paths: list[Path] = [
-            Path(f) for f in file_df[path_config.EXISTING_FILE_COLUMNS].tolist()
-        ]
+        # コミット時点のファイル情報を取得
+        file_entries = reader.list_files(commit_hash=state, language=language)
 
         # データ数が多い場合はサンプリング
         sampled_files = (
-            file_paths[:max_files] if len(file_paths) > max_files else file_paths
+            file_entries[:max_files] if len(file_entries) > max_files else file_entries
+        )
+
+        blob_infos = self._analyze_entries(
+            sampled_files, input_dir, reader, cache, jobs, parser, references, analyzer
+        )
+        processed_file_dependency: dict[str, dict] = {
+            file_path: self._dependency_entry(blob_infos[blob_hash], references)
+            for file_path, blob_hash in sampled_files
+        }
+
+        self._write_dependency(processed_file_dependency, output_dir, output_format)
+        return processed_file_dependency
+
+    def update_dependency(
+        self,
+        previous_dependency: dict[str, dict],
+        previous_state: str,
+        input_dir: Path = path_config.REPO_DIR,
+        language: str = "java",
+        max_files: int = 20000,
+        output_dir: Path = path_config.CENTRALITY_DATA_DIR,
+        state: str = "HEAD",
+        reader: Optional[GitSnapshotReader] = None,
+        cache: Optional[ParseCache] = None,
+        jobs: int = 1,
+        parser: str = "full",
+        output_format: str = "json",
+        references: bool = False,
+        analyzer: Optional[JavaAnalyzerPool] = None,
+    ) -> dict[str, dict]:
+        """前のコミットの依存関係から差分だけを解析して依存関係を更新する
+
+        `git diff-tree` で得た追加・削除・変更・リネームを previous_dependency に
+        適用し、変更されたファイルだけを解析する。ファイル数が max_files に
+        達する場合はサンプリング結果が変わるため、build_dependency で作り直す。
+
+        Args:
+            previous_dependency (dict[str, dict]): previous_state 時点の依存関係
+            previous_state (str): previous_dependency を作成したコミット
+            その他の引数は build_dependency と同じ
+
+        Returns:
+            dict: ファイルの依存関係
+        """
+        reader = reader or GitSnapshotReader(input_dir)
+        changes = reader.diff_files(previous_state, state, language=language)
+
+        removed = {change.old_path for change in changes if change.old_path}
+        added = {
+            change.new_path: change.new_blob for change in changes if change.new_path
+        }
+        file_count = len(previous_dependency.keys() - removed) + len(added)
+        # 参照を記録していない依存関係からは差分更新できない
+        missing_references = references and any(
+            "ref" not in info for info in previous_dependency.values()
         )
+        if (
+            len(previous_dependency) >= max_files
+            or file_count > max_files
+            or missing_references
+        ):
+            return self.build_dependency(
+                input_dir=input_dir,
+                language=language,
+                max_files=max_files,
+                output_dir=output_dir,
+                state=state,
+                reader=reader,
+                cache=cache,
+                jobs=jobs,
+                parser=parser,
+                output_format=output_format,
+                references=references,
+                analyzer=analyzer,
+            )
+
+        blob_infos = self._analyze_entries(
+            list(added.items()),
+            input_dir,
+            reader,
+            cache,
+            jobs,
+            parser,
+            references,
+            analyzer,
+        )
+        file_dependency = {
+            file_path: info
+            for file_path, info in previous_dependency.items()
+            if file_path not in removed
+        }
+        for file_path, blob_hash in added.items():
+            file_dependency[file_path] = self._dependency_entry(
+                blob_infos[blob_hash], references
+            )
+
+        # build_dependency と同じく git のパス順に並べる
+        processed_file_dependency = {
+            file_path: file_dependency[file_path]
+            for file_path in sorted(file_dependency, key=os.fsencode)
+        }
+        self._write_dependency(processed_file_dependency, output_dir, output_format)
+        return processed_file_dependency
+
+    def build_dependency_series(
+        self,
+        commit_hashes: list[str],
+        output_dirs: list[Path],
+        input_dir: Path = path_config.REPO_DIR,
+        incremental: bool = True,
+        workers: int = 1,
+        **kwargs,
+    ) -> None:
+        """複数のコミットの依存関係を順に作成する
 
-        # ファイル内のpackageとimportを取得
-        get_name = GetName()
-        file_dependency: dict[Path, dict[str, object]] = {
-            file_path: {
-                "fqn": get_name.find_fqn(
-                    input_dir, file_path, path_config.PACKAGE_PREFIX
+        incremental が True の場合、最初のコミットのみ全ファイルを解析し、
+        以降は直前のコミットとの差分だけを解析する。
+        workers が2以上の場合は、コミットを workers 個の連続したブロックに分けて
+        ブロックごとに別プロセスで作成する（各ブロックの先頭は全ファイルを解析する）。
+        各コミットの出力は並列数によらず同じになる。
+        jobs が2以上の場合、パースのプロセスプールは系列（ブロック）ごとに1回だけ起動する。
+
+        Args:
+            commit_hashes (list[str]): 古い順のコミットハッシュ
+            output_dirs (list[Path]): 各コミットの依存関係JSONの出力先
+            input_dir (Path, optional): リポジトリまでのパス. Defaults to path_config.REPO_DIR.
+            incremental (bool, optional): 差分更新を行うか. Defaults to True.
+            workers (int, optional): 同時に処理するコミット数. Defaults to 1.
+            **kwargs: build_dependency に渡す引数
+        """
+        if workers > 1:
+            # リーダーとキャッシュの接続、プロセスプールはプロセス間で共有できないため、
+            # ワーカーごとに開く
+            kwargs.pop("reader", None)
+            kwargs.pop("analyzer", None)
+            cache = kwargs.pop("cache", None)
+            SnapshotScheduler(workers).run(
+                _build_dependency_block,
+                list(zip(commit_hashes, output_dirs)),
+                input_dir=input_dir,
+                incremental=incremental,
+                cache_config=(
+                    None
+                    if cache is None
+                    else (cache.db_path, cache.max_entries, cache.variant)
                 ),
-                "imp": get_name.extract_imports(input_dir, file_path),
+                **kwargs,
+            )
+            return
+
+        reader = kwargs.pop("reader", None) or GitSnapshotReader(input_dir)
+        analyzer = kwargs.pop("analyzer", None)
+        owned_analyzer = analyzer is None and kwargs.get("jobs", 1) > 1
+        if owned_analyzer:
+            analyzer = JavaAnalyzerPool(
+                jobs=kwargs["jobs"],
+                parser=kwargs.get("parser", "full"),
+                references=kwargs.get("references", False),
+            )
+        previous: Optional[tuple[str, dict[str, dict]]] = None
+        try:
+            for commit_hash, output_dir in tqdm(
+                zip(commit_hashes, output_dirs),
+                total=len(commit_hashes),
+                desc="依存関係を作成中",
+                leave=False,
+            ):
+                if incremental and previous is not None:
+                    dependency = self.update_dependency(
+                        previous_dependency=previous[1],
+                        previous_state=previous[0],
+                        input_dir=input_dir,
+                        output_dir=output_dir,
+                        state=commit_hash,
+                        reader=reader,
+                        analyzer=analyzer,
+                        **kwargs,
+                    )
+                else:
+                    dependency = self.build_dependency(
+                        input_dir=input_dir,
+                        output_dir=output_dir,
+                        state=commit_hash,
+                        reader=reader,
+                        analyzer=analyzer,
+                        **kwargs,
+                    )
+                previous = (commit_hash, dependency)
+        finally:
+            if owned_analyzer:
+                print(analyzer.report())
+                analyzer.close()
+
+    def _write_dependency(
+        self, file_dependency: dict[str, dict], output_dir: Path, output_format: str
+    ) -> None:
+        """依存関係を指定した形式で保存する
+
+        Args:
+            file_dependency (dict[str, dict]): ファイルの依存関係
+            output_dir (Path): JSONファイル、またはバイナリ形式のディレクトリのパス
+            output_format (str): "json" か "binary"
+        """
+        if output_format == "json":
+            sp.write_json(dict=file_dependency, output_dir=output_dir)
+        elif output_format == "binary":
+            sp.write_dependency(file_dependency, output_dir)
+        else:
+            raise ValueError(f"未対応の出力形式です: {output_format}")
+
+    def _analyze_entries(
+        self,
+        file_entries: list[tuple[str, str]],
+        input_dir: Path,
+        reader: GitSnapshotReader,
+        cache: Optional[ParseCache],
+        jobs: int,
+        parser: str,
+        references: bool = False,
+        analyzer: Optional[JavaAnalyzerPool] = None,
+    ) -> dict[str, JavaFileInfo]:
+        """ファイルを解析し、blobハッシュごとの解析結果を返す
+
+        Args:
+            file_entries (list[tuple[str, str]]): (ファイルパス, blobハッシュ) のリスト
+            input_dir (Path): リポジトリまでのパス
+            reader (GitSnapshotReader): スナップショットリーダー
+            cache (Optional[ParseCache]): blobハッシュをキーにした解析結果のキャッシュ
+            jobs (int): パースに使うプロセス数
+            parser (str): 解析方法
+            references (bool, optional): 型名らしい識別子も収集するか. Defaults to False.
+            analyzer (Optional[JavaAnalyzerPool], optional): 使い回すプロセスプール（閉じるのは呼び出し元）.
+                Defaults to None（jobs が2以上なら、この呼び出しの間だけ起動する）.
+
+        Returns:
+            dict[str, JavaFileInfo]: blobハッシュと解析結果
+        """
+        if cache is not None and cache.variant != parser:
+            raise ValueError(
+                f"キャッシュ（{cache.variant}）と解析方法（{parser}）が一致しません"
+            )
+        if analyzer is not None and (
+            analyzer.parser != parser or analyzer.references != references
+        ):
+            raise ValueError("プロセスプールと解析方法が一致しません")
+
+        # 解析済みの blob はキャッシュから取得する
+        blob_infos: dict[str, JavaFileInfo] = (
+            cache.get_many(blob_hash for _, blob_hash in file_entries)
+            if cache is not None
+            else {}
+        )
+        if references:
+            # 識別子を収集せずに解析した結果は使えないため、解析し直す
+            blob_infos = {
+                blob_hash: info
+                for blob_hash, info in blob_infos.items()
+                if info.references is not None or not info.parsed
             }
-            for file_path in tqdm(
-                sampled_files, desc="依存関係解析", leave=False, dynamic_ncols=True
+
+        # 内容が同じファイルは1回だけパースする
+        pending_files: dict[str, str] = {}
+        for file_path, blob_hash in file_entries:
+            if blob_hash not in blob_infos:
+                pending_files.setdefault(blob_hash, file_path)
+
+        # ファイル内のpackageとimportを取得（1回のパースで FQN と import をまとめて取得）
+        files = zip(pending_files.values(), reader.iter_blobs(pending_files))
+        pool = analyzer
+        if pool is None and jobs > 1:
+            pool = JavaAnalyzerPool(jobs=jobs, parser=parser, references=references)
+        try:
+            infos = (
+                pool.analyze(input_dir, files)
+                if pool is not None
+                else (
+                    self.get_name.analyze(
+                        input_dir,
+                        Path(file_path),
+                        content=content,
+                        parser=parser,
+                        references=references,
+                    )
+                    for file_path, content in files
+                )
             )
+            parsed_infos: dict[str, JavaFileInfo] = dict(
+                zip(
+                    pending_files,
+                    tqdm(
+                        infos,
+                        total=len(pending_files),
+                        desc="依存関係解析",
+                        leave=False,
+                        dynamic_ncols=True,
+                    ),
+                )
+            )
+        finally:
+            if pool is not None and analyzer is None:
+                print(pool.report())
+                pool.close()
+
+        if cache is not None:
+            cache.put_many(parsed_infos)
+        blob_infos.update(parsed_infos)
+        return blob_infos
+
+    def _dependency_entry(self, info: JavaFileInfo, references: bool) -> dict:
+        """解析結果を依存関係の1ファイル分の辞書に変換する"""
+        entry = {
+            "fqn": info.fqn(path_config.PACKAGE_PREFIX),
+            "imp": info.import_paths,
         }
+        if references:
+            entry["ref"] = info.references or []
+        return entry
+
+    def check_parser_consistency(
+        self,
+        output_dir: Path,
+        input_dir: Path = path_config.REPO_DIR,
+        language: str = "java",
+        state: str = "HEAD",
+    ) -> int:
+        """ヘッダー解析と構文解析の結果が食い違うファイルを調べ、CSVに保存する
+
+        Args:
+            output_dir (Path): 出力先のCSVファイル
+            input_dir (Path, optional): リポジトリまでのパス. Defaults to path_config.REPO_DIR.
+            language (str, optional): 対象言語. Defaults to "java".
+            state (str, optional): 対象のコミット. Defaults to "HEAD".
 
-        processed_file_dependency = {str(k): v for k, v in file_dependency.items()}
-        sp.write_json(
-            dict=processed_file_dependency,
-            output_dir=output_dir,
+        Returns:
+            int: 食い違いのあったファイル数
+        """
+        reader = GitSnapshotReader(input_dir)
+        file_entries = reader.list_files(commit_hash=state, language=language)
+        files = zip(
+            (file_path for file_path, _ in file_entries),
+            reader.iter_blobs(blob_hash for _, blob_hash in file_entries),
         )
 
-    def build_dependency_graph(self, file_dependency: dict[Path, dict]) -> nx.DiGraph:
+        disagreements = list(
+            GetName().check_parser_consistency(
+                input_dir,
+                tqdm(files, total=len(file_entries), desc="解析結果を比較中"),
+                path_config.PACKAGE_PREFIX,
+            )
+        )
+        print(f"{len(disagreements)}/{len(file_entries)} ファイルで結果が異なります。")
+
+        output_dir.parent.mkdir(parents=True, exist_ok=True)
+        pd.DataFrame(disagreements).to_csv(output_dir, index=False)
+        return len(disagreements)
+
+    def build_dependency_graph(
+        self,
+        file_dependency: dict[Path, dict],
+        builder: Optional[DependencyGraphBuilder] = None,
+    ) -> nx.DiGraph:
         """
         FQNベースの依存関係グラフを構築する。
 
         Args:
             file_dependency: ファイルパスをキー、"fqn"と"imp"を含む辞書を値とする依存情報
+            builder: 全時点で共有するグラフビルダー. Defaults to None（新規作成）.
 
         Returns:
             nx.DiGraph: クラスFQNをノードとする依存関係グラフ
         """
-        G = nx.DiGraph()
+        if builder is None:
+            builder = DependencyGraphBuilder()
+        return builder.build(file_dependency).to_networkx()
 
-        for info in file_dependency.values():
-            if not (fqn := info.get("fqn")):
-                continue
-
-            G.add_node(fqn)
-
-            for imp in info.get("imp", []):
-                G.add_edge(fqn, imp)
-
-        return G
-
-    def write_centrality(self, file_dependency: dict, output_dir: Path) -> None:
+    def write_centrality(
+        self,
+        file_dependency: dict,
+        output_dir: Path,
+        engine: Optional[PageRankEngine] = None,
+    ) -> None:
         """中心性を計算し、CSVに保存する
 
         Args:
             input_dir (Path): 依存関係が記述されたJSONファイルのパス
             output_dir (Path): 出力先のディレクトリ
+            engine (Optional[PageRankEngine], optional): PageRank の計算に使うエンジン。
+                月ごとに同じエンジンを渡すと、前の月のスコアを初期値に使う. Defaults to None.
         """
-        # グラフ構築
-        graph = self.build_dependency_graph(file_dependency)
-        centrality = nx.pagerank(graph)
+        if engine is None:
+            engine = PageRankEngine(warm_start=False)
+        centrality = engine.rank(file_dependency)
 
         # DataFrame化
         df = pd.DataFrame(
@@ -256,147 +638,472 @@ class CalcCentrality:
             output_csv = output_dir / f"{score_col}.csv"
             timeseries_df.to_csv(output_csv)
 
+    def write_centrality_matrix(
+        self,
+        input_dir: Path = path_config.CENTRALITY_DATA_DIR,
+        output_dir: Path = path_config.CENTRALITY_STORE_DIR,
+        rebuild: bool = False,
+    ) -> CentralityMatrix:
+        """クラスごとの中心性スコアの時系列を1つの配列にまとめて保存する
+
+        load_centrality_timeseries の CSV と同じ内容を、指標ごとの CSV ではなく
+        クラス × 時点 × 指標の配列として保存する。クラスの履歴や特定時点の上位クラスは
+        CentralityMatrix から全体を読み込まずに取得できる。
+        既に保存済みの場合は、まだ取り込んでいない時点だけを追記する。
+
+        Args:
+            input_dir (Path): 各時点の中心性スコアが保存されたディレクトリ
+            output_dir (Path): 出力先のディレクトリ
+            rebuild (bool, optional): 保存済みの内容を捨てて作り直すか. Defaults to False.
+
+        Returns:
+            CentralityMatrix: 保存した時系列
+        """
+        if rebuild:
+            return CentralityMatrix.build(input_dir=input_dir, store_dir=output_dir)
+        return CentralityMatrix.update(input_dir=input_dir, store_dir=output_dir)
+
     def plot_all_centralities_per_class(
-        self, centrality_dir: Path, output_base_dir: Path
+        self,
+        store_dir: Path = path_config.CENTRALITY_STORE_DIR,
+        output_base_dir: Path = path_config.CENTRALITY_CHANGE_DIR,
+        jobs: int = 1,
+        top_k: Optional[int] = None,
+        min_volatility: Optional[float] = None,
     ) -> None:
         """中心性スコアの時系列データを可視化する
 
+        指標ごとの CSV を読み直さず、write_centrality_matrix で保存した配列から
+        指標ごとの表（クラス × 時点）を取り出して描画する。
+
         Args:
-            centrality_dir (Path): 中心性スコアの時系列データが保存されたディレクトリ
-            output_base_dir (Path): 出力先のディレクトリ
+            store_dir (Path, optional): write_centrality_matrix の出力先.
+                Defaults to path_config.CENTRALITY_STORE_DIR.
+            output_base_dir (Path, optional): 出力先のディレクトリ.
+                Defaults to path_config.CENTRALITY_CHANGE_DIR.
+            jobs (int, optional): 描画に使うプロセス数. Defaults to 1.
+            top_k (Optional[int], optional): 最大スコアが上位 top_k 件のクラスのみ描画する. Defaults to None.
+            min_volatility (Optional[float], optional): 変化量の標準偏差がこの値以上のクラスのみ描画する. Defaults to None.
         """
-        csv_paths = sorted(centrality_dir.glob("*.csv"))
+        renderer = CentralityPlotRenderer(jobs=jobs)
+        matrix = CentralityMatrix(store_dir)
 
-        for csv_path in csv_paths:
-            score_name = csv_path.stem
-            df = pd.read_csv(csv_path, index_col=0)
-            df.columns = pd.to_datetime(df.columns)
+        for score_name in matrix.metrics:
+            df = matrix.window(metric=score_name)
 
             # クラス名（FQN）一覧を抽出
-            class_list = df.index.tolist()
+            class_list = (
+                None
+                if top_k is None and min_volatility is None
+                else select_classes(df, top_k=top_k, min_volatility=min_volatility)
+            )
 
-            output_dir = output_base_dir / score_name
-            output_dir.mkdir(parents=True, exist_ok=True)
+            renderer.render(
+                df,
+                score_name=score_name,
+                output_dir=output_base_dir / score_name,
+                classes=class_list,
+            )
 
-            # === 軸範囲の計算 ===
-            all_x = df.columns
-            min_x, max_x = all_x.min(), all_x.max()
+    def write_centrality_report(
+        self,
+        store_dir: Path = path_config.CENTRALITY_STORE_DIR,
+        output_path: Path = path_config.CENTRALITY_REPORT_HTML,
+        max_points: int = 300,
+    ) -> None:
+        """中心性スコアの時系列を1つの HTML レポートにまとめる
 
-            min_y, max_y = df.min().min(), 0.05
+        plot_all_centralities_per_class のようにクラスごとの PNG を作らず、
+        間引いた系列を埋め込んだ HTML を1つだけ書き出す。
 
-            for fqn in tqdm(
-                class_list,
-                desc=f"{score_name} をプロット中",
-                leave=True,
-                dynamic_ncols=True,
-            ):
-                series = df.loc[fqn]
-                data = pd.DataFrame(
-                    {
-                        path_config.COMMIT_DATA_KEY: series.index,
-                        score_name: series.values,
-                    }
+        Args:
+            store_dir (Path): write_centrality_matrix の出力先
+            output_path (Path): 出力先のファイルパス
+            max_points (int, optional): 1系列あたりの最大点数. Defaults to 300.
+        """
+        matrix = CentralityMatrix(store_dir)
+        sp.write_centrality_report(
+            matrix,
+            output_path=output_path,
+            metrics=matrix.metrics,
+            max_points=max_points,
+        )
+
+    def pipeline_stages(
+        self,
+        start_date: str = "2008-01-01",
+        end_date: str = "2024-12-31",
+        jobs: int = 1,
+        workers: int = 1,
+        parser: str = "full",
+        output_format: str = "json",
+        imports: str = "raw",
+        same_package: bool = False,
+        top_k: Optional[int] = None,
+        min_volatility: Optional[float] = None,
+        report: bool = False,
+        export_csv: bool = False,
+    ) -> list[Stage]:
+        """main で実行するステージを作成する
+
+        ステージは metadata（月次コミットの取得）、dependency（依存関係）、
+        centrality（中心性）、timeseries（時系列の集約）、plot（可視化）の順に実行する。
+        dependency と centrality はコミットごとに実行する。
+        workers が2以上の場合、dependency は未作成のコミットを workers 個の
+        プロセスでまとめて作成する（build_dependency_series を参照）。
+        timeseries は列指向のストアを差分更新するだけで、export_csv が True の場合のみ
+        指標ごとの横長CSV（load_centrality_timeseries）も書き出す。
+
+        Returns:
+            list[Stage]: 実行順のステージ
+        """
+        metadata_csv = path_config.PROJECTS_DATA_DIR / path_config.MONTHLY_COMMITS_CSV
+        commit_dates: dict[str, str] = {}
+
+        def commits() -> list[str]:
+            if not commit_dates:
+                hashes, dates = self.read_repo_metadata(input_dir=metadata_csv)
+                commit_dates.update(zip(hashes, map(str, dates)))
+            return list(commit_dates)
+
+        def dependency_path(commit_hash: str) -> Path:
+            name = (
+                path_config.FILE_DEPENDENCY_JSON
+                if output_format == "json"
+                else path_config.FILE_DEPENDENCY_BIN
+            )
+            return path_config.CENTRALITY_DATA_DIR / commit_dates[commit_hash] / name
+
+        def centrality_path(commit_hash: str) -> Path:
+            return (
+                path_config.CENTRALITY_DATA_DIR
+                / commit_dates[commit_hash]
+                / path_config.CENTRALITY_CSV
+            )
+
+        def run_metadata(_: str) -> None:
+            metadata_csv.parent.mkdir(parents=True, exist_ok=True)
+            self.write_repo_metadata(
+                input_dir=path_config.REPO_DIR,
+                start_date=start_date,
+                end_date=end_date,
+                output_dir=metadata_csv,
+            )
+            commit_dates.clear()
+
+        # git のリーダーと直前に作成した依存関係（次のコミットの差分更新に使う）
+        previous: dict = {}
+
+        # 並列に作成済みのコミット（キーごとの実行では作り直さない）
+        prepared: set[str] = set()
+
+        def prepare_dependency(commit_hashes: list[str]) -> None:
+            with ParseCache(path_config.PARSE_CACHE_DB, variant=parser) as cache:
+                self.build_dependency_series(
+                    commit_hashes,
+                    [dependency_path(commit_hash) for commit_hash in commit_hashes],
+                    input_dir=path_config.REPO_DIR,
+                    workers=workers,
+                    max_files=20000,
+                    cache=cache,
+                    jobs=jobs,
+                    parser=parser,
+                    output_format=output_format,
+                    references=same_package,
+                )
+            prepared.update(commit_hashes)
+
+        def run_dependency(commit_hash: str) -> None:
+            if commit_hash in prepared and dependency_path(commit_hash).exists():
+                return
+            hashes = commits()
+            index = hashes.index(commit_hash)
+            if "reader" not in previous:
+                previous["reader"] = GitSnapshotReader(path_config.REPO_DIR)
+            reader = previous["reader"]
+            if jobs > 1 and "analyzer" not in previous:
+                # プロセスプールは月ごとに起動せず、ステージの終わりまで使い回す
+                previous["analyzer"] = JavaAnalyzerPool(
+                    jobs=jobs, parser=parser, references=same_package
+                )
+            kwargs = dict(
+                input_dir=path_config.REPO_DIR,
+                language="java",
+                max_files=20000,
+                output_dir=dependency_path(commit_hash),
+                state=commit_hash,
+                reader=reader,
+                jobs=jobs,
+                parser=parser,
+                output_format=output_format,
+                references=same_package,
+                analyzer=previous.get("analyzer"),
+            )
+            base = previous.get("last")
+            if index > 0 and (base is None or base[0] != hashes[index - 1]):
+                # 再開時は、前のコミットの出力があればそこから差分更新する
+                base_path = dependency_path(hashes[index - 1])
+                base = (
+                    (hashes[index - 1], self._load_dependency(base_path, output_format))
+                    if base_path.exists()
+                    else None
+                )
+            with ParseCache(path_config.PARSE_CACHE_DB, variant=parser) as cache:
+                if index > 0 and base is not None:
+                    dependency = self.update_dependency(
+                        previous_dependency=base[1],
+                        previous_state=base[0],
+                        cache=cache,
+                        **kwargs,
+                    )
+                else:
+                    dependency = self.build_dependency(cache=cache, **kwargs)
+            previous["last"] = (commit_hash, dependency)
+
+        def finish_dependency() -> None:
+            if analyzer := previous.pop("analyzer", None):
+                print(analyzer.report())
+                analyzer.close()
+
+        # 前の月のスコアを初期値に使うため、エンジンは全期間で共有する
+        pagerank_engine = PageRankEngine(
+            builder=DependencyGraphBuilder(imports=imports, same_package=same_package)
+        )
+
+        def run_centrality(commit_hash: str) -> None:
+            self.write_centrality(
+                file_dependency=self._load_dependency(
+                    dependency_path(commit_hash), output_format
+                ),
+                output_dir=centrality_path(commit_hash),
+                engine=pagerank_engine,
+            )
+
+        def timeseries_inputs(_: str) -> list[Path]:
+            paths = [centrality_path(commit_hash) for commit_hash in commits()]
+            return [path for path in paths if path.exists()]
+
+        def run_timeseries(_: str) -> None:
+            self.write_centrality_matrix(
+                input_dir=path_config.CENTRALITY_DATA_DIR,
+                output_dir=path_config.CENTRALITY_STORE_DIR,
+            )
+            if export_csv:
+                # 横長CSVは全コミットを読み直すため、必要な場合のみ書き出す
+                self.load_centrality_timeseries(
+                    input_dir=path_config.CENTRALITY_DATA_DIR,
+                    output_dir=path_config.CENTRALITY_MATRIX_DIR,
                 )
 
-                plt.figure(figsize=(10, 5))
-                plt.plot(
-                    data[path_config.COMMIT_DATA_KEY],
-                    data[score_name],
-                    color="lightblue",
-                    marker="o",
-                    linestyle="-",
-                    markersize=4,  # 点の大きさを小さく
+        def timeseries_outputs(_: str) -> list[Path]:
+            outputs = [path_config.CENTRALITY_STORE_DIR]
+            if export_csv:
+                outputs.append(
+                    path_config.CENTRALITY_MATRIX_DIR
+                    / f"{path_config.CENTRALITY_COLUMNS}.csv"
                 )
+            return outputs
+
+        def run_plot(_: str) -> None:
+            if report:
+                self.write_centrality_report(
+                    store_dir=path_config.CENTRALITY_STORE_DIR,
+                    output_path=path_config.CENTRALITY_REPORT_HTML,
+                )
+            else:
+                self.plot_all_centralities_per_class(
+                    store_dir=path_config.CENTRALITY_STORE_DIR,
+                    output_base_dir=path_config.CENTRALITY_CHANGE_DIR,
+                    jobs=jobs,
+                    top_k=top_k,
+                    min_volatility=min_volatility,
+                )
+
+        return [
+            Stage(
+                name="metadata",
+                run=run_metadata,
+                outputs=lambda _: [metadata_csv],
+                params={"start_date": start_date, "end_date": end_date},
+            ),
+            Stage(
+                name="dependency",
+                run=run_dependency,
+                outputs=lambda commit_hash: [dependency_path(commit_hash)],
+                keys=commits,
+                params={
+                    "parser": parser,
+                    "output_format": output_format,
+                    # 識別子の集め方が変わったら作り直す
+                    "references": REFERENCES_VERSION if same_package else False,
+                },
+                prepare=prepare_dependency if workers > 1 else None,
+                finish=finish_dependency,
+            ),
+            Stage(
+                name="centrality",
+                run=run_centrality,
+                outputs=lambda commit_hash: [centrality_path(commit_hash)],
+                inputs=lambda commit_hash: [dependency_path(commit_hash)],
+                keys=commits,
+                params={"imports": imports, "same_package": same_package},
+            ),
+            Stage(
+                name="timeseries",
+                run=run_timeseries,
+                outputs=timeseries_outputs,
+                inputs=timeseries_inputs,
+                params={"export_csv": export_csv},
+            ),
+            Stage(
+                name="plot",
+                run=run_plot,
+                outputs=lambda _: [
+                    path_config.CENTRALITY_REPORT_HTML
+                    if report
+                    else path_config.CENTRALITY_CHANGE_DIR
+                ],
+                inputs=lambda _: [path_config.CENTRALITY_STORE_DIR],
+                params={
+                    "report": report,
+                    "top_k": top_k,
+                    "min_volatility": min_volatility,
+                },
+            ),
+        ]
 
-                plt.title(
-                    f"{score_name} Over Time\n{fqn}".replace("$", "\\$"), fontsize=14
-                )  # タイトルサイズ大
-                plt.xlabel("Time", fontsize=12)  # ラベルサイズ中
-                plt.ylabel(score_name, fontsize=12)
-                plt.xticks(rotation=45, fontsize=10)  # 目盛サイズ
-                plt.yticks(fontsize=10)
-                plt.yscale("log")  # Y軸を対数スケールに設定
-                plt.xlim(min_x, max_x)
-                plt.ylim(min_y, max_y)
-                plt.tight_layout()
-
-                safe_name = sp.sanitize_filename(fqn)
-                save_path = output_dir / f"{safe_name}.png"
-                plt.savefig(save_path)
-                plt.close()
-
-    def main(self) -> None:
-        # # 2024年の最終コミット日時にリポジトリを戻す
-        # last_commit_hash, _ = sp.get_last_commit_date(
-        #     repo_path=path_config.REPO_DIR, limit_year="2025"
-        # )
-        # sp.reset_repo_state(
-        #     repo_path=path_config.REPO_DIR,
-        #     commit_hash=last_commit_hash,
-        # )
-
-        # # リポジトリの月次データを取得し、CSVに保存
-        # self.write_repo_metadata(
-        #     input_dir=path_config.REPO_DIR,
-        #     start_date="2008-01-01",
-        #     end_date="2024-12-31",
-        #     output_dir=path_config.PROJECTS_DATA_DIR / path_config.MONTHLY_COMMITS_CSV,
-        # )
-
-        # # リポジトリの月次データを読み込み
-        # filtered_hashes, filtered_dates = self.read_repo_metadata(
-        #     input_dir=path_config.PROJECTS_DATA_DIR / path_config.MONTHLY_COMMITS_CSV
-        # )
-
-        # # ファイルの依存関係を計算し、jsonで保存
-        # for commit_hash, commit_date in tqdm(
-        #     zip(filtered_hashes, filtered_dates),
-        #     desc="特定のコミットを処理中",
-        #     total=len(filtered_hashes),
-        #     leave=False,
-        # ):
-        #     try:
-        # output_path: Path = path_config.CENTRALITY_DATA_DIR / str(commit_date)
-
-        # # 依存関係を構築し、jsonで保存(この処理は非常に時間がかかる)
-        # self.build_dependency(
-        #     max_files=20000,
-        #     input_dir=path_config.REPO_DIR,
-        #     language="java",
-        #     output_dir=(output_path / path_config.FILE_DEPENDENCY_JSON),
-        #     state=commit_hash,
-        # )
-
-        # # 依存関係のjsonを読み込み
-        # file_dependency = sp.read_json(
-        #     input_dir=(output_path / path_config.FILE_DEPENDENCY_JSON)
-        # )
-
-        # # 依存関係から中心性を計算し、csvで保存
-        # self.write_centrality(
-        #     file_dependency=file_dependency,
-        #     output_dir=(output_path / path_config.CENTRALITY_CSV),
-        # )
-
-        # except Exception as e:
-        #     print(
-        #         f"[ERROR] コミット処理中にエラーが発生しました。 {commit_hash}: {e}"
-        #     )
-        #     continue
-
-        # # 中心性スコアの時系列データを作成し、CSVに保存
-        # self.load_centrality_timeseries(
-        #     input_dir=path_config.CENTRALITY_DATA_DIR,
-        #     output_dir=path_config.CENTRALITY_MATRIX_DIR,
-        # )
-
-        # 中心性スコアの時系列データを可視化
-        self.plot_all_centralities_per_class(
-            centrality_dir=path_config.CENTRALITY_MATRIX_DIR,
-            output_base_dir=path_config.CENTRALITY_CHANGE_DIR,
+    def _load_dependency(self, path: Path, output_format: str) -> dict:
+        if output_format == "json":
+            return sp.read_json(input_dir=path)
+        return sp.read_dependency(path)
+
+    def main(
+        self,
+        stages: Optional[list[str]] = None,
+        force: bool = False,
+        **kwargs,
+    ) -> None:
+        """月次コミットの依存関係から中心性の時系列を作成し、可視化する
+
+        完了したステージは path_config.PIPELINE_MANIFEST_JSON に記録され、
+        入力が変わっていなければ再実行時に飛ばされる。
+
+        Args:
+            stages (Optional[list[str]], optional): 実行するステージ名. Defaults to None（すべて）.
+            force (bool, optional): 完了済みのステージも再実行するか. Defaults to False.
+            **kwargs: pipeline_stages に渡す設定
+        """
+        runner = PipelineRunner(
+            path_config.PIPELINE_MANIFEST_JSON,
+            self.pipeline_stages(**kwargs),
+            force=force,
         )
+        summary = runner.run(stages)
+        print(f"完了: {summary}")
+
+
+def _build_dependency_block(
+    entries: list[tuple[str, Path]],
+    cache_config: Optional[tuple[Path, int, str]] = None,
+    **kwargs,
+) -> list[Path]:
+    """ワーカープロセスで連続したコミットの依存関係を作成する"""
+    commit_hashes = [commit_hash for commit_hash, _ in entries]
+    output_dirs = [output_dir for _, output_dir in entries]
+    if cache_config is None:
+        CalcCentrality().build_dependency_series(commit_hashes, output_dirs, **kwargs)
+        return output_dirs
+
+    db_path, max_entries, variant = cache_config
+    with ParseCache(db_path, max_entries=max_entries, variant=variant) as cache:
+        CalcCentrality().build_dependency_series(
+            commit_hashes, output_dirs, cache=cache, **kwargs
+        )
+    return output_dirs
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="依存関係から中心性の時系列を計算する")
+    parser.add_argument(
+        "--stages",
+        nargs="+",
+        choices=PIPELINE_STAGES,
+        default=None,
+        help="実行するステージ（省略時はすべて）",
+    )
+    parser.add_argument(
+        "--force", action="store_true", help="完了済みのステージも再実行する"
+    )
+    parser.add_argument("--start-date", default="2008-01-01", help="収集の開始日")
+    parser.add_argument("--end-date", default="2024-12-31", help="収集の終了日")
+    parser.add_argument(
+        "--jobs", type=int, default=1, help="依存関係のパースと描画に使うプロセス数"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="依存関係を同時に作成するコミット数（各コミットで --jobs 個のプロセスを使う）",
+    )
+    parser.add_argument(
+        "--parser",
+        choices=["full", "header"],
+        default="full",
+        help="Javaファイルの解析方法（header は先頭の宣言のみを読む）",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["json", "binary"],
+        default="json",
+        help="依存関係の保存形式（binary はメモリマップで読める形式）",
+    )
+    parser.add_argument(
+        "--imports",
+        choices=IMPORT_MODES,
+        default="raw",
+        help="import の扱い（resolved はワイルドカード・static import を宣言済みのクラスに解決し、"
+        "internal はさらに PACKAGE_PREFIX の外を除く）",
+    )
+    parser.add_argument(
+        "--same-package",
+        action="store_true",
+        help="import せずに使っている同じパッケージのクラスへの依存も加える",
+    )
+    parser.add_argument(
+        "--top-k", type=int, default=None, help="最大スコアが上位のクラスのみ描画する"
+    )
+    parser.add_argument(
+        "--min-volatility",
+        type=float,
+        default=None,
+        help="変化量の標準偏差がこの値以上のクラスのみ描画する",
+    )
+    parser.add_argument(
+        "--report",
+        action="store_true",
+        help="クラスごとの PNG の代わりに HTML レポートを1つ書き出す",
+    )
+    parser.add_argument(
+        "--export-csv",
+        action="store_true",
+        help="中心性の時系列を指標ごとの横長CSVにも書き出す",
+    )
+    args = parser.parse_args()
+
     calc_centrality = CalcCentrality()
-    calc_centrality.main()
+    calc_centrality.main(
+        stages=args.stages,
+        force=args.force,
+        start_date=args.start_date,
+        end_date=args.end_date,
+        jobs=args.jobs,
+        workers=args.workers,
+        parser=args.parser,
+        output_format=args.format,
+        imports=args.imports,
+        same_package=args.same_package,
+        top_k=args.top_k,
+        min_volatility=args.min_volatility,
+        report=args.report,
+        export_csv=args.export_csv,
+    )
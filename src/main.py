@@ -6,8 +6,8 @@ def main():
     ef.main(isDeleted=True)
 
     sf = StoreFiles()
-    sf.save_deleted_file()
-    sf.save_existing_file()
+    sf.save_deleted_files_bulk(workers=8)
+    sf.save_existing_files_bulk(workers=8)
     
     cm = CalcMetrics()
     cm.main()
@@ -1,12 +1,111 @@
-from shopy.cmd import (
-    GitHash,
-    GitReset,
-    get_last_commit_date,
-    get_monthly_commits,
-    reset_repo_state,
-    run_cmd,
-)
+from typing import TYPE_CHECKING
+
+from shopy._lazy import lazy_exports
 from shopy.config import path_config
-from shopy.metrics import CalcMetrics, StoreFiles
-from shopy.search import ExtractFilesInfo
-from shopy.utils import GetName, get_child_dir, read_json, sanitize_filename, write_json
+
+if TYPE_CHECKING:
+    from shopy.centrality import (
+        IMPORT_MODES,
+        CentralityMatrix,
+        CentralityPlotRenderer,
+        DependencyGraphBuilder,
+        ImportIndex,
+        PageRankEngine,
+        SymbolTable,
+        select_classes,
+        write_centrality_report,
+    )
+    from shopy.cmd import (
+        CommandFailedError,
+        CommandStream,
+        CommandTimeoutError,
+        GitHash,
+        GitObjectReader,
+        GitReset,
+        GitSnapshotReader,
+        SnapshotScheduler,
+        get_last_commit_date,
+        get_monthly_commits,
+        reset_repo_state,
+        run_cmd,
+        split_blocks,
+        stream_cmd,
+    )
+    from shopy.metrics import (
+        CalcMetrics,
+        FileMetrics,
+        FileMetricsEngine,
+        StoreFiles,
+        measure_file,
+    )
+    from shopy.search import ExtractFilesInfo
+    from shopy.utils import (
+        DependencyMap,
+        GetName,
+        JavaAnalyzerPool,
+        JavaFileInfo,
+        JavaImport,
+        ParseCache,
+        PipelineManifest,
+        PipelineRunner,
+        Stage,
+        export_dependency_json,
+        get_child_dir,
+        read_dependency,
+        read_json,
+        sanitize_filename,
+        write_dependency,
+        write_json,
+    )
+
+# 公開名と定義しているモジュール（最初に参照されたときに読み込む）
+_EXPORTS = {
+    "IMPORT_MODES": "shopy.centrality",
+    "CentralityMatrix": "shopy.centrality",
+    "CentralityPlotRenderer": "shopy.centrality",
+    "DependencyGraphBuilder": "shopy.centrality",
+    "ImportIndex": "shopy.centrality",
+    "PageRankEngine": "shopy.centrality",
+    "SymbolTable": "shopy.centrality",
+    "select_classes": "shopy.centrality",
+    "write_centrality_report": "shopy.centrality",
+    "CommandFailedError": "shopy.cmd",
+    "CommandStream": "shopy.cmd",
+    "CommandTimeoutError": "shopy.cmd",
+    "GitHash": "shopy.cmd",
+    "GitObjectReader": "shopy.cmd",
+    "GitReset": "shopy.cmd",
+    "GitSnapshotReader": "shopy.cmd",
+    "SnapshotScheduler": "shopy.cmd",
+    "get_last_commit_date": "shopy.cmd",
+    "get_monthly_commits": "shopy.cmd",
+    "reset_repo_state": "shopy.cmd",
+    "run_cmd": "shopy.cmd",
+    "split_blocks": "shopy.cmd",
+    "stream_cmd": "shopy.cmd",
+    "CalcMetrics": "shopy.metrics",
+    "FileMetrics": "shopy.metrics",
+    "FileMetricsEngine": "shopy.metrics",
+    "StoreFiles": "shopy.metrics",
+    "measure_file": "shopy.metrics",
+    "ExtractFilesInfo": "shopy.search",
+    "DependencyMap": "shopy.utils",
+    "GetName": "shopy.utils",
+    "JavaAnalyzerPool": "shopy.utils",
+    "JavaFileInfo": "shopy.utils",
+    "JavaImport": "shopy.utils",
+    "ParseCache": "shopy.utils",
+    "PipelineManifest": "shopy.utils",
+    "PipelineRunner": "shopy.utils",
+    "Stage": "shopy.utils",
+    "export_dependency_json": "shopy.utils",
+    "get_child_dir": "shopy.utils",
+    "read_dependency": "shopy.utils",
+    "read_json": "shopy.utils",
+    "sanitize_filename": "shopy.utils",
+    "write_dependency": "shopy.utils",
+    "write_json": "shopy.utils",
+}
+
+__all__ = ["path_config", *_EXPORTS]
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
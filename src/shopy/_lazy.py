@@ -0,0 +1,35 @@
+import importlib
+from typing import Any, Callable
+
+
+def lazy_exports(
+    package: str, exports: dict[str, str]
+) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    """公開名を最初に参照されたときに読み込む __getattr__ と __dir__ を作る
+
+    pandas や matplotlib、javalang などを読み込むモジュールは、その名前が
+    使われるまで import しない（PEP 562）。
+
+    Args:
+        package (str): パッケージ名（__name__）
+        exports (dict[str, str]): 公開名と、それを定義しているモジュール名
+            （"." で始まる場合は package からの相対名）
+
+    Returns:
+        tuple: パッケージの __getattr__ と __dir__
+    """
+    module = importlib.import_module(package)
+
+    def __getattr__(name: str) -> Any:
+        module_name = exports.get(name)
+        if module_name is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module_name, package), name)
+        # 2回目以降は通常の属性として参照される
+        setattr(module, name, value)
+        return value
+
+    def __dir__() -> list[str]:
+        return sorted(set(vars(module)) | exports.keys())
+
+    return __getattr__, __dir__
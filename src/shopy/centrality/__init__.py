@@ -0,0 +1,31 @@
+from typing import TYPE_CHECKING
+
+from shopy._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .graph import DependencyGraph, DependencyGraphBuilder, SymbolTable
+    from .imports import IMPORT_MODES, ImportIndex
+    from .matrix import CentralityMatrix
+    from .pagerank import PageRankEngine, PageRankNotConvergedError, pagerank_csr
+    from .plot import CentralityPlotRenderer, select_classes
+    from .report import lttb, write_centrality_report
+
+# 公開名と定義しているモジュール（最初に参照されたときに読み込む）
+_EXPORTS = {
+    "DependencyGraph": ".graph",
+    "DependencyGraphBuilder": ".graph",
+    "SymbolTable": ".graph",
+    "IMPORT_MODES": ".imports",
+    "ImportIndex": ".imports",
+    "CentralityMatrix": ".matrix",
+    "PageRankEngine": ".pagerank",
+    "PageRankNotConvergedError": ".pagerank",
+    "pagerank_csr": ".pagerank",
+    "CentralityPlotRenderer": ".plot",
+    "select_classes": ".plot",
+    "lttb": ".report",
+    "write_centrality_report": ".report",
+}
+
+__all__ = list(_EXPORTS)
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
@@ -0,0 +1,253 @@
+from pathlib import Path
+from typing import Iterable, Optional
+
+import networkx as nx
+import numpy as np
+
+from shopy.config import path_config
+
+from .imports import IMPORT_MODES, ImportIndex
+
+
+class SymbolTable:
+    """クラスFQNと整数IDを対応付ける
+
+    一度割り当てたIDは変わらないため、全時点で1つの表を共有すれば、
+    時点間のスコアの比較や引き継ぎを配列の添字で行える。
+    """
+
+    def __init__(self, names: Iterable[str] = ()):
+        """
+        Args:
+            names (Iterable[str], optional): 最初に登録するFQN（IDは登録順）
+        """
+        self._names: list[str] = []
+        self._ids: dict[str, int] = {}
+        self.intern_many(names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._ids
+
+    def __getitem__(self, symbol_id: int) -> str:
+        return self._names[symbol_id]
+
+    def intern(self, name: str) -> int:
+        """FQNのIDを取得する。未登録なら新しいIDを割り当てる
+
+        Args:
+            name (str): クラスFQN
+
+        Returns:
+            int: ID
+        """
+        symbol_id = self._ids.get(name)
+        if symbol_id is None:
+            symbol_id = self._ids[name] = len(self._names)
+            self._names.append(name)
+        return symbol_id
+
+    def intern_many(self, names: Iterable[str]) -> np.ndarray:
+        """複数のFQNのIDをまとめて取得する
+
+        Args:
+            names (Iterable[str]): クラスFQNの列
+
+        Returns:
+            np.ndarray: IDの配列（int32）
+        """
+        return np.fromiter((self.intern(name) for name in names), dtype=np.int32)
+
+    def id_of(self, name: str) -> Optional[int]:
+        """登録済みのFQNのIDを取得する
+
+        Args:
+            name (str): クラスFQN
+
+        Returns:
+            Optional[int]: ID。未登録の場合は None
+        """
+        return self._ids.get(name)
+
+    def names(self, symbol_ids: Iterable[int]) -> list[str]:
+        """IDの列をFQNの列に変換する"""
+        return [self._names[symbol_id] for symbol_id in symbol_ids]
+
+    def save(self, path: Path) -> None:
+        """ID順のFQNを1行ずつ保存する
+
+        Args:
+            path (Path): 保存先のファイルパス
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(
+            "".join(f"{name}\n" for name in self._names),
+            encoding="utf-8",
+            errors="surrogateescape",
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> "SymbolTable":
+        """save で保存した表を読み込む
+
+        Args:
+            path (Path): 読み込むファイルパス
+
+        Returns:
+            SymbolTable: 保存時と同じIDを持つ表
+        """
+        text = Path(path).read_text(encoding="utf-8", errors="surrogateescape")
+        return cls(text.splitlines())
+
+
+class DependencyGraph:
+    """整数IDで表した1時点の依存関係グラフ
+
+    Attributes:
+        symbols (SymbolTable): IDとFQNの対応表
+        nodes (np.ndarray): グラフに含まれるノードのID（追加順、int32）
+        src (np.ndarray): 辺の始点ID（int32）
+        dst (np.ndarray): 辺の終点ID（int32）
+    """
+
+    __slots__ = ("symbols", "nodes", "src", "dst")
+
+    def __init__(
+        self,
+        symbols: SymbolTable,
+        nodes: np.ndarray,
+        src: np.ndarray,
+        dst: np.ndarray,
+    ):
+        self.symbols = symbols
+        self.nodes = nodes
+        self.src = src
+        self.dst = dst
+
+    def __repr__(self) -> str:
+        return (
+            f"DependencyGraph(nodes={len(self.nodes)}, edges={len(self.src)}, "
+            f"symbols={len(self.symbols)})"
+        )
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.nodes)
+
+    def local_edges(self) -> tuple[np.ndarray, np.ndarray]:
+        """辺の端点を nodes 内の位置（0 以上 num_nodes 未満）に変換する
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: 始点と終点の位置
+        """
+        position = np.empty(len(self.symbols), dtype=np.int32)
+        position[self.nodes] = np.arange(len(self.nodes), dtype=np.int32)
+        return position[self.src], position[self.dst]
+
+    def to_networkx(self) -> nx.DiGraph:
+        """クラスFQNをノードとする networkx のグラフに変換する
+
+        Returns:
+            nx.DiGraph: 依存関係グラフ（ノードの追加順は nodes と同じ）
+        """
+        names = self.symbols.names(range(len(self.symbols)))
+        graph = nx.DiGraph()
+        graph.add_nodes_from(names[node] for node in self.nodes.tolist())
+        graph.add_edges_from(
+            (names[src], names[dst])
+            for src, dst in zip(self.src.tolist(), self.dst.tolist())
+        )
+        return graph
+
+
+class DependencyGraphBuilder:
+    """依存関係から整数IDのグラフを作る
+
+    SymbolTable を全時点で共有するため、同じFQNの文字列を時点ごとに
+    作り直さずに済む。
+    """
+
+    def __init__(
+        self,
+        symbols: Optional[SymbolTable] = None,
+        imports: str = "raw",
+        package_prefix: str = path_config.PACKAGE_PREFIX,
+        same_package: bool = False,
+    ):
+        """
+        Args:
+            symbols (Optional[SymbolTable], optional): 共有する対応表. Defaults to None（新規作成）.
+            imports (str, optional): import の扱い。"raw" は import のパスをそのままノードにする。
+                "resolved" は ImportIndex で宣言済みのクラスに解決し、
+                "internal" はさらに package_prefix の外の import を除く. Defaults to "raw".
+            package_prefix (str, optional): "internal" で残すパッケージの接頭辞.
+                Defaults to path_config.PACKAGE_PREFIX.
+            same_package (bool, optional): 依存情報の "ref"（本文の識別子）から、
+                import せずに使っている同じパッケージのクラスへの辺も加えるか. Defaults to False.
+        """
+        if imports not in IMPORT_MODES:
+            raise ValueError(f"未対応の import の扱いです: {imports}")
+        self.symbols = symbols if symbols is not None else SymbolTable()
+        self.imports = imports
+        self.package_prefix = package_prefix
+        self.same_package = same_package
+
+    def build(self, file_dependency: dict) -> DependencyGraph:
+        """依存関係からグラフを作る
+
+        Args:
+            file_dependency (dict): ファイルパスをキー、"fqn"と"imp"（same_package では "ref" も）を含む辞書を値とする依存情報
+
+        Returns:
+            DependencyGraph: 依存関係グラフ
+        """
+        intern = self.symbols.intern
+        index = (
+            ImportIndex.from_dependency(
+                file_dependency,
+                package_prefix=(
+                    self.package_prefix if self.imports == "internal" else None
+                ),
+            )
+            if self.imports != "raw" or self.same_package
+            else None
+        )
+        resolve = index.resolve if self.imports != "raw" else _raw_import
+        # 追加順を保ったままノードの重複を除く
+        nodes: dict[int, None] = {}
+        src: list[int] = []
+        dst: list[int] = []
+        for info in file_dependency.values():
+            if not (fqn := info.get("fqn")):
+                continue
+            fqn_id = intern(fqn)
+            nodes[fqn_id] = None
+            for imp in info.get("imp", []):
+                for target in resolve(imp):
+                    # ワイルドカードを展開すると自分自身を含むことがある
+                    if target == fqn and self.imports != "raw":
+                        continue
+                    imp_id = intern(target)
+                    nodes[imp_id] = None
+                    src.append(fqn_id)
+                    dst.append(imp_id)
+            if self.same_package:
+                for target in index.same_package(fqn, info.get("ref", [])):
+                    ref_id = intern(target)
+                    nodes[ref_id] = None
+                    src.append(fqn_id)
+                    dst.append(ref_id)
+
+        return DependencyGraph(
+            self.symbols,
+            np.fromiter(nodes, dtype=np.int32, count=len(nodes)),
+            np.array(src, dtype=np.int32),
+            np.array(dst, dtype=np.int32),
+        )
+
+
+def _raw_import(import_path: str) -> tuple[str]:
+    return (import_path,)
@@ -0,0 +1,117 @@
+from collections import defaultdict
+from typing import Iterable, Optional
+
+# DependencyGraphBuilder で選択できる import の扱い
+IMPORT_MODES = ("raw", "resolved", "internal")
+
+
+class ImportIndex:
+    """1時点で宣言されているクラスから import 先を解決する索引
+
+    依存関係の "imp" には import 文のパスがそのまま入っており、
+    ワイルドカード（`org.example.util.*` は `org.example.util`）や
+    static import（`org.example.util.Assert.notNull`）、ネストしたクラス
+    （`org.example.Outer.Inner`）はクラスのFQNと一致しない。
+    パッケージからFQNへの表を1回作り、import のパスを宣言済みのクラスに対応付ける。
+    """
+
+    def __init__(self, fqns: Iterable[str], package_prefix: Optional[str] = None):
+        """
+        Args:
+            fqns (Iterable[str]): その時点で宣言されているクラスのFQN
+            package_prefix (Optional[str], optional): 指定すると、解決できず
+                この接頭辞で始まらない import（JDK や外部ライブラリ）を除く. Defaults to None.
+        """
+        self.fqns: set[str] = set(fqns)
+        self.package_prefix = package_prefix
+        self.packages: dict[str, list[str]] = defaultdict(list)
+        # パッケージごとの単純名からFQNへの表（同じパッケージのクラスの参照に使う）
+        self.simple_names: dict[str, dict[str, str]] = defaultdict(dict)
+        for fqn in sorted(self.fqns):
+            package, _, simple_name = fqn.rpartition(".")
+            self.packages[package].append(fqn)
+            self.simple_names[package][simple_name] = fqn
+        self._resolved: dict[str, tuple[str, ...]] = {}
+
+    @classmethod
+    def from_dependency(
+        cls, file_dependency: dict, package_prefix: Optional[str] = None
+    ) -> "ImportIndex":
+        """依存関係の "fqn" から索引を作る
+
+        Args:
+            file_dependency (dict): ファイルパスをキー、"fqn"と"imp"を含む辞書を値とする依存情報
+            package_prefix (Optional[str], optional): ImportIndex を参照. Defaults to None.
+
+        Returns:
+            ImportIndex: 索引
+        """
+        return cls(
+            (info["fqn"] for info in file_dependency.values() if info.get("fqn")),
+            package_prefix=package_prefix,
+        )
+
+    def classes_in(self, package: str) -> list[str]:
+        """パッケージで宣言されているクラスのFQN（名前順）"""
+        return self.packages.get(package, [])
+
+    def same_package(self, fqn: str, names: Iterable[str]) -> list[str]:
+        """識別子のうち、fqn と同じパッケージで宣言されているクラスを返す
+
+        同じパッケージのクラスは import なしで使えるため、本文の識別子を
+        単純名の表と照合する。識別子1つあたり辞書の参照1回で済む。
+        修飾された名前や単一型の import と同じ単純名は、識別子を集める時点で
+        除かれている（GetName.analyze を参照）。
+
+        Args:
+            fqn (str): 参照元のクラスのFQN
+            names (Iterable[str]): 参照元のファイルに現れる識別子
+
+        Returns:
+            list[str]: 参照先のFQN（参照元自身を除く、識別子の順）
+        """
+        table = self.simple_names.get(fqn.rpartition(".")[0])
+        if not table:
+            return []
+        return [
+            target
+            for name in names
+            if (target := table.get(name)) is not None and target != fqn
+        ]
+
+    def resolve(self, import_path: str) -> tuple[str, ...]:
+        """import のパスを依存先のクラスのFQNに変換する
+
+        1. 宣言済みのクラスならそのまま
+        2. パッケージ名ならそのパッケージの全クラス（ワイルドカード）
+        3. 末尾を削って最初に見つかった宣言済みのクラス（static import・ネストしたクラス）
+        4. 解決できなければ元のパス（package_prefix の外なら除く）
+
+        Args:
+            import_path (str): import 文のパス
+
+        Returns:
+            tuple[str, ...]: 依存先のFQN
+        """
+        resolved = self._resolved.get(import_path)
+        if resolved is None:
+            resolved = self._resolved[import_path] = self._resolve(import_path)
+        return resolved
+
+    def _resolve(self, import_path: str) -> tuple[str, ...]:
+        if import_path in self.fqns:
+            return (import_path,)
+        if import_path in self.packages:
+            return tuple(self.packages[import_path])
+
+        owner = import_path
+        while "." in owner:
+            owner = owner.rpartition(".")[0]
+            if owner in self.fqns:
+                return (owner,)
+
+        if self.package_prefix is not None and not import_path.startswith(
+            self.package_prefix
+        ):
+            return ()
+        return (import_path,)
@@ -0,0 +1,342 @@
+import os
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from shopy.config import path_config
+from shopy.utils import get_child_dir, read_json, write_json
+
+from .graph import SymbolTable
+
+# 保存ファイル名
+_META_JSON = "meta.json"
+_CLASSES_TXT = "classes.txt"
+_VALUES_NPY = "values.npy"
+
+# 集約対象の列の接頭辞
+_SCORE_PREFIX = "centrality_"
+
+TimestampLike = Union[str, pd.Timestamp]
+
+
+class CentralityMatrix:
+    """クラス × 時点 × 指標の中心性スコアを1つの配列で保持する
+
+    スコアは (クラス数, 時点数, 指標数) の float32 配列として values.npy に保存し、
+    メモリマップで開く。1クラスの履歴は配列上で連続しているため、必要な部分だけを
+    読み込んで問い合わせに答えられる。存在しなかった時点のスコアは NaN になる。
+
+    Attributes:
+        classes (SymbolTable): クラスFQNと行番号の対応表
+        timestamps (pd.DatetimeIndex): 時点（昇順、UTC）
+        metrics (list[str]): 指標名（centrality_scores.csv の列名）
+        values (np.ndarray): スコアの配列
+    """
+
+    def __init__(self, store_dir: Path = path_config.CENTRALITY_STORE_DIR):
+        """
+        Args:
+            store_dir (Path, optional): 保存先のディレクトリ. Defaults to path_config.CENTRALITY_STORE_DIR.
+        """
+        self.store_dir = Path(store_dir)
+        meta = read_json(self.store_dir / _META_JSON)
+        self.metrics: list[str] = meta["metrics"]
+        self.timestamps = pd.DatetimeIndex(pd.to_datetime(meta["timestamps"], utc=True))
+        self.classes = SymbolTable.load(self.store_dir / _CLASSES_TXT)
+        # values.npy は追記に備えて余分な領域を確保しているため、使用中の範囲だけを見せる
+        values = np.load(self.store_dir / _VALUES_NPY, mmap_mode="r")
+        self.values: np.ndarray = values[: len(self.classes), : len(self.timestamps)]
+
+    @classmethod
+    def build(
+        cls,
+        input_dir: Path = path_config.CENTRALITY_DATA_DIR,
+        store_dir: Path = path_config.CENTRALITY_STORE_DIR,
+    ) -> "CentralityMatrix":
+        """各時点の centrality_scores.csv から配列を作り直して保存する
+
+        Args:
+            input_dir (Path, optional): 時点ごとのディレクトリを含むディレクトリ. Defaults to path_config.CENTRALITY_DATA_DIR.
+            store_dir (Path, optional): 保存先のディレクトリ. Defaults to path_config.CENTRALITY_STORE_DIR.
+
+        Returns:
+            CentralityMatrix: 保存した配列を開いたもの
+        """
+        (Path(store_dir) / _META_JSON).unlink(missing_ok=True)
+        return cls.update(input_dir=input_dir, store_dir=store_dir)
+
+    @classmethod
+    def update(
+        cls,
+        input_dir: Path = path_config.CENTRALITY_DATA_DIR,
+        store_dir: Path = path_config.CENTRALITY_STORE_DIR,
+    ) -> "CentralityMatrix":
+        """まだ取り込んでいない時点の centrality_scores.csv だけを配列に追記する
+
+        取り込み済みの時点は meta.json に記録されており、その CSV は読み込まない。
+        新しい時点が取り込み済みの最後の時点より古い場合や、新しい指標が現れた
+        場合は配列の並びが変わるため、build で作り直す。
+
+        Args:
+            input_dir (Path, optional): 時点ごとのディレクトリを含むディレクトリ. Defaults to path_config.CENTRALITY_DATA_DIR.
+            store_dir (Path, optional): 保存先のディレクトリ. Defaults to path_config.CENTRALITY_STORE_DIR.
+
+        Returns:
+            CentralityMatrix: 追記後の配列を開いたもの
+        """
+        input_dir, store_dir = Path(input_dir), Path(store_dir)
+        if not (store_dir / _META_JSON).exists():
+            return cls._create(store_dir)._append(_read_snapshots(input_dir))
+
+        matrix = cls(store_dir)
+        snapshots = _list_snapshots(input_dir)
+        new_snapshots = [
+            (timestamp, subdir)
+            for timestamp, subdir in snapshots
+            if timestamp not in matrix.timestamps
+        ]
+        if not new_snapshots:
+            return matrix
+        if len(matrix.timestamps) and new_snapshots[0][0] < matrix.timestamps[-1]:
+            print("取り込み済みの時点より古い時点があるため、作り直します")
+            return cls.build(input_dir=input_dir, store_dir=store_dir)
+
+        appended = list(_read_snapshots(input_dir, new_snapshots))
+        if len(matrix.timestamps) and not set(
+            _score_columns(df for _, df in appended)
+        ) <= set(matrix.metrics):
+            print("新しい指標があるため、作り直します")
+            return cls.build(input_dir=input_dir, store_dir=store_dir)
+        return matrix._append(appended)
+
+    @classmethod
+    def _create(cls, store_dir: Path) -> "CentralityMatrix":
+        """空の配列を保存する"""
+        store_dir.mkdir(parents=True, exist_ok=True)
+        np.save(store_dir / _VALUES_NPY, np.zeros((0, 0, 0), dtype=np.float32))
+        SymbolTable().save(store_dir / _CLASSES_TXT)
+        write_json(
+            dict={"metrics": [], "timestamps": []}, output_dir=store_dir / _META_JSON
+        )
+        return cls(store_dir)
+
+    def _append(
+        self, snapshots: Iterable[tuple[pd.Timestamp, pd.DataFrame]]
+    ) -> "CentralityMatrix":
+        """時点を古い順に配列の末尾へ追記し、開き直したものを返す
+
+        新しく現れたクラスの、追記前の時点のスコアは NaN のままになる。
+        meta.json を最後に書き換えるため、途中で中断しても既存の内容は壊れない。
+        """
+        snapshots = list(snapshots)
+        if not snapshots:
+            return self
+        metrics = self.metrics or _score_columns(df for _, df in snapshots)
+        classes = self.classes
+        used = (len(classes), len(self.timestamps), len(self.metrics))
+        rows = [
+            classes.intern_many(df[path_config.FULL_PACKAGE_COLUMNS])
+            for _, df in snapshots
+        ]
+        first_month = len(self.timestamps)
+        num_months = first_month + len(snapshots)
+
+        values = self._reserve(used, (len(classes), num_months, len(metrics)))
+        for offset, ((_, df), month_rows) in enumerate(zip(snapshots, rows)):
+            for metric_index, metric in enumerate(metrics):
+                if metric in df.columns:
+                    values[month_rows, first_month + offset, metric_index] = df[
+                        metric
+                    ].to_numpy()
+        values.flush()
+        del values
+
+        classes.save(self.store_dir / _CLASSES_TXT)
+        write_json(
+            dict={
+                "metrics": metrics,
+                "timestamps": [timestamp.isoformat() for timestamp in self.timestamps]
+                + [timestamp.isoformat() for timestamp, _ in snapshots],
+            },
+            output_dir=self.store_dir / _META_JSON,
+        )
+        return type(self)(self.store_dir)
+
+    def _reserve(
+        self, used: tuple[int, int, int], needed: tuple[int, int, int]
+    ) -> np.memmap:
+        """needed の大きさまで書き込めるよう values.npy を開く
+
+        容量が足りない場合は、足りない次元を2倍以上に広げた配列に移し替える。
+        広げた領域は NaN で埋めるため、新しいクラスの過去の時点は NaN になる。
+
+        Args:
+            used (tuple[int, int, int]): 使用中の (クラス数, 時点数, 指標数)
+            needed (tuple[int, int, int]): 追記後の (クラス数, 時点数, 指標数)
+        """
+        path = self.store_dir / _VALUES_NPY
+        values = np.load(path, mmap_mode="r+")
+        capacity = values.shape
+        if all(size <= cap for size, cap in zip(needed, capacity)):
+            return values
+
+        shape = tuple(
+            cap if size <= cap else max(size, cap * 2)
+            for size, cap in zip(needed, capacity)
+        )
+        temp_path = path.with_name(f"{path.stem}.tmp.npy")
+        grown = np.lib.format.open_memmap(
+            temp_path, mode="w+", dtype=np.float32, shape=shape
+        )
+        grown[:] = np.nan
+        grown[: used[0], : used[1], : used[2]] = values[: used[0], : used[1], : used[2]]
+        grown.flush()
+        del values
+        os.replace(temp_path, path)
+        return grown
+
+    def history(self, fqn: str, metric: Optional[str] = None) -> pd.DataFrame:
+        """クラスの中心性スコアの履歴を取得する
+
+        Args:
+            fqn (str): クラスFQN
+            metric (Optional[str], optional): 指標名. Defaults to None（全指標）.
+
+        Raises:
+            KeyError: クラスが存在しない場合
+
+        Returns:
+            pd.DataFrame: 時点を行、指標を列とする表
+        """
+        row = self.classes.id_of(fqn)
+        if row is None:
+            raise KeyError(fqn)
+        metrics = self._metric_indices(metric)
+        return pd.DataFrame(
+            np.asarray(self.values[row][:, metrics]),
+            index=self.timestamps,
+            columns=[self.metrics[i] for i in metrics],
+        )
+
+    def top_n(
+        self,
+        timestamp: TimestampLike,
+        n: int = 10,
+        metric: str = path_config.CENTRALITY_COLUMNS,
+    ) -> pd.Series:
+        """ある時点で中心性スコアが高いクラスを取得する
+
+        Args:
+            timestamp (TimestampLike): 時点。一致する時点がなければ直前の時点を使う
+            n (int, optional): 取得するクラス数. Defaults to 10.
+            metric (str, optional): 並べ替えに使う指標. Defaults to path_config.CENTRALITY_COLUMNS.
+
+        Returns:
+            pd.Series: クラスFQNをインデックスとする降順のスコア
+        """
+        month = self._month_index(timestamp)
+        [metric_index] = self._metric_indices(metric)
+        scores = np.asarray(self.values[:, month, metric_index])
+        rows = np.flatnonzero(~np.isnan(scores))
+        n = min(n, len(rows))
+        top = rows[np.argpartition(-scores[rows], n - 1)[:n]] if n else rows[:0]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return pd.Series(
+            scores[top], index=self.classes.names(top.tolist()), name=metric
+        )
+
+    def window(
+        self,
+        start: Optional[TimestampLike] = None,
+        end: Optional[TimestampLike] = None,
+        metric: str = path_config.CENTRALITY_COLUMNS,
+    ) -> pd.DataFrame:
+        """期間内の全クラスの中心性スコアを取得する
+
+        Args:
+            start (Optional[TimestampLike], optional): 期間の開始（含む）. Defaults to None（最初から）.
+            end (Optional[TimestampLike], optional): 期間の終了（含む）. Defaults to None（最後まで）.
+            metric (str, optional): 指標名. Defaults to path_config.CENTRALITY_COLUMNS.
+
+        Returns:
+            pd.DataFrame: クラスFQNを行、時点を列とする表（load_centrality_timeseries の CSV と同じ形）
+        """
+        first = 0 if start is None else self.timestamps.searchsorted(_to_utc(start))
+        last = (
+            len(self.timestamps)
+            if end is None
+            else self.timestamps.searchsorted(_to_utc(end), side="right")
+        )
+        [metric_index] = self._metric_indices(metric)
+        return pd.DataFrame(
+            np.asarray(self.values[:, first:last, metric_index]),
+            index=pd.Index(
+                self.classes.names(range(len(self.classes))),
+                name=path_config.FULL_PACKAGE_COLUMNS,
+            ),
+            columns=self.timestamps[first:last],
+        )
+
+    def _metric_indices(self, metric: Optional[str]) -> list[int]:
+        if metric is None:
+            return list(range(len(self.metrics)))
+        return [self.metrics.index(metric)]
+
+    def _month_index(self, timestamp: TimestampLike) -> int:
+        month = self.timestamps.searchsorted(_to_utc(timestamp), side="right") - 1
+        if month < 0:
+            raise KeyError(f"{timestamp} 以前の時点がありません")
+        return int(month)
+
+
+def _to_utc(timestamp: TimestampLike) -> pd.Timestamp:
+    return pd.to_datetime(timestamp, utc=True)
+
+
+def _score_columns(dataframes: Iterable[pd.DataFrame]) -> list[str]:
+    """中心性スコアの列名を最初に現れた順に重複なく取得する"""
+    columns: dict[str, None] = {}
+    for df in dataframes:
+        columns.update(
+            (col, None) for col in df.columns if col.startswith(_SCORE_PREFIX)
+        )
+    return list(columns)
+
+
+def _list_snapshots(input_dir: Path) -> list[tuple[pd.Timestamp, str]]:
+    """時点ごとのディレクトリを古い順に取得する"""
+    snapshots: list[tuple[pd.Timestamp, str]] = []
+    for subdir in get_child_dir(input_dir):
+        try:
+            snapshots.append((pd.to_datetime(subdir, utc=True), subdir))
+        except Exception:
+            print(f"スキップ（無効な日付）: {subdir}")
+    return sorted(snapshots)
+
+
+def _read_snapshots(
+    input_dir: Path, snapshots: Optional[list[tuple[pd.Timestamp, str]]] = None
+) -> Iterator[tuple[pd.Timestamp, pd.DataFrame]]:
+    """時点ごとの centrality_scores.csv を古い順に読み込む
+
+    Args:
+        input_dir (Path): 時点ごとのディレクトリを含むディレクトリ
+        snapshots (Optional[list[tuple[pd.Timestamp, str]]], optional): 読み込む時点. Defaults to None（すべて）.
+    """
+    if snapshots is None:
+        snapshots = _list_snapshots(input_dir)
+    for timestamp, subdir in snapshots:
+        input_csv = input_dir / subdir / path_config.CENTRALITY_CSV
+        try:
+            df = pd.read_csv(input_csv)
+        except Exception as e:
+            print(f"読み込みエラー: {input_csv} → {e}")
+            continue
+        if path_config.FULL_PACKAGE_COLUMNS not in df.columns:
+            print(
+                f"警告: {input_csv} に '{path_config.FULL_PACKAGE_COLUMNS}' 列が存在しません。"
+            )
+            continue
+        yield timestamp, df
@@ -0,0 +1,164 @@
+from typing import Optional
+
+import numpy as np
+from scipy import sparse
+
+from .graph import DependencyGraph, DependencyGraphBuilder
+
+
+class PageRankNotConvergedError(RuntimeError):
+    """べき乗法が最大反復回数以内に収束しなかった"""
+
+    def __init__(self, max_iter: int):
+        super().__init__(f"PageRank が {max_iter} 回の反復で収束しませんでした")
+        self.max_iter = max_iter
+
+
+def pagerank_csr(
+    src: np.ndarray,
+    dst: np.ndarray,
+    num_nodes: int,
+    alpha: float = 0.85,
+    max_iter: int = 100,
+    tol: float = 1e-06,
+    nstart: Optional[np.ndarray] = None,
+) -> tuple[np.ndarray, int]:
+    """整数IDの辺リストから PageRank をべき乗法で計算する
+
+    `nx.pagerank` と同じく、出次数0のノードのスコアは全ノードに均等に配り、
+    L1 誤差が num_nodes * tol を下回った時点で収束とみなす。重複した辺は1本として扱う。
+
+    Args:
+        src (np.ndarray): 辺の始点ID
+        dst (np.ndarray): 辺の終点ID
+        num_nodes (int): ノード数（IDは 0 以上 num_nodes 未満）
+        alpha (float, optional): ダンピング係数. Defaults to 0.85.
+        max_iter (int, optional): 最大反復回数. Defaults to 100.
+        tol (float, optional): 収束判定の許容誤差. Defaults to 1e-06.
+        nstart (Optional[np.ndarray], optional): 初期スコア（前回の結果など）. Defaults to None（一様）.
+
+    Raises:
+        PageRankNotConvergedError: 最大反復回数以内に収束しなかった場合
+
+    Returns:
+        tuple[np.ndarray, int]: ノードIDの順のスコアと反復回数
+    """
+    if num_nodes == 0:
+        return np.zeros(0), 0
+
+    # 重複した辺を除く（DiGraph と同じ扱い）
+    keys = np.unique(
+        np.asarray(src, dtype=np.int64) * num_nodes + np.asarray(dst, dtype=np.int64)
+    )
+    src, dst = np.divmod(keys, num_nodes)
+
+    out_degree = np.bincount(src, minlength=num_nodes).astype(float)
+    dangling = out_degree == 0
+    # 転置した遷移行列 M[dst, src] = 1 / outdeg(src) を作り、x @ A を M @ x で計算する
+    transition = sparse.csr_array(
+        (1.0 / out_degree[src], (dst, src)), shape=(num_nodes, num_nodes)
+    )
+
+    uniform = np.full(num_nodes, 1.0 / num_nodes)
+    if nstart is None:
+        x = uniform
+    else:
+        x = np.asarray(nstart, dtype=float)
+        x = x / x.sum()
+
+    for iteration in range(1, max_iter + 1):
+        xlast = x
+        x = (
+            alpha * (transition @ x + x[dangling].sum() * uniform)
+            + (1 - alpha) * uniform
+        )
+        if np.abs(x - xlast).sum() < num_nodes * tol:
+            return x, iteration
+    raise PageRankNotConvergedError(max_iter)
+
+
+class PageRankEngine:
+    """依存関係から PageRank を計算する
+
+    グラフを networkx のオブジェクトにせず、整数IDの疎行列に対してべき乗法を行う。
+    前回計算したスコアをシンボルIDの配列として保持しておき、次の時点の計算の
+    初期値に使うため、ほとんど変わらない月次のグラフを順に計算すると少ない反復で収束する。
+    """
+
+    def __init__(
+        self,
+        alpha: float = 0.85,
+        max_iter: int = 100,
+        tol: float = 1e-06,
+        warm_start: bool = True,
+        builder: Optional[DependencyGraphBuilder] = None,
+    ):
+        """
+        Args:
+            alpha (float, optional): ダンピング係数. Defaults to 0.85.
+            max_iter (int, optional): 最大反復回数. Defaults to 100.
+            tol (float, optional): 収束判定の許容誤差. Defaults to 1e-06.
+            warm_start (bool, optional): 前回のスコアを初期値に使うか. Defaults to True.
+            builder (Optional[DependencyGraphBuilder], optional): グラフの構築に使うビルダー. Defaults to None（新規作成）.
+        """
+        self.alpha = alpha
+        self.max_iter = max_iter
+        self.tol = tol
+        self.warm_start = warm_start
+        self.builder = builder if builder is not None else DependencyGraphBuilder()
+        # 直前の計算の反復回数
+        self.last_iterations = 0
+        # シンボルIDごとの前回のスコア（前回存在しなかったノードは NaN）
+        self._previous = np.zeros(0)
+
+    def rank(self, file_dependency: dict) -> dict[str, float]:
+        """依存関係からクラスごとの PageRank を計算する
+
+        Args:
+            file_dependency (dict): ファイルパスをキー、"fqn"と"imp"を含む辞書を値とする依存情報
+
+        Returns:
+            dict[str, float]: クラスFQNとスコア（ノードの追加順は build_dependency_graph と同じ）
+        """
+        graph = self.builder.build(file_dependency)
+        scores = self.rank_graph(graph)
+        return dict(zip(graph.symbols.names(graph.nodes.tolist()), scores.tolist()))
+
+    def rank_graph(self, graph: DependencyGraph) -> np.ndarray:
+        """整数IDのグラフの PageRank を計算する
+
+        Args:
+            graph (DependencyGraph): 依存関係グラフ
+
+        Returns:
+            np.ndarray: graph.nodes の順のスコア
+        """
+        src, dst = graph.local_edges()
+        scores, self.last_iterations = pagerank_csr(
+            src,
+            dst,
+            graph.num_nodes,
+            alpha=self.alpha,
+            max_iter=self.max_iter,
+            tol=self.tol,
+            nstart=self._initial_scores(graph),
+        )
+        if self.warm_start:
+            self._previous = np.full(len(graph.symbols), np.nan)
+            self._previous[graph.nodes] = scores
+        return scores
+
+    def reset(self) -> None:
+        """保持している前回のスコアを破棄する"""
+        self._previous = np.zeros(0)
+
+    def _initial_scores(self, graph: DependencyGraph) -> Optional[np.ndarray]:
+        if not (self.warm_start and len(self._previous) and graph.num_nodes):
+            return None
+        # 前回以降に登録されたシンボルの分を NaN で埋める
+        previous = np.full(len(graph.symbols), np.nan)
+        previous[: len(self._previous)] = self._previous
+        initial = previous[graph.nodes]
+        # 新しく現れたノードには一様な値を与える
+        initial[np.isnan(initial)] = 1.0 / graph.num_nodes
+        return initial
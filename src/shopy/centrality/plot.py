@@ -0,0 +1,196 @@
+import multiprocessing
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterator, Optional
+
+import numpy as np
+import pandas as pd
+from matplotlib.figure import Figure
+from tqdm import tqdm
+
+from shopy.utils import sanitize_filename
+
+
+def select_classes(
+    df: pd.DataFrame,
+    top_k: Optional[int] = None,
+    min_volatility: Optional[float] = None,
+) -> list[str]:
+    """描画するクラスを絞り込む
+
+    Args:
+        df (pd.DataFrame): クラスFQNを行、時点を列とする中心性スコアの表
+        top_k (Optional[int], optional): 期間中の最大スコアが上位 top_k 件のクラスのみ. Defaults to None.
+        min_volatility (Optional[float], optional): 時点間の変化量の標準偏差がこの値以上のクラスのみ. Defaults to None.
+
+    Returns:
+        list[str]: クラスFQNのリスト（df の行の順）
+    """
+    selected = pd.Series(True, index=df.index)
+    if min_volatility is not None:
+        volatility = df.diff(axis=1).std(axis=1, skipna=True)
+        selected &= volatility >= min_volatility
+    if top_k is not None:
+        peak = df.max(axis=1, skipna=True)
+        selected &= df.index.isin(peak.nlargest(top_k).index)
+    return df.index[selected].tolist()
+
+
+class _ClassPlotter:
+    """1枚の図を使い回してクラスごとのグラフを保存する
+
+    図と軸は最初に1回だけ作り、クラスごとに線のデータとタイトルだけを差し替える。
+    """
+
+    def __init__(
+        self,
+        score_name: str,
+        x: np.ndarray,
+        x_range: tuple,
+        y_range: tuple[float, float],
+    ):
+        self.figure = Figure(figsize=(10, 5))
+        ax = self.figure.add_subplot()
+        (self.line,) = ax.plot(
+            x,
+            np.full(len(x), np.nan),
+            color="lightblue",
+            marker="o",
+            linestyle="-",
+            markersize=4,  # 点の大きさを小さく
+        )
+        self.title = ax.set_title("\n", fontsize=14)
+        ax.set_xlabel("Time", fontsize=12)
+        ax.set_ylabel(score_name, fontsize=12)
+        ax.tick_params(axis="x", labelrotation=45, labelsize=10)
+        ax.tick_params(axis="y", labelsize=10)
+        ax.set_yscale("log")  # Y軸を対数スケールに設定
+        ax.set_xlim(*x_range)
+        ax.set_ylim(*y_range)
+        self.score_name = score_name
+
+    def save(self, fqn: str, y: np.ndarray, save_path: Path) -> None:
+        self.line.set_ydata(y)
+        self.title.set_text(f"{self.score_name} Over Time\n{fqn}".replace("$", "\\$"))
+        self.figure.savefig(save_path)
+
+
+def _render_chunk(
+    score_name: str,
+    x: np.ndarray,
+    x_range: tuple,
+    y_range: tuple[float, float],
+    fqns: list[str],
+    values: np.ndarray,
+    output_dir: Path,
+) -> int:
+    """ワーカープロセスでクラスの塊を描画する"""
+    plotter = _get_plotter(score_name, x, x_range, y_range)
+    for fqn, y in zip(fqns, values):
+        plotter.save(fqn, y, output_dir / f"{sanitize_filename(fqn)}.png")
+    return len(fqns)
+
+
+# ワーカープロセスごとに使い回す図（同じ指標の間は作り直さない）
+_plotter_cache: dict[tuple, _ClassPlotter] = {}
+
+
+def _get_plotter(
+    score_name: str, x: np.ndarray, x_range: tuple, y_range: tuple[float, float]
+) -> _ClassPlotter:
+    key = (score_name, x.tobytes(), x_range, y_range)
+    plotter = _plotter_cache.get(key)
+    if plotter is None:
+        _plotter_cache.clear()
+        plotter = _plotter_cache[key] = _ClassPlotter(score_name, x, x_range, y_range)
+        # タイトルの行数はクラスによらず同じなので、余白の調整は最初の1回だけ行う
+        plotter.title.set_text(f"{score_name} Over Time\n")
+        plotter.figure.tight_layout()
+    return plotter
+
+
+class CentralityPlotRenderer:
+    """クラスごとの中心性スコアの推移を複数プロセスで描画する
+
+    クラスを chunk_size 件ずつの塊にしてプロセスプールに渡す。各ワーカーは
+    1枚の図を使い回し、線のデータとタイトルだけを差し替えて保存する。
+    """
+
+    def __init__(self, jobs: int = 1, chunk_size: int = 200):
+        """
+        Args:
+            jobs (int, optional): 描画に使うプロセス数. Defaults to 1.
+            chunk_size (int, optional): 1回に渡すクラス数. Defaults to 200.
+        """
+        self.jobs = jobs
+        self.chunk_size = chunk_size
+
+    def render(
+        self,
+        df: pd.DataFrame,
+        score_name: str,
+        output_dir: Path,
+        classes: Optional[list[str]] = None,
+        y_max: float = 0.05,
+    ) -> int:
+        """クラスごとのグラフを PNG で保存する
+
+        Args:
+            df (pd.DataFrame): クラスFQNを行、時点を列とする中心性スコアの表
+            score_name (str): 指標名（タイトルと軸ラベルに使う）
+            output_dir (Path): 出力先のディレクトリ
+            classes (Optional[list[str]], optional): 描画するクラス. Defaults to None（すべて）.
+            y_max (float, optional): Y軸の上限. Defaults to 0.05.
+
+        Returns:
+            int: 保存したグラフの数
+        """
+        output_dir.mkdir(parents=True, exist_ok=True)
+        x = pd.to_datetime(df.columns).to_numpy()
+        # 軸の範囲は絞り込む前の全クラスで揃える
+        x_range = (x.min(), x.max())
+        y_range = (float(df.min().min()), y_max)
+        if classes is not None:
+            df = df.loc[classes]
+
+        tasks = (
+            (
+                score_name,
+                x,
+                x_range,
+                y_range,
+                df.index[start : start + self.chunk_size].tolist(),
+                df.iloc[start : start + self.chunk_size].to_numpy(dtype=float),
+                output_dir,
+            )
+            for start in range(0, len(df), self.chunk_size)
+        )
+        rendered = 0
+        with tqdm(
+            total=len(df),
+            desc=f"{score_name} をプロット中",
+            leave=True,
+            dynamic_ncols=True,
+        ) as progress:
+            for count in self._run(tasks):
+                rendered += count
+                progress.update(count)
+        return rendered
+
+    def _run(self, tasks: Iterator[tuple]) -> Iterator[int]:
+        if self.jobs <= 1:
+            for task in tasks:
+                yield _render_chunk(*task)
+            return
+
+        with ProcessPoolExecutor(
+            max_workers=self.jobs, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            in_flight: deque[Future] = deque()
+            for task in tasks:
+                in_flight.append(executor.submit(_render_chunk, *task))
+                if len(in_flight) >= self.jobs * 2:
+                    yield in_flight.popleft().result()
+            while in_flight:
+                yield in_flight.popleft().result()
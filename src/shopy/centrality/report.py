@@ -0,0 +1,261 @@
+import base64
+import html
+import json
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from shopy.config import path_config
+
+from .matrix import CentralityMatrix
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets 法で点を間引く
+
+    先頭と末尾の点を残し、残りをバケットに分けて、前に選んだ点と次のバケットの
+    平均点とで作る三角形の面積が最大になる点を各バケットから1つずつ選ぶ。
+
+    Args:
+        x (np.ndarray): X座標（昇順）
+        y (np.ndarray): Y座標
+        threshold (int): 残す点の数
+
+    Returns:
+        np.ndarray: 残す点の添字（昇順）
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    every = (n - 2) / (threshold - 2)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        # 次のバケットの平均点
+        avg_start = int((i + 1) * every) + 1
+        avg_end = min(int((i + 2) * every) + 1, n)
+        avg_x = x[avg_start:avg_end].mean()
+        avg_y = y[avg_start:avg_end].mean()
+
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def write_centrality_report(
+    matrix: CentralityMatrix,
+    output_path: Path = path_config.CENTRALITY_REPORT_HTML,
+    metrics: Optional[list[str]] = None,
+    max_points: int = 300,
+) -> None:
+    """中心性スコアの時系列を1つの HTML ファイルにまとめる
+
+    各クラスの系列は max_points 点まで間引き、float32 の配列として埋め込む。
+    グラフはブラウザで FQN を検索して選んだときに描画するため、
+    クラスごとの画像は作らない。
+
+    Args:
+        matrix (CentralityMatrix): 中心性スコアの時系列
+        output_path (Path, optional): 出力先のファイルパス. Defaults to path_config.CENTRALITY_REPORT_HTML.
+        metrics (Optional[list[str]], optional): 埋め込む指標. Defaults to None（centrality_score のみ）.
+        max_points (int, optional): 1系列あたりの最大点数. Defaults to 300.
+    """
+    metrics = metrics or [path_config.CENTRALITY_COLUMNS]
+    # 時点は UNIX 時間（ミリ秒）で渡す
+    months = matrix.timestamps.asi8 // 1_000_000
+    x = np.arange(len(months), dtype=float)
+
+    series = {}
+    for metric in metrics:
+        metric_index = matrix.metrics.index(metric)
+        offsets = np.zeros(len(matrix.classes) + 1, dtype=np.uint32)
+        month_chunks: list[np.ndarray] = []
+        value_chunks: list[np.ndarray] = []
+        for row in range(len(matrix.classes)):
+            y = np.asarray(matrix.values[row, :, metric_index])
+            present = np.flatnonzero(~np.isnan(y))
+            kept = present[lttb(x[present], y[present].astype(float), max_points)]
+            month_chunks.append(kept.astype(np.uint16))
+            value_chunks.append(y[kept].astype(np.float32))
+            offsets[row + 1] = offsets[row] + len(kept)
+        series[metric] = {
+            "offsets": _encode(offsets),
+            "months": _encode(np.concatenate(month_chunks or [np.zeros(0, np.uint16)])),
+            "values": _encode(
+                np.concatenate(value_chunks or [np.zeros(0, np.float32)])
+            ),
+        }
+
+    data = {
+        "classes": matrix.classes.names(range(len(matrix.classes))),
+        "months": months.tolist(),
+        "series": series,
+    }
+    # </script> で埋め込みが途切れないようにする
+    payload = json.dumps(data, ensure_ascii=False).replace("</", "<\\/")
+    title = html.escape(f"Centrality report ({path_config.REPO_NAME})")
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(
+        _TEMPLATE.replace("__TITLE__", title).replace("__DATA__", payload),
+        encoding="utf-8",
+    )
+
+
+def _encode(array: np.ndarray) -> str:
+    """配列をリトルエンディアンのバイト列として base64 で符号化する"""
+    return base64.b64encode(
+        array.astype(array.dtype.newbyteorder("<")).tobytes()
+    ).decode("ascii")
+
+
+_TEMPLATE = """<!DOCTYPE html>
+<html lang="ja">
+<head>
+<meta charset="utf-8">
+<title>__TITLE__</title>
+<style>
+  body { font-family: sans-serif; margin: 16px; display: flex; gap: 16px; }
+  #side { width: 420px; flex: none; }
+  #search { width: 100%; box-sizing: border-box; padding: 4px; }
+  #results { list-style: none; padding: 0; margin: 8px 0; max-height: 80vh; overflow-y: auto; }
+  #results li { cursor: pointer; padding: 2px 4px; font-size: 12px; word-break: break-all; }
+  #results li:hover, #results li.active { background: #e6f2ff; }
+  #count { color: #666; font-size: 12px; }
+  canvas { border: 1px solid #ddd; }
+</style>
+</head>
+<body>
+<div id="side">
+  <h3>__TITLE__</h3>
+  <select id="metric"></select>
+  <label><input type="checkbox" id="log" checked> log</label>
+  <input id="search" type="search" placeholder="FQN で検索">
+  <div id="count"></div>
+  <ul id="results"></ul>
+</div>
+<div>
+  <h3 id="name"></h3>
+  <canvas id="chart" width="1000" height="500"></canvas>
+</div>
+<script id="data" type="application/json">__DATA__</script>
+<script>
+"use strict";
+const data = JSON.parse(document.getElementById("data").textContent);
+const MAX_RESULTS = 200;
+
+function decode(text, Type) {
+  const bytes = Uint8Array.from(atob(text), c => c.charCodeAt(0));
+  return new Type(bytes.buffer);
+}
+
+const series = {};
+for (const [metric, s] of Object.entries(data.series)) {
+  series[metric] = {
+    offsets: decode(s.offsets, Uint32Array),
+    months: decode(s.months, Uint16Array),
+    values: decode(s.values, Float32Array),
+  };
+}
+
+const metricSelect = document.getElementById("metric");
+for (const metric of Object.keys(series)) {
+  metricSelect.add(new Option(metric, metric));
+}
+const search = document.getElementById("search");
+const results = document.getElementById("results");
+const logScale = document.getElementById("log");
+let current = null;
+
+function showResults() {
+  const query = search.value.trim().toLowerCase();
+  results.replaceChildren();
+  let count = 0;
+  for (let i = 0; i < data.classes.length; i++) {
+    if (query && !data.classes[i].toLowerCase().includes(query)) continue;
+    count++;
+    if (count > MAX_RESULTS) continue;
+    const item = document.createElement("li");
+    item.textContent = data.classes[i];
+    item.onclick = () => { current = i; draw(); };
+    results.append(item);
+  }
+  document.getElementById("count").textContent =
+    count > MAX_RESULTS ? `${count} 件中 ${MAX_RESULTS} 件を表示` : `${count} 件`;
+}
+
+function draw() {
+  if (current === null) return;
+  const metric = metricSelect.value;
+  const s = series[metric];
+  const start = s.offsets[current], end = s.offsets[current + 1];
+  const xs = [], ys = [];
+  for (let k = start; k < end; k++) {
+    xs.push(data.months[s.months[k]]);
+    ys.push(s.values[k]);
+  }
+  document.getElementById("name").textContent = `${metric} Over Time: ${data.classes[current]}`;
+
+  const canvas = document.getElementById("chart");
+  const ctx = canvas.getContext("2d");
+  const pad = { left: 80, right: 20, top: 20, bottom: 60 };
+  const w = canvas.width - pad.left - pad.right;
+  const h = canvas.height - pad.top - pad.bottom;
+  ctx.clearRect(0, 0, canvas.width, canvas.height);
+  if (!xs.length) return;
+
+  const useLog = logScale.checked && ys.every(v => v > 0);
+  const f = useLog ? Math.log10 : (v => v);
+  const x0 = data.months[0], x1 = data.months[data.months.length - 1];
+  let y0 = Math.min(...ys.map(f)), y1 = Math.max(...ys.map(f));
+  if (y0 === y1) { y0 -= 1; y1 += 1; }
+  const px = t => pad.left + (x1 === x0 ? w / 2 : (t - x0) / (x1 - x0) * w);
+  const py = v => pad.top + (1 - (f(v) - y0) / (y1 - y0)) * h;
+
+  ctx.strokeStyle = "#999";
+  ctx.strokeRect(pad.left, pad.top, w, h);
+  ctx.fillStyle = "#333";
+  ctx.font = "12px sans-serif";
+  ctx.textAlign = "right";
+  for (let i = 0; i <= 4; i++) {
+    const v = y0 + (y1 - y0) * i / 4;
+    const y = pad.top + (1 - i / 4) * h;
+    ctx.fillText((useLog ? 10 ** v : v).toPrecision(3), pad.left - 6, y + 4);
+  }
+  ctx.textAlign = "center";
+  for (let i = 0; i <= 6; i++) {
+    const t = x0 + (x1 - x0) * i / 6;
+    ctx.fillText(new Date(t).toISOString().slice(0, 7), px(t), pad.top + h + 20);
+  }
+
+  ctx.strokeStyle = "lightblue";
+  ctx.fillStyle = "lightblue";
+  ctx.lineWidth = 1.5;
+  ctx.beginPath();
+  xs.forEach((t, k) => k ? ctx.lineTo(px(t), py(ys[k])) : ctx.moveTo(px(t), py(ys[k])));
+  ctx.stroke();
+  xs.forEach((t, k) => {
+    ctx.beginPath();
+    ctx.arc(px(t), py(ys[k]), 3, 0, 2 * Math.PI);
+    ctx.fill();
+  });
+}
+
+search.oninput = showResults;
+metricSelect.onchange = draw;
+logScale.onchange = draw;
+showResults();
+</script>
+</body>
+</html>
+"""
@@ -1,4 +1,40 @@
-from .git import get_last_commit_date, get_monthly_commits, reset_repo_state
-from .hash import GitHash
-from .reset import GitReset
-from .shell import run_cmd
+from typing import TYPE_CHECKING
+
+from shopy._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .git import get_last_commit_date, get_monthly_commits, reset_repo_state
+    from .hash import GitHash
+    from .object_reader import GitObjectReader
+    from .reset import GitReset
+    from .shell import (
+        CommandFailedError,
+        CommandStream,
+        CommandTimeoutError,
+        run_cmd,
+        stream_cmd,
+    )
+    from .snapshot import FileChange, GitSnapshotReader
+    from .snapshot_scheduler import SnapshotScheduler, split_blocks
+
+# 公開名と定義しているモジュール（最初に参照されたときに読み込む）
+_EXPORTS = {
+    "get_last_commit_date": ".git",
+    "get_monthly_commits": ".git",
+    "reset_repo_state": ".git",
+    "GitHash": ".hash",
+    "GitObjectReader": ".object_reader",
+    "GitReset": ".reset",
+    "CommandFailedError": ".shell",
+    "CommandStream": ".shell",
+    "CommandTimeoutError": ".shell",
+    "run_cmd": ".shell",
+    "stream_cmd": ".shell",
+    "FileChange": ".snapshot",
+    "GitSnapshotReader": ".snapshot",
+    "SnapshotScheduler": ".snapshot_scheduler",
+    "split_blocks": ".snapshot_scheduler",
+}
+
+__all__ = list(_EXPORTS)
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
@@ -2,67 +2,100 @@ from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from time import sleep
 
-from dateutil.relativedelta import relativedelta
-
 import shopy as sp
 
 
+# 集計単位ごとのキーの作り方（キーの文字列順が時系列順になる）
+_BUCKET_KEYS = {
+    "day": lambda dt: dt.strftime("%Y-%m-%d"),
+    "week": lambda dt: dt.strftime("%G-W%V"),
+    "month": lambda dt: dt.strftime("%Y-%m"),
+    "quarter": lambda dt: f"{dt.year}-Q{(dt.month - 1) // 3 + 1}",
+}
+
+
 def get_monthly_commits(
     repo_path: str,
     branch: str = "main",
     start_date: str = "2023-01-01",
     end_date: str = "2024-12-31",
-) -> tuple[str, str]:
-    """
-    各月の最後のコミットのハッシュとUTCのISO形式日時を取得する
-
-    Returns:
-        dict[str, tuple[commit_hash, commit_date]]
+    granularity: str = "month",
+) -> tuple[list[str], list[datetime]]:
     """
-    start = datetime.strptime(start_date, "%Y-%m-%d")
-    end = datetime.strptime(end_date, "%Y-%m-%d")
-
-    monthly_commits: dict[str, tuple[str, str]] = {}
-    current = start
-
-    while current <= end:
-        next_month = current + relativedelta(months=1)
-        since = current.strftime("%Y-%m-%d")
-        until = (next_month - timedelta(days=1)).strftime("%Y-%m-%d")
+    各期間（既定は月）の最後のコミットのハッシュとUTCの日時を取得する
 
-        cmd = (
-            f"git log {branch} "
-            f'--after="{since}" --before="{until}" '
-            f"--pretty=format:'%H|%aI' --reverse"
-        )
-
-        commits = sp.run_cmd(cmd, cwd=repo_path)
-        if commits:
-            last_commit_line = commits[-1]
-            if "|" in last_commit_line:
-                commit_hash, commit_date = last_commit_line.split("|", 1)
-                commit_date_utc = datetime.fromisoformat(commit_date).astimezone(
-                    timezone.utc
-                )
-                monthly_key = since[:7]
-                monthly_commits[monthly_key] = (commit_hash, commit_date_utc)
+    branch の first-parent 履歴を1回だけ読み、コミット日時（UTC）で期間ごとに
+    振り分ける。各期間では履歴上もっとも新しいコミットを採用する。
 
-        current = next_month
+    Args:
+        repo_path (str): リポジトリのパス
+        branch (str, optional): 対象のブランチ. Defaults to "main".
+        start_date (str, optional): 開始日（この日を含む）. Defaults to "2023-01-01".
+        end_date (str, optional): 終了日（この日を含む）. Defaults to "2024-12-31".
+        granularity (str, optional): "day", "week", "month", "quarter" のいずれか. Defaults to "month".
 
-        sorted_months = sorted(monthly_commits.keys())
-        filtered_hashes = [monthly_commits[month][0] for month in sorted_months]
-        filtered_dates = [monthly_commits[month][1] for month in sorted_months]
+    Returns:
+        tuple[list[str], list[datetime]]: 古い順のコミットハッシュと作者日時（UTC）
+    """
+    if granularity not in _BUCKET_KEYS:
+        raise ValueError(f"未対応の集計単位です: {granularity}")
+    bucket_key = _BUCKET_KEYS[granularity]
+
+    start = datetime.strptime(start_date, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+    end = datetime.strptime(end_date, "%Y-%m-%d").replace(
+        tzinfo=timezone.utc
+    ) + timedelta(days=1)
+
+    commits = sp.stream_cmd(
+        [
+            "git",
+            "log",
+            branch,
+            "--first-parent",
+            f"--since={start.isoformat()}",
+            "--pretty=format:%H|%aI|%cI",
+        ],
+        cwd=repo_path,
+    )
 
+    # 新しい順に読むので、各期間で最初に現れたコミットがその期間の最後のコミット
+    bucket_commits: dict[str, tuple[str, datetime]] = {}
+    for line in commits:
+        if line.count("|") != 2:
+            continue
+        commit_hash, author_date, committer_date = line.split("|")
+        committed_at = datetime.fromisoformat(committer_date).astimezone(timezone.utc)
+        if not start <= committed_at < end:
+            continue
+
+        key = bucket_key(committed_at)
+        if key not in bucket_commits:
+            bucket_commits[key] = (
+                commit_hash,
+                datetime.fromisoformat(author_date).astimezone(timezone.utc),
+            )
+
+    sorted_keys = sorted(bucket_commits)
+    filtered_hashes = [bucket_commits[key][0] for key in sorted_keys]
+    filtered_dates = [bucket_commits[key][1] for key in sorted_keys]
     return filtered_hashes, filtered_dates
 
 
 def get_last_commit_date(repo_path: Path, limit_year: str) -> tuple[str, str]:
-    all_commits: list[str] = sp.run_cmd(
-        cmd=f"git log --before={limit_year}-01-01T00:00:00+00:00 --pretty=format:'%H|%aI' --reverse",
-        cwd=repo_path,
+    last_commit: list[str] = list(
+        sp.stream_cmd(
+            [
+                "git",
+                "log",
+                "-1",
+                "--first-parent",
+                f"--before={limit_year}-01-01T00:00:00+00:00",
+                "--pretty=format:%H|%aI",
+            ],
+            cwd=repo_path,
+        )
     )
-    last_commit_hash: str = all_commits[-1].split("|")[0]
-    last_commit_date: str = all_commits[-1].split("|")[1]
+    last_commit_hash, last_commit_date = last_commit[-1].split("|")
     return last_commit_hash, last_commit_date
 
 
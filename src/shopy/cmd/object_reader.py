@@ -0,0 +1,275 @@
+import atexit
+import os
+import subprocess
+import threading
+from pathlib import Path
+from typing import IO, Iterable, Iterator, NamedTuple, Optional
+
+
+class GitObjectInfo(NamedTuple):
+    oid: str
+    type: str
+    size: int
+
+
+class TreeEntry(NamedTuple):
+    mode: str
+    name: bytes
+    oid: str
+
+
+class GitObjectReader:
+    """リポジトリごとに常駐させた git プロセスからオブジェクトを読み出す
+
+    `git cat-file --batch`（内容）と `git cat-file --batch-check`（型とサイズ）を
+    1つずつ起動したまま使い回すため、オブジェクトごとのプロセス起動が不要になる。
+    内容はデコードせずに bytes のまま返す。
+    """
+
+    # (プロセスID, リポジトリパス) ごとのインスタンス。fork 後の子プロセスが
+    # 親のパイプを共有しないようにプロセスIDもキーに含める
+    _pool: dict[tuple[int, Path], "GitObjectReader"] = {}
+    _pool_lock = threading.Lock()
+
+    def __init__(self, repo_path: Path):
+        self.repo_path = Path(repo_path)
+        self._batch: Optional[subprocess.Popen] = None
+        self._batch_check: Optional[subprocess.Popen] = None
+        self._batch_lock = threading.Lock()
+        self._check_lock = threading.Lock()
+
+    @classmethod
+    def for_repo(cls, repo_path: Path) -> "GitObjectReader":
+        """リポジトリごとに共有されるインスタンスを取得する
+
+        Args:
+            repo_path (Path): リポジトリのパス
+
+        Returns:
+            GitObjectReader: 共有インスタンス
+        """
+        key = (os.getpid(), Path(repo_path).resolve())
+        with cls._pool_lock:
+            if key not in cls._pool:
+                cls._pool[key] = cls(key[1])
+            return cls._pool[key]
+
+    @classmethod
+    def close_all(cls) -> None:
+        """共有インスタンスの git プロセスをすべて終了する"""
+        with cls._pool_lock:
+            readers = [
+                reader for (pid, _), reader in cls._pool.items() if pid == os.getpid()
+            ]
+            cls._pool.clear()
+        for reader in readers:
+            reader.close()
+
+    def __enter__(self) -> "GitObjectReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def info(self, oid: str) -> Optional[GitObjectInfo]:
+        """オブジェクトの型とサイズを取得する
+
+        Args:
+            oid (str): オブジェクト名（ハッシュや `<commit>:<path>` 形式も可）
+
+        Returns:
+            Optional[GitObjectInfo]: 存在しない場合は None
+        """
+        [info] = self.info_many([oid])
+        return info
+
+    def info_many(self, oids: Iterable[str]) -> list[Optional[GitObjectInfo]]:
+        """複数オブジェクトの型とサイズをまとめて取得する
+
+        Args:
+            oids (Iterable[str]): オブジェクト名の列
+
+        Returns:
+            list[Optional[GitObjectInfo]]: 要求順の結果。存在しない場合は None
+        """
+        oids = list(oids)
+        with self._check_lock:
+            process = self._ensure_process("_batch_check", "--batch-check")
+            writer = self._write_requests(process, oids)
+            try:
+                return [self._read_header(process.stdout) for _ in oids]
+            finally:
+                writer.join()
+
+    def read(self, oid: str, obj_type: Optional[str] = None) -> bytes:
+        """オブジェクトの内容を読み出す
+
+        Args:
+            oid (str): オブジェクト名（ハッシュや `<commit>:<path>` 形式も可）
+            obj_type (Optional[str], optional): 期待する型（blob, tree, commit など）
+
+        Raises:
+            KeyError: オブジェクトが存在しない場合
+
+        Returns:
+            bytes: オブジェクトの内容
+        """
+        [data] = self.read_many([oid], obj_type=obj_type)
+        if data is None:
+            raise KeyError(f"オブジェクトが見つかりません: {oid}")
+        return data
+
+    def read_many(
+        self, oids: Iterable[str], obj_type: Optional[str] = None, strict: bool = True
+    ) -> Iterator[Optional[bytes]]:
+        """複数オブジェクトの内容をまとめて読み出す
+
+        要求の書き込みと結果の読み出しを並行して行うため、往復待ちが発生しない。
+        読み出し中に同じインスタンスの read 系メソッドを呼び出してはならない。
+
+        Args:
+            oids (Iterable[str]): オブジェクト名の列
+            obj_type (Optional[str], optional): 期待する型（blob, tree, commit など）
+            strict (bool, optional): False の場合、期待する型と異なるオブジェクトは
+                存在しないものとして None を返す. Defaults to True.
+
+        Raises:
+            ValueError: strict で、期待する型と異なるオブジェクトだった場合
+
+        Yields:
+            Optional[bytes]: 要求順の内容。存在しない場合は None
+        """
+        oids = list(oids)
+        with self._batch_lock:
+            process = self._ensure_process("_batch", "--batch")
+            writer = self._write_requests(process, oids)
+            consumed = 0
+            try:
+                for oid in oids:
+                    header = self._read_header(process.stdout)
+                    data = None if header is None else self._read_body(process, header)
+                    consumed += 1
+
+                    if header is not None and obj_type not in (None, header.type):
+                        if not strict:
+                            yield None
+                            continue
+                        raise ValueError(
+                            f"{oid} は {obj_type} ではなく {header.type} です"
+                        )
+                    yield data
+            finally:
+                # 途中で打ち切られた場合も、次の要求とずれないよう残りを読み捨てる
+                for _ in range(consumed, len(oids)):
+                    header = self._read_header(process.stdout)
+                    if header is not None:
+                        self._read_body(process, header)
+                writer.join()
+
+    def read_blobs(
+        self, oids: Iterable[str], strict: bool = True
+    ) -> Iterator[Optional[bytes]]:
+        """複数のblobの内容を読み出す（strict は read_many を参照）"""
+        return self.read_many(oids, obj_type="blob", strict=strict)
+
+    def read_commits(self, oids: Iterable[str]) -> Iterator[Optional[bytes]]:
+        """複数のコミットオブジェクトの内容を読み出す"""
+        return self.read_many(oids, obj_type="commit")
+
+    def read_trees(self, oids: Iterable[str]) -> Iterator[Optional[list[TreeEntry]]]:
+        """複数のツリーを読み出し、エントリに分解する"""
+        for data in self.read_many(oids, obj_type="tree"):
+            yield None if data is None else parse_tree(data)
+
+    def close(self) -> None:
+        """常駐させた git プロセスを終了する"""
+        for name in ("_batch", "_batch_check"):
+            process: Optional[subprocess.Popen] = getattr(self, name)
+            if process is None:
+                continue
+            process.stdin.close()
+            process.wait()
+            process.stdout.close()
+            setattr(self, name, None)
+
+    def _ensure_process(self, name: str, option: str) -> subprocess.Popen:
+        process: Optional[subprocess.Popen] = getattr(self, name)
+        if process is None or process.poll() is not None:
+            process = subprocess.Popen(
+                ["git", "cat-file", option],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                cwd=self.repo_path,
+            )
+            setattr(self, name, process)
+        return process
+
+    @staticmethod
+    def _write_requests(process: subprocess.Popen, oids: list[str]) -> threading.Thread:
+        """要求を書き込む
+
+        要求が多い場合に stdin と stdout の両方のパイプが詰まらないよう、
+        結果の読み出しと並行して別スレッドで書き込む。
+        """
+
+        def write() -> None:
+            for oid in oids:
+                process.stdin.write(f"{oid}\n".encode("utf-8"))
+            process.stdin.flush()
+
+        if len(oids) <= 1:
+            # 1件だけならパイプが詰まることはないので、スレッドを起こさない
+            write()
+            writer = threading.Thread(target=lambda: None)
+        else:
+            writer = threading.Thread(target=write, daemon=True)
+        writer.start()
+        return writer
+
+    @staticmethod
+    def _read_body(process: subprocess.Popen, header: GitObjectInfo) -> bytes:
+        data = process.stdout.read(header.size)
+        # 内容の後ろには改行が1つ付く
+        process.stdout.read(1)
+        return data
+
+    @staticmethod
+    def _read_header(stdout: IO[bytes]) -> Optional[GitObjectInfo]:
+        header = stdout.readline().decode("utf-8").rstrip("\n")
+        # "<oid> missing" / "<oid> ambiguous"
+        parts = header.rsplit(" ", 2)
+        if len(parts) != 3 or not parts[2].isdigit():
+            return None
+        oid, obj_type, size = parts
+        return GitObjectInfo(oid=oid, type=obj_type, size=int(size))
+
+
+def parse_tree(data: bytes) -> list[TreeEntry]:
+    """ツリーオブジェクトの内容をエントリに分解する
+
+    Args:
+        data (bytes): `git cat-file` で読み出したツリーの内容
+
+    Returns:
+        list[TreeEntry]: (モード, 名前, オブジェクトID) のリスト
+    """
+    view = memoryview(data)
+    entries: list[TreeEntry] = []
+    pos = 0
+    while pos < len(data):
+        # "<mode> <name>\0<20バイトのID>"
+        space = data.index(b" ", pos)
+        nul = data.index(b"\0", space)
+        entries.append(
+            TreeEntry(
+                mode=data[pos:space].decode("ascii"),
+                name=bytes(view[space + 1 : nul]),
+                oid=view[nul + 1 : nul + 21].hex(),
+            )
+        )
+        pos = nul + 21
+    return entries
+
+
+atexit.register(GitObjectReader.close_all)
@@ -1,4 +1,7 @@
 import subprocess
+import threading
+from pathlib import Path
+from typing import IO, Iterable, Iterator, Optional
 
 
 def run_cmd(cmd: str, cwd: str) -> str:
@@ -28,3 +31,153 @@ def run_cmd(cmd: str, cwd: str) -> str:
     except Exception as e:
         print(f"予期しないエラーが発生しました。: {e}")
         return ""
+
+
+class CommandFailedError(subprocess.CalledProcessError):
+    """コマンドが0以外の終了コードで終了した"""
+
+
+class CommandTimeoutError(subprocess.TimeoutExpired):
+    """コマンドが制限時間内に終了しなかった"""
+
+
+class CommandStream:
+    """コマンドを引数リストで実行し、出力をレコード単位で逐次返す
+
+    出力全体をメモリに溜めずに読み込むため、巨大な履歴を扱ってもメモリ使用量が
+    一定に保たれる。失敗時は空の結果を返さず、型付きの例外を送出する。
+    """
+
+    def __init__(
+        self,
+        args: list[str],
+        cwd: Path,
+        separator: str = "\n",
+        timeout: Optional[float] = None,
+        input_lines: Optional[Iterable[str]] = None,
+    ):
+        """
+        Args:
+            args (list[str]): 実行するコマンドと引数
+            cwd (Path): 実行ディレクトリ
+            separator (str, optional): レコードの区切り文字（"\\0" など）. Defaults to "\\n".
+            timeout (Optional[float], optional): 制限時間（秒）. Defaults to None.
+            input_lines (Optional[Iterable[str]], optional): 標準入力に1行ずつ渡す値
+        """
+        self.args = args
+        self.cwd = cwd
+        self.separator = separator.encode("ascii")
+        self.timeout = timeout
+        self.input_lines = input_lines
+        # 標準出力から読み込んだバイト数
+        self.bytes_read = 0
+
+    def __iter__(self) -> Iterator[str]:
+        process = subprocess.Popen(
+            self.args,
+            cwd=self.cwd,
+            stdin=subprocess.DEVNULL if self.input_lines is None else subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+
+        # 標準入力への書き込みと標準エラーの読み込みでパイプが詰まらないよう別スレッドで行う
+        stderr_chunks: list[bytes] = []
+        threads = [
+            threading.Thread(
+                target=lambda: stderr_chunks.append(process.stderr.read()),
+                daemon=True,
+            )
+        ]
+        if self.input_lines is not None:
+            threads.append(
+                threading.Thread(
+                    target=_write_lines,
+                    args=(process.stdin, self.input_lines),
+                    daemon=True,
+                )
+            )
+        timed_out = threading.Event()
+        timer = None
+        if self.timeout is not None:
+            timer = threading.Timer(self.timeout, _kill, args=(process, timed_out))
+            timer.start()
+        for thread in threads:
+            thread.start()
+
+        try:
+            buffer = b""
+            while chunk := process.stdout.read1(1 << 16):
+                self.bytes_read += len(chunk)
+                *records, buffer = (buffer + chunk).split(self.separator)
+                for record in records:
+                    yield _decode(record)
+            if buffer:
+                yield _decode(buffer)
+            returncode = process.wait()
+        finally:
+            if timer is not None:
+                timer.cancel()
+            if process.poll() is None:
+                # 途中で読み込みをやめた場合
+                process.kill()
+                process.wait()
+            for thread in threads:
+                thread.join()
+            process.stdout.close()
+            process.stderr.close()
+
+        stderr = b"".join(stderr_chunks).decode("utf-8", errors="replace")
+        if timed_out.is_set():
+            raise CommandTimeoutError(self.args, self.timeout, stderr=stderr)
+        if returncode != 0:
+            raise CommandFailedError(returncode, self.args, stderr=stderr)
+
+
+def stream_cmd(
+    args: list[str],
+    cwd: Path,
+    separator: str = "\n",
+    timeout: Optional[float] = None,
+    input_lines: Optional[Iterable[str]] = None,
+) -> CommandStream:
+    """コマンドを引数リストで実行し、出力をレコード単位で逐次返す
+
+    Args:
+        args (list[str]): 実行するコマンドと引数（シェルは経由しない）
+        cwd (Path): 実行ディレクトリ
+        separator (str, optional): レコードの区切り文字（"\\0" など）. Defaults to "\\n".
+        timeout (Optional[float], optional): 制限時間（秒）. Defaults to None.
+        input_lines (Optional[Iterable[str]], optional): 標準入力に1行ずつ渡す値
+
+    Raises:
+        CommandFailedError: コマンドが失敗した場合（読み終えた時点で送出）
+        CommandTimeoutError: 制限時間を超えた場合
+
+    Returns:
+        CommandStream: レコードを返すイテラブル。読み込んだバイト数は bytes_read で分かる
+    """
+    return CommandStream(args, cwd, separator, timeout, input_lines)
+
+
+def _decode(record: bytes) -> str:
+    return record.decode("utf-8", errors="surrogateescape")
+
+
+def _write_lines(stream: IO[bytes], lines: Iterable[str]) -> None:
+    try:
+        for line in lines:
+            stream.write(f"{line}\n".encode("utf-8"))
+    except BrokenPipeError:
+        # コマンドが先に終了した場合
+        pass
+    finally:
+        try:
+            stream.close()
+        except BrokenPipeError:
+            pass
+
+
+def _kill(process: subprocess.Popen, timed_out: threading.Event) -> None:
+    timed_out.set()
+    process.kill()
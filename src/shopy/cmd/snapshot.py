@@ -0,0 +1,152 @@
+import subprocess
+from pathlib import Path
+from typing import Iterable, Iterator, NamedTuple, Optional
+
+from .object_reader import GitObjectReader
+
+# シンボリックリンクはファイル本体ではなくリンク先パスを保持するため除外する
+_SYMLINK_MODE = "120000"
+
+
+def _is_regular_file(mode: str) -> bool:
+    """通常ファイルのモードか（削除・サブモジュール・シンボリックリンクを除く）"""
+    return mode.startswith("100")
+
+
+class FileChange(NamedTuple):
+    """2つのコミット間でのファイルの変更
+
+    削除されたファイルは new_path と new_blob が None、追加されたファイルは
+    old_path が None になる。リネームは old_path の削除と new_path の追加を兼ねる。
+    """
+
+    status: str
+    old_path: Optional[str]
+    new_path: Optional[str]
+    new_blob: Optional[str]
+
+
+class GitSnapshotReader:
+    """ワークツリーを変更せずに、任意のコミット時点のファイル内容を読み出す
+
+    `git ls-tree` でコミット時点のファイル一覧を取得し、内容はリポジトリごとに
+    共有される GitObjectReader からまとめて読み出す。
+    """
+
+    def __init__(self, repo_path: Path, objects: Optional[GitObjectReader] = None):
+        self.repo_path = Path(repo_path)
+        self.objects = objects or GitObjectReader.for_repo(self.repo_path)
+
+    def list_files(
+        self, commit_hash: str, language: str = "java"
+    ) -> list[tuple[str, str]]:
+        """コミット時点で存在するファイルのパスとblobハッシュを取得する
+
+        Args:
+            commit_hash (str): 対象のコミット（ブランチ名やHEADも可）
+            language (str, optional): 対象言語の拡張子. Defaults to "java".
+
+        Returns:
+            list[tuple[str, str]]: (ファイルパス, blobハッシュ) のリスト
+        """
+        result = subprocess.run(
+            ["git", "ls-tree", "-r", "-z", commit_hash],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            check=True,
+            cwd=self.repo_path,
+        )
+        suffix = f".{language}"
+        files: list[tuple[str, str]] = []
+        for record in result.stdout.split(b"\0"):
+            if not record:
+                continue
+            # "<mode> <type> <hash>\t<path>"
+            meta, _, path = record.partition(b"\t")
+            mode, obj_type, obj_hash = meta.decode("ascii").split(" ")
+            file_path = self._decode_path(path)
+            if (
+                obj_type == "blob"
+                and mode != _SYMLINK_MODE
+                and file_path.endswith(suffix)
+            ):
+                files.append((file_path, obj_hash))
+        return files
+
+    def diff_files(
+        self, old_commit: str, new_commit: str, language: str = "java"
+    ) -> list[FileChange]:
+        """2つのコミット間で変更されたファイルを取得する
+
+        `git diff-tree -r -M` の結果のうち、対象言語のファイルに関わる変更のみを返す。
+        リネーム先が対象言語でない場合は削除、リネーム元が対象言語でない場合は
+        追加として扱う。
+
+        Args:
+            old_commit (str): 比較元のコミット
+            new_commit (str): 比較先のコミット
+            language (str, optional): 対象言語の拡張子. Defaults to "java".
+
+        Returns:
+            list[FileChange]: ファイルの変更のリスト
+        """
+        result = subprocess.run(
+            ["git", "diff-tree", "-r", "-z", "-M", old_commit, new_commit],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            check=True,
+            cwd=self.repo_path,
+        )
+        suffix = f".{language}"
+        records = iter(result.stdout.split(b"\0"))
+        changes: list[FileChange] = []
+        for meta in records:
+            if not meta.startswith(b":"):
+                continue
+            # ":<旧モード> <新モード> <旧blob> <新blob> <ステータス>"
+            old_mode, new_mode, _, new_blob, status = meta[1:].decode("ascii").split()
+            old_path = self._decode_path(next(records))
+            new_path = (
+                self._decode_path(next(records)) if status[0] in "RC" else old_path
+            )
+
+            if not (_is_regular_file(old_mode) and old_path.endswith(suffix)):
+                old_path = None
+            if not (_is_regular_file(new_mode) and new_path.endswith(suffix)):
+                new_path, new_blob = None, None
+            if old_path is None and new_path is None:
+                continue
+            changes.append(FileChange(status[0], old_path, new_path, new_blob))
+        return changes
+
+    def read_blob(self, blob_hash: str) -> bytes:
+        """blobの内容を読み出す
+
+        Args:
+            blob_hash (str): blobハッシュ
+
+        Returns:
+            bytes: ファイル内容
+        """
+        return self.objects.read(blob_hash, obj_type="blob")
+
+    def iter_blobs(self, blob_hashes: Iterable[str]) -> Iterator[bytes]:
+        """複数のblobをまとめて読み出す
+
+        Args:
+            blob_hashes (Iterable[str]): blobハッシュの列
+
+        Yields:
+            bytes: 要求順のファイル内容
+        """
+        blob_hashes = list(blob_hashes)
+        for blob_hash, content in zip(
+            blob_hashes, self.objects.read_blobs(blob_hashes)
+        ):
+            if content is None:
+                raise KeyError(f"オブジェクトが見つかりません: {blob_hash}")
+            yield content
+
+    @staticmethod
+    def _decode_path(path: bytes) -> str:
+        return path.decode("utf-8", errors="surrogateescape")
@@ -0,0 +1,94 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Optional, Sequence
+
+
+def split_blocks(count: int, workers: int) -> list[range]:
+    """0..count-1 をほぼ同じ長さの連続したブロックに分ける
+
+    Args:
+        count (int): 要素数
+        workers (int): ブロック数の上限
+
+    Returns:
+        list[range]: 先頭から順に並んだブロック（空のブロックは含まない）
+    """
+    blocks = max(1, min(workers, count))
+    size, remainder = divmod(count, blocks)
+    ranges = []
+    start = 0
+    for index in range(blocks):
+        end = start + size + (index < remainder)
+        if end > start:
+            ranges.append(range(start, end))
+        start = end
+    return ranges
+
+
+class SnapshotScheduler:
+    """複数のコミット（スナップショット）を並列に処理する
+
+    コミットの列を workers 個の連続したブロックに分け、ブロックごとに1つの
+    ワーカープロセスで古い順に処理する。ブロックの先頭だけは全体を作り、
+    以降は直前のコミットとの差分で更新するといった処理をブロック内で行える。
+    各コミットの出力先は呼び出し側が決めるため、完了順によらず結果は同じになる。
+
+    ワークツリーを変更しない（git のオブジェクトから読む）処理にのみ使うこと。
+    """
+
+    def __init__(self, workers: Optional[int] = None):
+        """
+        Args:
+            workers (Optional[int], optional): ワーカープロセス数. Defaults to None（CPU数）.
+        """
+        self.workers = workers or os.cpu_count() or 1
+
+    def run(
+        self,
+        func: Callable[..., list],
+        items: Sequence,
+        *args,
+        **kwargs,
+    ) -> list:
+        """func(block, *args, **kwargs) をブロックごとに実行し、結果を items の順に返す
+
+        func はブロック内の要素ごとに1つの結果を返すこと。ワーカーで実行するため、
+        func と引数は pickle できる必要がある。
+
+        Args:
+            func (Callable[..., list]): ブロック（items の連続した部分列）を処理する関数
+            items (Sequence): 処理するコミットなどの列（古い順）
+            *args: func に渡す引数
+            **kwargs: func に渡すキーワード引数
+
+        Raises:
+            Exception: いずれかのブロックで発生した最初の例外（他のブロックの完了後に送出する）
+
+        Returns:
+            list: items の各要素に対する結果
+        """
+        blocks = split_blocks(len(items), self.workers)
+        if len(blocks) <= 1:
+            return list(func(list(items), *args, **kwargs)) if items else []
+
+        results: list = [None] * len(items)
+        errors: list[tuple[int, BaseException]] = []
+        # git の読み出しスレッドが動いている最中に fork しないよう spawn で起動する
+        with ProcessPoolExecutor(
+            max_workers=len(blocks), mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            futures = {
+                executor.submit(func, [items[i] for i in block], *args, **kwargs): block
+                for block in blocks
+            }
+            for future in as_completed(futures):
+                block = futures[future]
+                try:
+                    results[block.start : block.stop] = future.result()
+                except Exception as e:
+                    errors.append((block.start, e))
+
+        if errors:
+            raise min(errors, key=lambda error: error[0])[1]
+        return results
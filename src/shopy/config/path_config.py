@@ -13,7 +13,9 @@ class PathConfig:
     REPO_DIR:     Path = ROOT_DIR.parent / "projects" / REPO_NAME
     
     DATA_DIR:                 Path = ROOT_DIR / "data"
+    PARSE_CACHE_DB:           Path = ROOT_DIR / "data" / "parse_cache.sqlite"
     PROJECTS_DATA_DIR:        Path = ROOT_DIR / "data" / REPO_NAME
+    PIPELINE_MANIFEST_JSON:   Path = ROOT_DIR / "data" / REPO_NAME / "pipeline_manifest.json"
     DELETED_FILES_DATA_DIR:   Path = ROOT_DIR / "data" / REPO_NAME / "deleted_files"
     DELETED_FILES:            Path = ROOT_DIR / "data" / REPO_NAME / "deleted_files" / "files"
     DELETED_FILES_INFO_CSV:   Path = ROOT_DIR / "data" / REPO_NAME / "deleted_files" / "deleted_files_info.csv"
@@ -22,22 +24,28 @@ class PathConfig:
     EXISTING_FILES_INFO_CSV:  Path = ROOT_DIR / "data" / REPO_NAME / "existing_files" / "existing_files_info.csv"
     CENTRALITY_DATA_DIR:      Path = ROOT_DIR / "data" / REPO_NAME / "centrality"
     CENTRALITY_CHANGE_DIR:    Path = ROOT_DIR / "data" / REPO_NAME / "centrality_changes"
+    CENTRALITY_REPORT_HTML:   Path = ROOT_DIR / "data" / REPO_NAME / "centrality_changes" / "report.html"
     CENTRALITY_MATRIX_DIR:    Path = ROOT_DIR / "data" / REPO_NAME / "centrality_matrix"
+    CENTRALITY_STORE_DIR:     Path = ROOT_DIR / "data" / REPO_NAME / "centrality_matrix" / "store"
     L1_CHANGE_CSV:            Path = ROOT_DIR / "data" / REPO_NAME / "centrality_matrix" / "timeseries_centrality_score.csv"
     L2_CHANGE_CSV:            Path = ROOT_DIR / "data" / REPO_NAME / "centrality_matrix" / "timeseries_centrality_l2.csv"
     Z_CHANGE_CSV:             Path = ROOT_DIR / "data" / REPO_NAME / "centrality_matrix" / "timeseries_centrality_z.csv"
     LOG_CHANGE_CSV:           Path = ROOT_DIR / "data" / REPO_NAME / "centrality_matrix" / "timeseries_centrality_log.csv"
     MIN_MAX_CHANGE_CSV:       Path = ROOT_DIR / "data" / REPO_NAME / "centrality_matrix" / "timeseries_centrality_min_max.csv"
     STABILITY_DATA_DIR:       Path = ROOT_DIR / "data" / REPO_NAME / "stability"
+    FILE_METRICS_CSV:         Path = ROOT_DIR / "data" / REPO_NAME / "file_metrics.csv"
 
     MONTHLY_COMMITS_CSV:    str = "monthly_commits.csv"
     FILE_DEPENDENCY_JSON:   str = "file_dependency.json"
+    FILE_DEPENDENCY_BIN:    str = "file_dependency"
     CENTRALITY_CSV:         str = "centrality_scores.csv"
     CENTRALITY_CHANGE_CSV:  str = "centrality_timeseries.csv"
 
     EXISTING_FILE_COLUMNS:  str = "Existing File Path"
     DELETED_FILE_COLUMNS:   str = "Deleted File Path"
     IS_DELETED_COLUMNS:     str = "Is Deleted"
+    FILE_PATH_COLUMNS:      str = "File Path"
+    FILE_NAME_COLUMNS:      str = "File Name"
     COMMIT_ID_COLUMNS:      str = "Commit ID"
     COMMIT_DATE_COLUMNS:    str = "Commit Date"
     COMMIT_DATA_KEY:        str = "timestamp"
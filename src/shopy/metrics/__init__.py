@@ -1,2 +1,20 @@
-from .calc import CalcMetrics
-from .store import StoreFiles
+from typing import TYPE_CHECKING
+
+from shopy._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .calc import CalcMetrics
+    from .file_metrics import FileMetrics, FileMetricsEngine, measure_file
+    from .store import StoreFiles
+
+# 公開名と定義しているモジュール（最初に参照されたときに読み込む）
+_EXPORTS = {
+    "CalcMetrics": ".calc",
+    "FileMetrics": ".file_metrics",
+    "FileMetricsEngine": ".file_metrics",
+    "StoreFiles": ".store",
+    "measure_file": ".file_metrics",
+}
+
+__all__ = list(_EXPORTS)
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
@@ -1,20 +1,79 @@
 from pathlib import Path
+from typing import Optional
+
+import pandas as pd
 
 from shopy import path_config
 
+from .file_metrics import FileMetricsEngine, measure_file
+
 
 class CalcMetrics:
 
     def calc_metrics(self, file_path: Path):
-        with open(file_path, 'r') as file:
-            lines: list = file.readlines()
-            lines_len: list = len(lines)
-
-        return lines_len
-    
-    def main(self):
-        deleted_file_path: Path = Path(path_config.DELETED_FILES).glob('*')
-        existing_file_path: Path = Path(path_config.EXISTING_FILES).glob('*')
-        
-        deleted_metrics: list = [self.calc_metrics(file_path) for file_path in deleted_file_path]
-        existing_metrics: list = [self.calc_metrics(file_path) for file_path in existing_file_path]
+        return measure_file(file_path).lines
+
+    def main(self, jobs: Optional[int] = None) -> pd.DataFrame:
+        """保存した削除・既存ファイルのメトリクスを計算し、ファイル情報と結合して保存する
+
+        各ファイルは1回だけ読み、行数・コード行数・空行数・コメント行数・
+        バイト数・字句数を FileMetricsEngine でまとめて計算する。
+        deleted_files_info.csv と existing_files_info.csv の各行に、保存時の
+        ファイル名（パスの "/" を "_" に置き換えたもの）で結合する。
+        プロセスプールの起動は1回で済むよう、両方のディレクトリをまとめて計測する。
+
+        Args:
+            jobs (Optional[int], optional): ワーカープロセス数. Defaults to None（CPU数）.
+
+        Returns:
+            pd.DataFrame: ファイルパス・削除されたか・メトリクスの表
+        """
+        deleted_paths = sorted(Path(path_config.DELETED_FILES).glob("*"))
+        existing_paths = sorted(Path(path_config.EXISTING_FILES).glob("*"))
+        metrics = FileMetricsEngine(jobs=jobs).measure(deleted_paths + existing_paths)
+
+        frames = [
+            self._join_metrics(
+                path_config.DELETED_FILES_INFO_CSV,
+                path_config.DELETED_FILE_COLUMNS,
+                metrics.iloc[: len(deleted_paths)],
+            ),
+            self._join_metrics(
+                path_config.EXISTING_FILES_INFO_CSV,
+                path_config.EXISTING_FILE_COLUMNS,
+                metrics.iloc[len(deleted_paths) :],
+            ),
+        ]
+        df = pd.concat(frames, ignore_index=True)
+
+        path_config.FILE_METRICS_CSV.parent.mkdir(parents=True, exist_ok=True)
+        df.to_csv(path_config.FILE_METRICS_CSV, index=False)
+        return df
+
+    def _join_metrics(
+        self, info_csv: Path, path_column: str, metrics: pd.DataFrame
+    ) -> pd.DataFrame:
+        """ファイル情報の各行に、保存したファイルのメトリクスを結合する
+
+        保存されていないファイル（直前のコミットがないものなど）のメトリクスは欠損値になる。
+
+        Args:
+            info_csv (Path): ファイル情報のCSV
+            path_column (str): info_csv のファイルパスの列名
+            metrics (pd.DataFrame): 保存したファイルのメトリクス（FileMetricsEngine.measure の結果）
+
+        Returns:
+            pd.DataFrame: path_config.FILE_PATH_COLUMNS・IS_DELETED_COLUMNS とメトリクスの列を持つ表
+        """
+        info = pd.read_csv(info_csv)
+
+        info = info.rename(columns={path_column: path_config.FILE_PATH_COLUMNS})
+        info[path_config.FILE_NAME_COLUMNS] = info[
+            path_config.FILE_PATH_COLUMNS
+        ].str.replace("/", "_")
+        df = info.merge(metrics, on=path_config.FILE_NAME_COLUMNS, how="left")
+
+        # 欠損値を含んでも整数のまま扱えるようにする
+        metric_columns = metrics.columns.drop(path_config.FILE_NAME_COLUMNS)
+        df[metric_columns] = df[metric_columns].astype("Int64")
+        return df.drop(columns=path_config.FILE_NAME_COLUMNS)
@@ -0,0 +1,195 @@
+import mmap
+import multiprocessing
+import os
+import re
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator, NamedTuple, Optional
+
+import pandas as pd
+
+from shopy.config import path_config
+
+# これ以上の大きさのファイルは mmap で読む
+MMAP_THRESHOLD = 1 << 20
+
+# 字句の近似: 文字列・文字リテラル、ブロックコメント（行末で閉じていないものを含む）、
+# 行コメントの開始、識別子、数値、それ以外の1文字
+_TOKEN = re.compile(
+    rb'"(?:\\.|[^"\\])*"'
+    rb"|'(?:\\.|[^'\\])*'"
+    rb"|/\*(?:.*?\*/|.*)"
+    rb"|//"
+    rb"|[A-Za-z_$\x80-\xff][\w$\x80-\xff]*"
+    rb"|\d[\w.]*"
+    rb"|\S"
+)
+
+
+class FileMetrics(NamedTuple):
+    """1ファイルのメトリクス
+
+    Attributes:
+        lines (int): 行数
+        loc (int): コード行数（空行・コメントのみの行を除く）
+        blank_lines (int): 空行数
+        comment_lines (int): コメントのみの行数
+        bytes (int): バイト数
+        tokens (int): コード行の字句数（近似）
+    """
+
+    lines: int
+    loc: int
+    blank_lines: int
+    comment_lines: int
+    bytes: int
+    tokens: int
+
+
+def measure_file(path: Path, mmap_threshold: int = MMAP_THRESHOLD) -> FileMetrics:
+    """ファイルを1回だけ読み、すべてのメトリクスを1回の走査で計算する
+
+    コメントは Java などの `//` と `/* */` を対象とする。コードとコメントが
+    混在する行はコード行として数え、字句数にはコメントを含めない。
+
+    Args:
+        path (Path): ファイルのパス
+        mmap_threshold (int, optional): この大きさ以上のファイルは mmap で読む.
+            Defaults to MMAP_THRESHOLD.
+
+    Returns:
+        FileMetrics: メトリクス
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return FileMetrics(0, 0, 0, 0, 0, 0)
+        if size < mmap_threshold:
+            lines = f.read().split(b"\n")
+            # 末尾の改行の後にできる空の要素は行として数えない
+            if not lines[-1]:
+                lines.pop()
+            return _measure_lines(lines, size)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            return _measure_lines(iter(buffer.readline, b""), size)
+
+
+def _measure_lines(lines: Iterable[bytes], size: int) -> FileMetrics:
+    total = loc = blank = comment = tokens = 0
+    in_block = False
+    for line in lines:
+        total += 1
+        stripped = line.strip()
+        if in_block:
+            end = stripped.find(b"*/")
+            if end < 0:
+                comment += 1
+                continue
+            in_block = False
+            stripped = stripped[end + 2 :].strip()
+            if not stripped:
+                comment += 1
+                continue
+        if not stripped:
+            blank += 1
+            continue
+        if stripped.startswith(b"//"):
+            comment += 1
+            continue
+        if stripped.startswith(b"/*"):
+            end = stripped.find(b"*/", 2)
+            if end < 0:
+                in_block = True
+                comment += 1
+                continue
+            rest = stripped[end + 2 :].strip()
+            if not rest or rest.startswith(b"//"):
+                comment += 1
+                continue
+            stripped = rest
+
+        loc += 1
+        for token in _TOKEN.findall(stripped):
+            if token == b"//":
+                break
+            if token.startswith(b"/*"):
+                # 行末で閉じていないブロックコメントは次の行に続く
+                in_block = len(token) < 4 or not token.endswith(b"*/")
+                continue
+            tokens += 1
+
+    return FileMetrics(total, loc, blank, comment, size, tokens)
+
+
+def _measure_chunk(paths: list[Path], mmap_threshold: int) -> list[FileMetrics]:
+    """ワーカープロセスでファイルの塊を計測する"""
+    return [measure_file(path, mmap_threshold) for path in paths]
+
+
+class FileMetricsEngine:
+    """複数プロセスでファイルのメトリクスを計算し、型付きの DataFrame にまとめる
+
+    ファイルを chunk_size 件ずつの塊にしてプロセスプールに渡し、結果は
+    渡した順に返す。同時に処理中の塊は jobs の2倍までに抑える。
+    """
+
+    def __init__(
+        self,
+        jobs: Optional[int] = None,
+        chunk_size: int = 256,
+        mmap_threshold: int = MMAP_THRESHOLD,
+    ):
+        """
+        Args:
+            jobs (Optional[int], optional): ワーカープロセス数. Defaults to None（CPU数）.
+            chunk_size (int, optional): 1回に渡すファイル数. Defaults to 256.
+            mmap_threshold (int, optional): この大きさ以上のファイルは mmap で読む.
+                Defaults to MMAP_THRESHOLD.
+        """
+        self.jobs = jobs or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.mmap_threshold = mmap_threshold
+
+    def measure(self, paths: Iterable[Path]) -> pd.DataFrame:
+        """ファイルごとのメトリクスを計算する
+
+        Args:
+            paths (Iterable[Path]): ファイルのパス
+
+        Returns:
+            pd.DataFrame: ファイル名（path_config.FILE_NAME_COLUMNS）とメトリクスの列（int64）を持つ表（paths の順）
+        """
+        paths = list(paths)
+        metrics = list(self._run(paths))
+        df = pd.DataFrame(metrics, columns=list(FileMetrics._fields), dtype="int64")
+        df.insert(
+            0,
+            path_config.FILE_NAME_COLUMNS,
+            pd.array([path.name for path in paths], dtype="string"),
+        )
+        return df
+
+    def _run(self, paths: list[Path]) -> Iterator[FileMetrics]:
+        chunks = (
+            paths[start : start + self.chunk_size]
+            for start in range(0, len(paths), self.chunk_size)
+        )
+        if self.jobs <= 1:
+            for chunk in chunks:
+                yield from _measure_chunk(chunk, self.mmap_threshold)
+            return
+
+        with ProcessPoolExecutor(
+            max_workers=self.jobs, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            in_flight: deque[Future] = deque()
+            while True:
+                for chunk in islice(chunks, self.jobs * 2 - len(in_flight)):
+                    in_flight.append(
+                        executor.submit(_measure_chunk, chunk, self.mmap_threshold)
+                    )
+                if not in_flight:
+                    return
+                yield from in_flight.popleft().result()
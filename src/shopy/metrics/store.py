@@ -1,10 +1,14 @@
 import os
 import shutil
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
+from typing import Optional
 
 import pandas as pd
+from tqdm import tqdm
 
-from shopy import GitHash, GitReset, path_config
+from shopy import GitHash, GitObjectReader, GitReset, path_config, stream_cmd
 
 
 class StoreFiles:
@@ -58,3 +62,169 @@ class StoreFiles:
                 )
             else:
                 continue
+
+    def save_deleted_files_bulk(self, workers: Optional[int] = None) -> int:
+        """削除されたファイルを削除直前の内容でまとめて保存する
+
+        deleted_files_info.csv に記録された削除コミットの親から
+        `<削除コミット>^:<パス>` を一括で解決し、リポジトリをリセットせずに
+        git のオブジェクトから直接書き出す。
+
+        Args:
+            workers (Optional[int], optional): 書き込みに使うスレッド数. Defaults to None（逐次）.
+
+        Returns:
+            int: 保存したファイル数
+        """
+        df = pd.read_csv(path_config.DELETED_FILES_INFO_CSV)
+        file_paths = df[path_config.DELETED_FILE_COLUMNS].tolist()
+        object_names = [
+            f"{commit_id}^:{file_path}"
+            for commit_id, file_path in zip(
+                df[path_config.COMMIT_ID_COLUMNS], file_paths
+            )
+        ]
+        return self._export_blobs(
+            object_names, file_paths, path_config.DELETED_FILES, workers
+        )
+
+    def save_existing_files_bulk(
+        self, revision: Optional[str] = None, workers: Optional[int] = None
+    ) -> int:
+        """残存ファイルをまとめて保存する
+
+        revision を指定しない場合は save_existing_file と同じく、各ファイルを
+        最後から2番目に変更したコミット（`git log --all --full-history -- <パス>` の
+        2件目）の内容で保存する。このコミットは1回の `git log` で全ファイル分を求める。
+        変更されたコミットが1つしかないファイルは保存しない。
+
+        Args:
+            revision (Optional[str], optional): 指定すると、全ファイルをこのリビジョンの内容で保存する.
+                Defaults to None.
+            workers (Optional[int], optional): 書き込みに使うスレッド数. Defaults to None（逐次）.
+
+        Returns:
+            int: 保存したファイル数
+        """
+        df = pd.read_csv(path_config.EXISTING_FILES_INFO_CSV)
+        file_paths = df[path_config.EXISTING_FILE_COLUMNS].tolist()
+        if revision is not None:
+            object_names = [f"{revision}:{file_path}" for file_path in file_paths]
+        else:
+            previous = self._previous_commits(file_paths)
+            file_paths = [file_path for file_path in file_paths if previous[file_path]]
+            object_names = [
+                f"{previous[file_path]}:{file_path}" for file_path in file_paths
+            ]
+        return self._export_blobs(
+            object_names, file_paths, path_config.EXISTING_FILES, workers
+        )
+
+    def _previous_commits(self, file_paths: list[str]) -> dict[str, Optional[str]]:
+        """各ファイルを最後から2番目に変更したコミットを1回の git log で求める
+
+        ファイルごとに `git log --all --full-history -- <パス>` を実行する代わりに、
+        全コミットの変更ファイルを新しい順に1回だけ読む。マージコミットは
+        いずれかの親との差分に含まれるファイルを変更したものとして扱う。
+
+        Args:
+            file_paths (list[str]): ファイルパス
+
+        Returns:
+            dict[str, Optional[str]]: ファイルパスとコミットハッシュ（2件目がなければ None）
+        """
+        commits: dict[str, list[str]] = {file_path: [] for file_path in file_paths}
+        records = stream_cmd(
+            [
+                "git",
+                "log",
+                "--all",
+                "--full-history",
+                "-m",
+                "--name-only",
+                "--no-renames",
+                "--no-ext-diff",
+                "-z",
+                "--pretty=format:%x01%H",
+            ],
+            cwd=path_config.REPO_DIR,
+            separator="\0",
+        )
+
+        commit_hash = ""
+        for record in records:
+            if record.startswith("\x01"):
+                # "<印><ハッシュ>\n<最初のファイル>"（-m ではマージの親ごとに繰り返す）
+                header, _, record = record.partition("\n")
+                commit_hash = header[1:]
+            found = commits.get(record)
+            # 2件見つかったファイルと、同じマージの別の親との差分は読み飛ばす
+            if found is None or len(found) >= 2 or commit_hash in found:
+                continue
+            found.append(commit_hash)
+        return {
+            file_path: found[1] if len(found) >= 2 else None
+            for file_path, found in commits.items()
+        }
+
+    def _export_blobs(
+        self,
+        object_names: list[str],
+        file_paths: list[str],
+        output_dir: Path,
+        workers: Optional[int],
+    ) -> int:
+        """git のオブジェクトを読み出してファイルに書き出す
+
+        blob でないもの（ディレクトリやサブモジュール）は取得できなかったものとして扱う。
+        workers を指定した場合も、書き込み待ちの内容は workers の2倍までに抑える。
+
+        Args:
+            object_names (list[str]): `<リビジョン>:<パス>` 形式のオブジェクト名
+            file_paths (list[str]): 元のファイルパス（保存名に使う）
+            output_dir (Path): 出力先のディレクトリ
+            workers (Optional[int]): 書き込みに使うスレッド数
+
+        Returns:
+            int: 保存したファイル数
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        reader = GitObjectReader.for_repo(path_config.REPO_DIR)
+
+        def write(file_path: str, content: bytes) -> None:
+            file_name = file_path.replace("/", "_")
+            Path(output_dir / file_name).write_bytes(content)
+
+        saved = 0
+        missing: list[str] = []
+        in_flight: deque[Future] = deque()
+        executor = ThreadPoolExecutor(max_workers=workers) if workers else None
+        try:
+            contents = reader.read_blobs(object_names, strict=False)
+            for file_path, content in tqdm(
+                zip(file_paths, contents),
+                total=len(file_paths),
+                desc=f"{output_dir.parent.name} を保存中",
+                dynamic_ncols=True,
+            ):
+                if content is None:
+                    missing.append(file_path)
+                    continue
+
+                if executor is None:
+                    write(file_path, content)
+                else:
+                    if len(in_flight) >= workers * 2:
+                        # 書き込み中の例外を呼び出し元に伝える
+                        in_flight.popleft().result()
+                    in_flight.append(executor.submit(write, file_path, content))
+                saved += 1
+            while in_flight:
+                in_flight.popleft().result()
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True)
+
+        if missing:
+            print(f"{len(missing)} 件のファイルは取得できませんでした。")
+        return saved
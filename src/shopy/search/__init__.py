@@ -1 +1,14 @@
-from .extractfile import ExtractFilesInfo
+from typing import TYPE_CHECKING
+
+from shopy._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .extractfile import ExtractFilesInfo
+
+# 公開名と定義しているモジュール（最初に参照されたときに読み込む）
+_EXPORTS = {
+    "ExtractFilesInfo": ".extractfile",
+}
+
+__all__ = list(_EXPORTS)
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
@@ -24,8 +24,14 @@ class ExtractFilesInfo:
             DataFrame: 削除されたファイルの情報を含むDataFrame
         """
         # 削除されたファイルの情報を取得
-        lines = sp.run_cmd(
-            cmd="git log --diff-filter=D --name-status --pretty=format:'%H|%aI|%s'",
+        lines = sp.stream_cmd(
+            [
+                "git",
+                "log",
+                "--diff-filter=D",
+                "--name-status",
+                "--pretty=format:%H|%aI|%s",
+            ],
             cwd=cwd,
         )
         deleted_files_info: list = []
@@ -60,7 +66,7 @@ class ExtractFilesInfo:
             DataFrame: 残存ファイルの情報を含むDataFrame
         """
         # 残存ファイルの情報を取得
-        lines = sp.run_cmd("git ls-tree -r --name-only HEAD", cwd=cwd)
+        lines = sp.stream_cmd(["git", "ls-tree", "-r", "--name-only", "HEAD"], cwd=cwd)
         files_info: list = []
         for line in lines:
             if line.endswith(f".{language}"):
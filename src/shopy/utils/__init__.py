@@ -1,3 +1,43 @@
-from .get_name import GetName
-from .json import read_json, write_json
-from .path import get_child_dir, sanitize_filename
+from typing import TYPE_CHECKING
+
+from shopy._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .analyzer_pool import JavaAnalyzerPool
+    from .dependency_store import (
+        DependencyMap,
+        export_dependency_json,
+        read_dependency,
+        write_dependency,
+    )
+    from .get_name import GetName
+    from .java_header import scan_java_header
+    from .java_info import JavaFileInfo, JavaImport
+    from .json import read_json, write_json
+    from .parse_cache import ParseCache
+    from .path import get_child_dir, sanitize_filename
+    from .pipeline import PipelineManifest, PipelineRunner, Stage
+
+# 公開名と定義しているモジュール（最初に参照されたときに読み込む）
+_EXPORTS = {
+    "JavaAnalyzerPool": ".analyzer_pool",
+    "DependencyMap": ".dependency_store",
+    "export_dependency_json": ".dependency_store",
+    "read_dependency": ".dependency_store",
+    "write_dependency": ".dependency_store",
+    "GetName": ".get_name",
+    "scan_java_header": ".java_header",
+    "JavaFileInfo": ".java_info",
+    "JavaImport": ".java_info",
+    "read_json": ".json",
+    "write_json": ".json",
+    "ParseCache": ".parse_cache",
+    "get_child_dir": ".path",
+    "sanitize_filename": ".path",
+    "PipelineManifest": ".pipeline",
+    "PipelineRunner": ".pipeline",
+    "Stage": ".pipeline",
+}
+
+__all__ = list(_EXPORTS)
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
@@ -0,0 +1,134 @@
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from .get_name import GetName
+from .java_info import JavaFileInfo
+
+
+@dataclass
+class WorkerStats:
+    files: int = 0
+    errors: int = 0
+    seconds: float = 0.0
+
+
+# ワーカープロセスごとに使い回す（ファイルごとのエンコーディングを覚えておくため）
+_get_name = GetName()
+
+
+def _analyze_chunk(
+    cwd: Path, chunk: list[tuple[str, bytes]], parser: str, references: bool
+) -> tuple[int, list[JavaFileInfo], float]:
+    """ワーカープロセスでファイルの塊を解析する"""
+    start = time.perf_counter()
+    infos = [
+        _get_name.analyze(
+            cwd, Path(file_path), content=content, parser=parser, references=references
+        )
+        for file_path, content in chunk
+    ]
+    return os.getpid(), infos, time.perf_counter() - start
+
+
+class JavaAnalyzerPool:
+    """複数プロセスで Java ファイルを並列に解析する
+
+    ファイルを chunk_size 件ずつの塊にしてプロセスプールに渡し、結果は
+    渡した順に返す。同時に処理中の塊は max_in_flight 個までに抑えるため、
+    ファイル数が多くてもメモリ使用量は一定に保たれる。
+    """
+
+    def __init__(
+        self,
+        jobs: Optional[int] = None,
+        chunk_size: int = 64,
+        max_in_flight: Optional[int] = None,
+        parser: str = "full",
+        references: bool = False,
+    ):
+        """
+        Args:
+            jobs (Optional[int], optional): ワーカープロセス数. Defaults to None（CPU数）.
+            chunk_size (int, optional): 1回に渡すファイル数. Defaults to 64.
+            max_in_flight (Optional[int], optional): 同時に処理中の塊の上限. Defaults to None（jobs の2倍）.
+            parser (str, optional): 解析方法（GetName.analyze を参照）. Defaults to "full".
+            references (bool, optional): 型名らしい識別子も収集するか（GetName.analyze を参照）. Defaults to False.
+        """
+        self.jobs = jobs or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.max_in_flight = max_in_flight or self.jobs * 2
+        self.parser = parser
+        self.references = references
+        self.worker_stats: dict[int, WorkerStats] = {}
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self) -> "JavaAnalyzerPool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def analyze(
+        self, cwd: Path, files: Iterable[tuple[str, bytes]]
+    ) -> Iterator[JavaFileInfo]:
+        """ファイルを並列に解析し、渡した順に結果を返す
+
+        Args:
+            cwd (Path): プロジェクトのパス
+            files (Iterable[tuple[str, bytes]]): (ファイルパス, ファイル内容) の列
+
+        Yields:
+            JavaFileInfo: 解析結果
+        """
+        if self._executor is None:
+            # git の読み出しスレッドが動いている最中に fork しないよう spawn で起動する
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.jobs,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+
+        files = iter(files)
+        in_flight: deque[Future] = deque()
+        while True:
+            # 上限まで塊を投入する
+            while len(in_flight) < self.max_in_flight:
+                chunk = list(islice(files, self.chunk_size))
+                if not chunk:
+                    break
+                in_flight.append(
+                    self._executor.submit(
+                        _analyze_chunk, cwd, chunk, self.parser, self.references
+                    )
+                )
+
+            if not in_flight:
+                return
+
+            pid, infos, seconds = in_flight.popleft().result()
+            stats = self.worker_stats.setdefault(pid, WorkerStats())
+            stats.files += len(infos)
+            stats.errors += sum(not info.parsed for info in infos)
+            stats.seconds += seconds
+            yield from infos
+
+    def report(self) -> str:
+        """ワーカーごとの解析件数・エラー数・処理時間をまとめる"""
+        lines = [
+            f"worker {pid}: {stats.files} files, {stats.errors} errors, "
+            f"{stats.seconds:.1f}s"
+            for pid, stats in sorted(self.worker_stats.items())
+        ]
+        return "\n".join(lines)
+
+    def close(self) -> None:
+        """プロセスプールを終了する"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
@@ -0,0 +1,203 @@
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Iterator, Optional
+
+import numpy as np
+
+from .json import write_json
+
+# 文字列表（すべてのファイルパスとFQNを重複なく連結したもの）
+_STRINGS = "strings.npy"
+_STRING_OFFSETS = "string_offsets.npy"
+# ファイルごとのパスとFQNの文字列ID（FQNがない場合は -1）
+_FILE_PATHS = "file_paths.npy"
+_FILE_FQNS = "file_fqns.npy"
+# CSR 形式の import 先: ファイル i の import 先は imports[import_offsets[i]:import_offsets[i + 1]]
+_IMPORT_OFFSETS = "import_offsets.npy"
+_IMPORTS = "imports.npy"
+# "ref" を持つ依存関係のみ: 同じ形式の参照している識別子
+_REF_OFFSETS = "ref_offsets.npy"
+_REFS = "refs.npy"
+
+
+def write_dependency(file_dependency: Mapping[str, dict], output_dir: Path) -> None:
+    """依存関係をバイナリ形式でディレクトリに保存する
+
+    ファイルパスとFQNは重複なく1つの文字列表にまとめ、ファイルごとのFQNと
+    import 先はその文字列IDで持つ。各配列は .npy 形式のため、read_dependency で
+    メモリマップとして開ける。
+
+    Args:
+        file_dependency (Mapping[str, dict]): ファイルパスをキー、"fqn"と"imp"（と"ref"）を含む辞書を値とする依存情報
+        output_dir (Path): 出力先のディレクトリ
+    """
+    string_ids: dict[str, int] = {}
+
+    def intern(value: str) -> int:
+        return string_ids.setdefault(value, len(string_ids))
+
+    file_paths: list[int] = []
+    file_fqns: list[int] = []
+    import_offsets = [0]
+    imports: list[int] = []
+    ref_offsets = [0]
+    refs: list[int] = []
+    has_refs = False
+    for file_path, info in file_dependency.items():
+        file_paths.append(intern(file_path))
+        fqn = info.get("fqn")
+        file_fqns.append(-1 if fqn is None else intern(fqn))
+        imports.extend(intern(imp) for imp in info.get("imp", []))
+        import_offsets.append(len(imports))
+        if "ref" in info:
+            has_refs = True
+            refs.extend(intern(ref) for ref in info["ref"])
+        ref_offsets.append(len(refs))
+
+    encoded = [_encode(value) for value in string_ids]
+    string_offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in encoded], out=string_offsets[1:])
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    arrays = {
+        _STRINGS: np.frombuffer(b"".join(encoded), dtype=np.uint8),
+        _STRING_OFFSETS: string_offsets,
+        _FILE_PATHS: np.array(file_paths, dtype=np.int32),
+        _FILE_FQNS: np.array(file_fqns, dtype=np.int32),
+        _IMPORT_OFFSETS: np.array(import_offsets, dtype=np.int64),
+        _IMPORTS: np.array(imports, dtype=np.int32),
+    }
+    if has_refs:
+        arrays[_REF_OFFSETS] = np.array(ref_offsets, dtype=np.int64)
+        arrays[_REFS] = np.array(refs, dtype=np.int32)
+    for name in (_REF_OFFSETS, _REFS):
+        # 上書きするときに前回の "ref" が残らないようにする
+        if name not in arrays:
+            (output_dir / name).unlink(missing_ok=True)
+    for name, array in arrays.items():
+        np.save(output_dir / name, array)
+
+
+def read_dependency(input_dir: Path) -> "DependencyMap":
+    """write_dependency で保存した依存関係を開く
+
+    配列はメモリマップとして開くだけで、内容は参照されたときに読み込まれる。
+
+    Args:
+        input_dir (Path): write_dependency の出力先ディレクトリ
+
+    Returns:
+        DependencyMap: ファイルパスをキーにした依存関係
+    """
+    return DependencyMap(input_dir)
+
+
+def export_dependency_json(input_dir: Path, output_dir: Path) -> None:
+    """バイナリ形式の依存関係を確認用にJSONで書き出す
+
+    Args:
+        input_dir (Path): write_dependency の出力先ディレクトリ
+        output_dir (Path): JSONファイルの出力先
+    """
+    write_json(dict=dict(read_dependency(input_dir)), output_dir=output_dir)
+
+
+class DependencyMap(Mapping):
+    """バイナリ形式の依存関係を read_json の結果と同じ形で参照する
+
+    値は {"fqn": FQN, "imp": [import先, ...]} の辞書（"ref" を保存した場合は
+    "ref": [識別子, ...] も含む）で、参照のたびに作られる。
+    文字列は一度デコードしたものを使い回す。
+    """
+
+    def __init__(self, input_dir: Path):
+        input_dir = Path(input_dir)
+        self.strings = np.load(input_dir / _STRINGS, mmap_mode="r")
+        self.string_offsets = np.load(input_dir / _STRING_OFFSETS, mmap_mode="r")
+        self.file_paths = np.load(input_dir / _FILE_PATHS, mmap_mode="r")
+        self.file_fqns = np.load(input_dir / _FILE_FQNS, mmap_mode="r")
+        self.import_offsets = np.load(input_dir / _IMPORT_OFFSETS, mmap_mode="r")
+        self.imports = np.load(input_dir / _IMPORTS, mmap_mode="r")
+        self.ref_offsets, self.refs = (
+            (
+                np.load(input_dir / _REF_OFFSETS, mmap_mode="r"),
+                np.load(input_dir / _REFS, mmap_mode="r"),
+            )
+            if (input_dir / _REFS).exists()
+            else (None, None)
+        )
+        self._decoded: dict[int, str] = {}
+        self._file_index: Optional[dict[str, int]] = None
+
+    def __len__(self) -> int:
+        return len(self.file_paths)
+
+    def __iter__(self) -> Iterator[str]:
+        for string_id in self.file_paths.tolist():
+            yield self.string(string_id)
+
+    def __getitem__(self, file_path: str) -> dict:
+        if self._file_index is None:
+            self._file_index = {
+                file_path: index for index, file_path in enumerate(self)
+            }
+        return self.file_info(self._file_index[file_path])
+
+    def __contains__(self, file_path: object) -> bool:
+        try:
+            self[file_path]
+        except KeyError:
+            return False
+        return True
+
+    def items(self) -> Iterator[tuple[str, dict]]:
+        # 位置で参照できるため、パスの索引を作らずに順に読む
+        for index, file_path in enumerate(self):
+            yield file_path, self.file_info(index)
+
+    def values(self) -> Iterator[dict]:
+        for index in range(len(self)):
+            yield self.file_info(index)
+
+    def file_info(self, index: int) -> dict:
+        """index 番目のファイルの依存情報を取得する
+
+        Args:
+            index (int): ファイルの位置（保存時の順）
+
+        Returns:
+            dict: "fqn"と"imp"を含む辞書
+        """
+        fqn_id = int(self.file_fqns[index])
+        start, end = self.import_offsets[index : index + 2].tolist()
+        info = {
+            "fqn": None if fqn_id < 0 else self.string(fqn_id),
+            "imp": [
+                self.string(string_id) for string_id in self.imports[start:end].tolist()
+            ],
+        }
+        if self.refs is not None:
+            start, end = self.ref_offsets[index : index + 2].tolist()
+            info["ref"] = [
+                self.string(string_id) for string_id in self.refs[start:end].tolist()
+            ]
+        return info
+
+    def string(self, string_id: int) -> str:
+        """文字列IDに対応する文字列を取得する"""
+        value = self._decoded.get(string_id)
+        if value is None:
+            start, end = self.string_offsets[string_id : string_id + 2].tolist()
+            value = self._decoded[string_id] = _decode(
+                self.strings[start:end].tobytes()
+            )
+        return value
+
+
+def _encode(value: str) -> bytes:
+    return value.encode("utf-8", errors="surrogateescape")
+
+
+def _decode(value: bytes) -> str:
+    return value.decode("utf-8", errors="surrogateescape")
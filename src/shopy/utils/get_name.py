@@ -1,93 +1,231 @@
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Iterator, Optional
 
+import charset_normalizer
 import javalang
-from javalang.parser import JavaSyntaxError
-from javalang.tokenizer import LexerError
+from javalang.parser import JavaSyntaxError, Parser
+from javalang.tokenizer import Identifier, JavaToken, LexerError, Separator, tokenize
+
+from .java_header import scan_java_header
+from .java_info import JavaFileInfo, JavaImport
 
 # 試すエンコーディング一覧
 _COMMON_ENCODINGS = ["utf-8", "shift_jis", "euc_jp", "iso2022_jp"]
 
+# analyze で選択できる解析方法
+PARSERS = ("full", "header")
+
+# パース失敗として扱う例外
+_PARSE_ERRORS = (
+    JavaSyntaxError,
+    LexerError,
+    OSError,
+    AttributeError,
+    StopIteration,
+    ValueError,
+)
+
 
 class GetName:
     def __init__(self):
-        pass
+        # ファイルパスごとに前回デコードできたエンコーディング
+        self._encodings: dict[str, str] = {}
 
-    def _safe_read_java(self, cwd: Path, java_file: Path) -> str:
+    def _safe_read_java(
+        self, cwd: Path, java_file: Path, content: Optional[bytes] = None
+    ) -> str:
         """
-        主要な日本語エンコーディングを順に試し、
-        どれも UnicodeDecodeError なら最終的に errors='replace' で読み込む。
+        ファイルを1回だけ読み込み、主要な日本語エンコーディングを順にメモリ上で試す。
+        どれも UnicodeDecodeError なら charset-normalizer で推定し、
+        それでも判別できなければ errors='replace' で UTF-8 として読み込む。
+        content が渡された場合はファイルを読まずにそのバイト列をデコードする。
+        UTF-8 以外の主要なエンコーディングで読めたパスは、次のスナップショットで
+        そのエンコーディングを最初に試すため、1回のデコードで済む。
+        charset-normalizer の推定結果は UTF-8 のバイト列でもデコードできてしまうため覚えない。
         """
-        for enc in _COMMON_ENCODINGS:
+        if content is None:
+            content = Path(cwd / java_file).read_bytes()
+        key = str(java_file)
+
+        # 前回のエンコーディングの次は、誤って別のエンコーディングと判定されにくい UTF-8 を試す
+        candidates = _COMMON_ENCODINGS
+        if (cached := self._encodings.get(key)) is not None:
+            candidates = [cached, *_COMMON_ENCODINGS]
+
+        for enc in dict.fromkeys(candidates):
             try:
-                return Path(cwd / java_file).read_text(encoding=enc)
+                text = content.decode(enc)
             except UnicodeDecodeError:
                 continue
-        # すべてダメならデフォルト UTF-8 で置換モード
-        return Path(cwd / java_file).read_bytes().decode("utf-8", errors="replace")
+            if enc == "utf-8":
+                self._encodings.pop(key, None)
+            else:
+                self._encodings[key] = enc
+            return text
 
-    def find_fqn(
-        self, cwd: Path, java_file: Path, base_package_prefix: str
-    ) -> Optional[str]:
-        """Javaファイルから完全修飾クラス名を取得する
+        # 最後の手段として内容からエンコーディングを推定する
+        best = charset_normalizer.from_bytes(content).best()
+        if best is not None:
+            self._encodings.pop(key, None)
+            return str(best)
+        # 判別できなければデフォルト UTF-8 で置換モード
+        return content.decode("utf-8", errors="replace")
+
+    def analyze(
+        self,
+        cwd: Path,
+        java_file: Path,
+        content: Optional[bytes] = None,
+        parser: str = "full",
+        references: bool = False,
+    ) -> JavaFileInfo:
+        """Javaファイルを1回だけ読み込み・パースし、必要な情報をまとめて取得する
 
         Args:
             cwd (Path): プロジェクトのパス
             java_file (Path): Javaファイルのパス
-            base_package_prefix (str): パッケージ名の先頭
+            content (Optional[bytes], optional): ファイル内容。指定時はディスクから読まない
+            parser (str, optional): "full" は構文解析、"header" は先頭の宣言のみを字句解析する。
+                "header" で判断できないファイルは構文解析に切り替える. Defaults to "full".
+            references (bool, optional): 本文に現れる型名らしい識別子も収集するか。
+                パースと同じトークン列から集めるため、ファイル全体をトークン化する. Defaults to False.
 
         Returns:
-            Optional[str]: 完全修飾クラス名。見つからない／パース失敗時は None
+            JavaFileInfo: package・型名・import・パース結果
         """
+        if parser not in PARSERS:
+            raise ValueError(f"未対応のパーサーです: {parser}")
+
         try:
             # エンコーディング自動判別付きでファイル読み込み
-            content = self._safe_read_java(cwd, java_file)
-            tree = javalang.parse.parse(content)
-
-            # package 名を取得（なければ空文字列）
-            pkg = tree.package.name if tree.package else ""
-            if not pkg.startswith(base_package_prefix):
-                return None
-
-            # 最初に見つかった型宣言から FQN を生成
-            return next(
-                (
-                    f"{pkg}.{decl.name}" if pkg else decl.name
-                    for decl in tree.types
-                    if getattr(decl, "name", None)
+            text = self._safe_read_java(cwd, java_file, content)
+            tokens = list(tokenize(text)) if references else None
+
+            if parser == "header":
+                info = scan_java_header(str(java_file), text, tokens)
+                if info is not None:
+                    if tokens is not None:
+                        info.references = _collect_references(tokens, info.imports)
+                    return info
+
+            tree = (
+                Parser(tokens).parse()
+                if tokens is not None
+                else javalang.parse.parse(text)
+            )
+
+            imports = [
+                JavaImport(imp.path, bool(imp.static), bool(imp.wildcard))
+                for imp in tree.imports
+            ]
+            return JavaFileInfo(
+                path=str(java_file),
+                package=tree.package.name if tree.package else None,
+                type_names=[
+                    decl.name for decl in tree.types if getattr(decl, "name", None)
+                ],
+                imports=imports,
+                references=(
+                    _collect_references(tokens, imports) if tokens is not None else None
                 ),
-                None,
             )
-        except (
-            JavaSyntaxError,
-            LexerError,
-            OSError,
-            AttributeError,
-            StopIteration,
-            ValueError,
-        ):
-            return None
+        except _PARSE_ERRORS as e:
+            return JavaFileInfo.failed(str(java_file), e)
         except Exception as e:
-            print(f"[ERROR] Unexpected error in find_fqn() for {java_file}: {e}")
-            return None
+            print(f"[ERROR] Unexpected error in analyze() for {java_file}: {e}")
+            return JavaFileInfo.failed(str(java_file), e)
+
+    def check_parser_consistency(
+        self,
+        cwd: Path,
+        files: Iterable[tuple[str, bytes]],
+        base_package_prefix: str,
+    ) -> Iterator[dict[str, object]]:
+        """ "header" と "full" の解析結果を比較し、食い違うファイルを返す
 
-    def extract_imports(self, cwd: Path, java_file: Path) -> list[str]:
+        Args:
+            cwd (Path): プロジェクトのパス
+            files (Iterable[tuple[str, bytes]]): (ファイルパス, ファイル内容) の列
+            base_package_prefix (str): パッケージ名の先頭
+
+        Yields:
+            dict[str, object]: 食い違いのあったファイルと両方の結果
+        """
+        for file_path, content in files:
+            header = self.analyze(cwd, Path(file_path), content, parser="header")
+            full = self.analyze(cwd, Path(file_path), content, parser="full")
+
+            header_fqn = header.fqn(base_package_prefix)
+            full_fqn = full.fqn(base_package_prefix)
+            if header_fqn != full_fqn or header.imports != full.imports:
+                yield {
+                    "file_path": file_path,
+                    "header_fqn": header_fqn,
+                    "full_fqn": full_fqn,
+                    "header_imports": header.import_paths,
+                    "full_imports": full.import_paths,
+                    "full_error": full.error,
+                }
+
+    def find_fqn(
+        self,
+        cwd: Path,
+        java_file: Path,
+        base_package_prefix: str,
+        content: Optional[bytes] = None,
+    ) -> Optional[str]:
+        """Javaファイルから完全修飾クラス名を取得する
+
+        Args:
+            cwd (Path): プロジェクトのパス
+            java_file (Path): Javaファイルのパス
+            base_package_prefix (str): パッケージ名の先頭
+            content (Optional[bytes], optional): ファイル内容。指定時はディスクから読まない
+
+        Returns:
+            Optional[str]: 完全修飾クラス名。見つからない／パース失敗時は None
+        """
+        return self.analyze(cwd, java_file, content).fqn(base_package_prefix)
+
+    def extract_imports(
+        self, cwd: Path, java_file: Path, content: Optional[bytes] = None
+    ) -> list[str]:
         """ファイル内のimport文を抽出する
 
         Args:
             cwd (Path): プロジェクトのパス
             java_file (Path): Javaファイルのパス
+            content (Optional[bytes], optional): ファイル内容。指定時はディスクから読まない
 
         Returns:
             list[str]: import文のリスト
         """
-        try:
-            # エンコーディング自動判別付きでファイル読み込み
-            content = self._safe_read_java(cwd, java_file)
-            tree = javalang.parse.parse(content)
-            return [imp.path for imp in tree.imports]
-        except (JavaSyntaxError, LexerError, OSError, AttributeError, ValueError):
-            return []
-        except Exception as e:
-            print(f"[ERROR] Unexpected error in extract_imports() for {java_file}: {e}")
-            return []
+        return self.analyze(cwd, java_file, content).import_paths
+
+
+def _collect_references(
+    tokens: list[JavaToken], imports: list[JavaImport]
+) -> list[str]:
+    """大文字で始まる識別子を出現順に重複なく集める（型名は大文字で始まる慣習のため）
+
+    同じパッケージのクラスを指さない識別子は除く。
+    - `.` の直後の識別子（`org.other.Helper` や `Outer.Inner` の後ろ側）
+    - 単一型の import（static・ワイルドカードを除く）と同じ単純名
+    """
+    shadowed = {
+        imp.path.rpartition(".")[2]
+        for imp in imports
+        if not imp.static and not imp.wildcard
+    }
+    names: dict[str, None] = {}
+    previous: Optional[JavaToken] = None
+    for token in tokens:
+        if (
+            isinstance(token, Identifier)
+            and token.value[:1].isupper()
+            and token.value not in shadowed
+            and not (isinstance(previous, Separator) and previous.value == ".")
+        ):
+            names[token.value] = None
+        previous = token
+    return list(names)
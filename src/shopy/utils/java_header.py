@@ -0,0 +1,159 @@
+from typing import Iterable, Iterator, Optional
+
+from javalang.tokenizer import (
+    Annotation,
+    Identifier,
+    JavaToken,
+    Keyword,
+    LexerError,
+    Modifier,
+    Operator,
+    Separator,
+    tokenize,
+)
+
+from .java_info import JavaFileInfo, JavaImport
+
+# 型宣言の開始を表すキーワード
+_TYPE_KEYWORDS = {"class", "interface", "enum"}
+
+
+class _AmbiguousHeader(Exception):
+    """ヘッダーだけでは判断できない（完全なパースが必要な）ファイル"""
+
+
+def scan_java_header(
+    path: str, text: str, tokens: Optional[Iterable[JavaToken]] = None
+) -> Optional[JavaFileInfo]:
+    """ファイル先頭の package・import 宣言と最初の型名だけを字句解析で取得する
+
+    最初の型宣言の名前まで読んだ時点でトークン化を打ち切るため、
+    ファイル全体を構文解析するより大幅に速い。
+
+    Args:
+        path (str): ファイルパス
+        text (str): ファイル内容
+        tokens (Optional[Iterable[JavaToken]], optional): トークン化済みの text. Defaults to None.
+
+    Returns:
+        Optional[JavaFileInfo]: 解析結果。ヘッダーだけでは判断できない場合は None
+    """
+    tokens = _TokenStream(iter(tokens) if tokens is not None else tokenize(text))
+    package: Optional[str] = None
+    imports: list[JavaImport] = []
+    try:
+        while (token := tokens.next_or_none()) is not None:
+            if isinstance(token, Annotation):
+                name = tokens.next()
+                if _is_value(name, Keyword, "interface"):
+                    return _found_type(path, package, imports, tokens.next())
+                _skip_annotation(tokens, name)
+            elif _is_value(token, Keyword, "package"):
+                if package is not None or imports:
+                    raise _AmbiguousHeader
+                package, last = _read_name(tokens, tokens.next())
+                _expect(last, Separator, ";")
+            elif _is_value(token, Keyword, "import"):
+                imports.append(_read_import(tokens))
+            elif isinstance(token, Keyword) and token.value in _TYPE_KEYWORDS:
+                return _found_type(path, package, imports, tokens.next())
+            elif _is_value(token, Separator, ";") or isinstance(token, Modifier):
+                continue
+            else:
+                # record や module 宣言、構文エラーなど
+                raise _AmbiguousHeader
+    except (_AmbiguousHeader, LexerError):
+        return None
+
+    # 型宣言のないファイル（package-info.java など）
+    return JavaFileInfo(path, package=package, imports=imports)
+
+
+class _TokenStream:
+    """1トークンだけ押し戻せるトークン列"""
+
+    def __init__(self, tokens: Iterator[JavaToken]):
+        self._tokens = tokens
+        self._pushed: Optional[JavaToken] = None
+
+    def next_or_none(self) -> Optional[JavaToken]:
+        if self._pushed is not None:
+            token, self._pushed = self._pushed, None
+            return token
+        return next(self._tokens, None)
+
+    def next(self) -> JavaToken:
+        token = self.next_or_none()
+        if token is None:
+            raise _AmbiguousHeader
+        return token
+
+    def push(self, token: JavaToken) -> None:
+        self._pushed = token
+
+
+def _is_value(token: JavaToken, token_type: type, value: str) -> bool:
+    return isinstance(token, token_type) and token.value == value
+
+
+def _expect(token: JavaToken, token_type: type, value: str) -> None:
+    if not _is_value(token, token_type, value):
+        raise _AmbiguousHeader
+
+
+def _read_name(tokens: _TokenStream, token: JavaToken) -> tuple[str, JavaToken]:
+    """`a.b.c` 形式の名前を読み、名前と直後のトークンを返す"""
+    if not isinstance(token, Identifier):
+        raise _AmbiguousHeader
+    parts = [token.value]
+    while True:
+        token = tokens.next()
+        if not _is_value(token, Separator, "."):
+            return ".".join(parts), token
+        token = tokens.next()
+        if not isinstance(token, Identifier):
+            # `import a.b.*;` のワイルドカード
+            return ".".join(parts), token
+        parts.append(token.value)
+
+
+def _read_import(tokens: _TokenStream) -> JavaImport:
+    token = tokens.next()
+    static = _is_value(token, Modifier, "static")
+    if static:
+        token = tokens.next()
+
+    path, last = _read_name(tokens, token)
+    wildcard = _is_value(last, Operator, "*")
+    if wildcard:
+        last = tokens.next()
+    _expect(last, Separator, ";")
+    return JavaImport(path, static, wildcard)
+
+
+def _skip_annotation(tokens: _TokenStream, name: JavaToken) -> None:
+    """アノテーションの名前と引数を読み飛ばす"""
+    _, token = _read_name(tokens, name)
+    if not _is_value(token, Separator, "("):
+        # 引数のないアノテーションなので、読み進めたトークンを戻す
+        tokens.push(token)
+        return
+
+    depth = 1
+    while depth:
+        token = tokens.next()
+        if _is_value(token, Separator, "("):
+            depth += 1
+        elif _is_value(token, Separator, ")"):
+            depth -= 1
+
+
+def _found_type(
+    path: str,
+    package: Optional[str],
+    imports: list[JavaImport],
+    name: JavaToken,
+) -> JavaFileInfo:
+    if not isinstance(name, Identifier):
+        raise _AmbiguousHeader
+    return JavaFileInfo(path, package=package, type_names=[name.value], imports=imports)
@@ -0,0 +1,104 @@
+from typing import NamedTuple, Optional
+
+# references の集め方を変えたら上げる（古い解析結果の references は読み込まない）
+REFERENCES_VERSION = 2
+
+
+class JavaImport(NamedTuple):
+    path: str
+    static: bool = False
+    wildcard: bool = False
+
+
+class JavaFileInfo:
+    """1回の読み込み・1回のパースで得られる Java ファイルの情報"""
+
+    __slots__ = (
+        "path",
+        "package",
+        "type_names",
+        "imports",
+        "parsed",
+        "error",
+        "references",
+    )
+
+    def __init__(
+        self,
+        path: str,
+        package: Optional[str] = None,
+        type_names: Optional[list[str]] = None,
+        imports: Optional[list[JavaImport]] = None,
+        parsed: bool = True,
+        error: Optional[str] = None,
+        references: Optional[list[str]] = None,
+    ):
+        self.path = path
+        self.package = package
+        self.type_names = type_names or []
+        self.imports = imports or []
+        self.parsed = parsed
+        self.error = error
+        # 本文に現れる型名らしい識別子（None は収集していないことを表す）
+        self.references = references
+
+    def __repr__(self) -> str:
+        return (
+            f"JavaFileInfo(path={self.path!r}, package={self.package!r}, "
+            f"type_names={self.type_names!r}, imports={len(self.imports)}, "
+            f"parsed={self.parsed!r})"
+        )
+
+    @classmethod
+    def failed(cls, path: str, error: Exception) -> "JavaFileInfo":
+        """パースに失敗したファイルの情報を作成する"""
+        return cls(path, parsed=False, error=f"{type(error).__name__}: {error}")
+
+    def to_dict(self) -> dict:
+        """パス以外の情報を辞書に変換する（内容が同じファイルで共有できる）"""
+        return {
+            "package": self.package,
+            "type_names": self.type_names,
+            "imports": [list(imp) for imp in self.imports],
+            "parsed": self.parsed,
+            "error": self.error,
+            "references": self.references,
+            "references_version": REFERENCES_VERSION,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict, path: str = "") -> "JavaFileInfo":
+        """to_dict で変換した辞書から復元する"""
+        return cls(
+            path,
+            package=data["package"],
+            type_names=data["type_names"],
+            imports=[JavaImport(*imp) for imp in data["imports"]],
+            parsed=data["parsed"],
+            error=data["error"],
+            references=(
+                data.get("references")
+                if data.get("references_version") == REFERENCES_VERSION
+                else None
+            ),
+        )
+
+    @property
+    def import_paths(self) -> list[str]:
+        """import文のパスのリスト"""
+        return [imp.path for imp in self.imports]
+
+    def fqn(self, base_package_prefix: str) -> Optional[str]:
+        """最初に宣言された型の完全修飾クラス名を取得する
+
+        Args:
+            base_package_prefix (str): パッケージ名の先頭
+
+        Returns:
+            Optional[str]: 完全修飾クラス名。対象外のパッケージや型がない場合は None
+        """
+        pkg = self.package or ""
+        if not pkg.startswith(base_package_prefix) or not self.type_names:
+            return None
+        name = self.type_names[0]
+        return f"{pkg}.{name}" if pkg else name
@@ -0,0 +1,136 @@
+import json
+import sqlite3
+from pathlib import Path
+from typing import Iterable
+
+from .java_info import JavaFileInfo
+
+# 1回のクエリで渡すパラメータ数の上限
+_CHUNK_SIZE = 500
+
+
+class ParseCache:
+    """blobハッシュをキーに Java ファイルの解析結果を保存するキャッシュ
+
+    内容が同じファイルは同じblobハッシュを持つため、月次スナップショット間で
+    変更のないファイルは再パースせずに済む。SQLite に保存し、件数が上限を
+    超えたら最後に使われた時刻が古いものから削除する（LRU）。
+    """
+
+    def __init__(
+        self, db_path: Path, max_entries: int = 200_000, variant: str = "full"
+    ):
+        """
+        Args:
+            db_path (Path): SQLite ファイルのパス
+            max_entries (int, optional): 保持する最大件数. Defaults to 200_000.
+            variant (str, optional): 解析方法の識別子。異なる解析方法の結果は共有しない. Defaults to "full".
+        """
+        self.db_path = Path(db_path)
+        self.max_entries = max_entries
+        self.variant = variant
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, timeout=60)
+        # 複数プロセスから同時に読み書きできるようにする
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS parse_cache (
+                blob TEXT NOT NULL,
+                variant TEXT NOT NULL,
+                info TEXT NOT NULL,
+                last_used INTEGER NOT NULL,
+                PRIMARY KEY (blob, variant)
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS parse_cache_last_used "
+            "ON parse_cache (last_used)"
+        )
+        self._conn.commit()
+        (self._clock,) = self._conn.execute(
+            "SELECT COALESCE(MAX(last_used), 0) FROM parse_cache"
+        ).fetchone()
+
+    def __enter__(self) -> "ParseCache":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM parse_cache").fetchone()
+        return count
+
+    def get_many(self, blob_hashes: Iterable[str]) -> dict[str, JavaFileInfo]:
+        """キャッシュ済みの解析結果を取得する
+
+        Args:
+            blob_hashes (Iterable[str]): blobハッシュの列
+
+        Returns:
+            dict[str, JavaFileInfo]: blobハッシュと解析結果（見つかったもののみ）
+        """
+        blob_hashes = list(dict.fromkeys(blob_hashes))
+        found: dict[str, JavaFileInfo] = {}
+        for start in range(0, len(blob_hashes), _CHUNK_SIZE):
+            chunk = blob_hashes[start : start + _CHUNK_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self._conn.execute(
+                f"SELECT blob, info FROM parse_cache "
+                f"WHERE variant = ? AND blob IN ({placeholders})",
+                [self.variant, *chunk],
+            )
+            for blob_hash, info in rows:
+                found[blob_hash] = JavaFileInfo.from_dict(json.loads(info))
+
+        if found:
+            # 使われたエントリの時刻を更新する
+            self._clock += 1
+            self._conn.executemany(
+                "UPDATE parse_cache SET last_used = ? WHERE blob = ? AND variant = ?",
+                [(self._clock, blob_hash, self.variant) for blob_hash in found],
+            )
+            self._conn.commit()
+        return found
+
+    def put_many(self, infos: dict[str, JavaFileInfo]) -> None:
+        """解析結果を保存し、上限を超えた分を古いものから削除する
+
+        Args:
+            infos (dict[str, JavaFileInfo]): blobハッシュと解析結果
+        """
+        if not infos:
+            return
+        self._clock += 1
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO parse_cache (blob, variant, info, last_used) "
+            "VALUES (?, ?, ?, ?)",
+            [
+                (
+                    blob_hash,
+                    self.variant,
+                    json.dumps(info.to_dict(), ensure_ascii=False),
+                    self._clock,
+                )
+                for blob_hash, info in infos.items()
+            ],
+        )
+        self._evict()
+        self._conn.commit()
+
+    def close(self) -> None:
+        """データベースとの接続を閉じる"""
+        self._conn.close()
+
+    def _evict(self) -> None:
+        overflow = len(self) - self.max_entries
+        if overflow <= 0:
+            return
+        self._conn.execute(
+            "DELETE FROM parse_cache WHERE rowid IN ("
+            "SELECT rowid FROM parse_cache ORDER BY last_used LIMIT ?)",
+            (overflow,),
+        )
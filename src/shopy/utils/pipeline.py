@@ -0,0 +1,226 @@
+import hashlib
+import json
+import os
+import time
+import traceback
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+from .json import read_json, write_json
+
+# コミットごとでないステージのキー
+SINGLE_KEY = "-"
+
+
+@dataclass
+class Stage:
+    """パイプラインの1段階
+
+    Attributes:
+        name (str): ステージ名（コマンドラインでの指定に使う）
+        run (Callable[[str], None]): キー（コミットハッシュなど）を受け取って処理する関数
+        outputs (Callable[[str], list[Path]]): キーに対する出力先
+        inputs (Callable[[str], list[Path]]): キーに対する入力ファイル（内容のハッシュを記録する）
+        keys (Optional[Callable[[], list[str]]]): 処理するキーの一覧。None なら1回だけ実行する
+        params (dict): 結果に影響する設定値（変わると再実行する）
+        prepare (Optional[Callable[[list[str]], None]]): 実行が必要なキーをまとめて
+            先に処理する関数（並列化用）。失敗してもキーごとの run で処理し直す
+        finish (Optional[Callable[[], None]]): すべてのキーを処理した後に呼ぶ関数
+            （キーをまたいで使い回したプロセスプールなどを閉じる）
+    """
+
+    name: str
+    run: Callable[[str], None]
+    outputs: Callable[[str], list[Path]]
+    inputs: Callable[[str], list[Path]] = lambda key: []
+    keys: Optional[Callable[[], list[str]]] = None
+    params: dict = field(default_factory=dict)
+    prepare: Optional[Callable[[list[str]], None]] = None
+    finish: Optional[Callable[[], None]] = None
+
+
+class PipelineManifest:
+    """(ステージ, キー) ごとの実行結果を記録する
+
+    入力のハッシュ・出力先・処理時間・状態を JSON に保存する。1件記録するごとに
+    書き込むため、途中で異常終了しても完了済みの記録は残る。
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.entries: dict[str, dict] = (
+            read_json(self.path) if self.path.exists() else {}
+        )
+
+    def get(self, stage: str, key: str) -> Optional[dict]:
+        return self.entries.get(self._entry_key(stage, key))
+
+    def record(self, stage: str, key: str, **entry) -> None:
+        """実行結果を記録して保存する"""
+        self.entries[self._entry_key(stage, key)] = {
+            "stage": stage,
+            "key": key,
+            "finished_at": datetime.now(timezone.utc).isoformat(),
+            **entry,
+        }
+        # 書き込み途中で中断しても壊れないよう、一時ファイルから置き換える
+        temp_path = self.path.with_name(f"{self.path.name}.tmp")
+        write_json(dict=self.entries, output_dir=temp_path)
+        os.replace(temp_path, self.path)
+
+    @staticmethod
+    def _entry_key(stage: str, key: str) -> str:
+        return f"{stage}:{key}"
+
+
+class PipelineRunner:
+    """ステージを順に実行し、完了済みの (ステージ, キー) は飛ばす
+
+    入力のハッシュと設定値が前回と同じで、出力がすべて存在する場合は完了済みとみなす。
+    失敗したキーは記録して次のキーに進み、入力が揃っていないキーは実行しない。
+    再実行すると失敗・未実行のものだけを処理する。
+    """
+
+    def __init__(self, manifest_path: Path, stages: list[Stage], force: bool = False):
+        """
+        Args:
+            manifest_path (Path): 実行結果を記録する JSON ファイル
+            stages (list[Stage]): 実行順のステージ
+            force (bool, optional): 完了済みでも再実行するか. Defaults to False.
+        """
+        self.manifest = PipelineManifest(manifest_path)
+        self.stages = stages
+        self.force = force
+
+    @property
+    def stage_names(self) -> list[str]:
+        return [stage.name for stage in self.stages]
+
+    def run(self, selected: Optional[Iterable[str]] = None) -> dict[str, int]:
+        """ステージを実行する
+
+        Args:
+            selected (Optional[Iterable[str]], optional): 実行するステージ名. Defaults to None（すべて）.
+
+        Raises:
+            ValueError: 存在しないステージ名が指定された場合
+
+        Returns:
+            dict[str, int]: 状態（done, skipped, failed, missing_input）ごとの件数
+        """
+        selected = set(self.stage_names if selected is None else selected)
+        if unknown := selected - set(self.stage_names):
+            raise ValueError(f"存在しないステージです: {sorted(unknown)}")
+
+        summary = {"done": 0, "skipped": 0, "failed": 0, "missing_input": 0}
+        for stage in self.stages:
+            if stage.name not in selected:
+                continue
+            keys = stage.keys() if stage.keys is not None else [SINGLE_KEY]
+            prepared = (
+                self._prepare(stage, keys) if stage.prepare is not None else set()
+            )
+            counts = dict.fromkeys(summary, 0)
+            try:
+                for key in keys:
+                    counts[self._run_one(stage, key, rerun=key in prepared)] += 1
+            finally:
+                if stage.finish is not None:
+                    stage.finish()
+            for status, count in counts.items():
+                summary[status] += count
+            print(f"[{stage.name}] {counts}")
+        return summary
+
+    def _prepare(self, stage: Stage, keys: list[str]) -> set[str]:
+        """実行が必要なキーを stage.prepare でまとめて処理し、そのキーを返す"""
+        pending = []
+        for key in keys:
+            inputs = [Path(path) for path in stage.inputs(key)]
+            if not all(path.exists() for path in inputs):
+                continue
+            outputs = [Path(path) for path in stage.outputs(key)]
+            input_hash = _hash_inputs(inputs, stage.params)
+            if self.force or not self._is_done(stage.name, key, input_hash, outputs):
+                pending.append(key)
+        if not pending:
+            return set()
+        try:
+            stage.prepare(pending)
+        except Exception as e:
+            # 処理できなかったキーは、この後のキーごとの実行でやり直す
+            print(f"[WARNING] {stage.name} の一括処理でエラーが発生しました: {e}")
+            traceback.print_exc()
+        return set(pending)
+
+    def _run_one(self, stage: Stage, key: str, rerun: bool = False) -> str:
+        inputs = [Path(path) for path in stage.inputs(key)]
+        if missing := [path for path in inputs if not path.exists()]:
+            print(f"[{stage.name}] {key}: 入力がありません {missing[0]}")
+            return "missing_input"
+
+        input_hash = _hash_inputs(inputs, stage.params)
+        outputs = [Path(path) for path in stage.outputs(key)]
+        if not (self.force or rerun) and self._is_done(
+            stage.name, key, input_hash, outputs
+        ):
+            return "skipped"
+
+        start = time.perf_counter()
+        try:
+            stage.run(key)
+        except Exception as e:
+            self.manifest.record(
+                stage.name,
+                key,
+                status="failed",
+                input_hash=input_hash,
+                outputs=[str(path) for path in outputs],
+                duration=time.perf_counter() - start,
+                error=f"{type(e).__name__}: {e}",
+            )
+            print(f"[ERROR] {stage.name} {key} でエラーが発生しました: {e}")
+            traceback.print_exc()
+            return "failed"
+
+        self.manifest.record(
+            stage.name,
+            key,
+            status="done",
+            input_hash=input_hash,
+            outputs=[str(path) for path in outputs],
+            duration=time.perf_counter() - start,
+        )
+        return "done"
+
+    def _is_done(
+        self, stage: str, key: str, input_hash: str, outputs: list[Path]
+    ) -> bool:
+        entry = self.manifest.get(stage, key)
+        return (
+            entry is not None
+            and entry["status"] == "done"
+            and entry["input_hash"] == input_hash
+            and all(path.exists() for path in outputs)
+        )
+
+
+def _hash_inputs(inputs: list[Path], params: dict) -> str:
+    """入力ファイルの内容と設定値のハッシュを計算する（ディレクトリは中のファイルすべて）"""
+    digest = hashlib.sha256(json.dumps(params, sort_keys=True, default=str).encode())
+    for path in inputs:
+        files = (
+            sorted(p for p in path.rglob("*") if p.is_file())
+            if path.is_dir()
+            else [path]
+        )
+        for file in files:
+            digest.update(os.fsencode(file.relative_to(path.parent)))
+            digest.update(b"\0")
+            with open(file, "rb") as f:
+                while chunk := f.read(1 << 20):
+                    digest.update(chunk)
+            digest.update(b"\0")
+    return digest.hexdigest()
@@ -1,11 +1,75 @@
+import argparse
 import csv
+import multiprocessing
 import subprocess
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Callable, Optional
 
 from tqdm import tqdm
 
-from shopy import path_config
+from shopy import path_config, stream_cmd
+
+
+# git log の出力でコミットの先頭を示す印
+_COMMIT_MARKER = "\x01"
+
+
+def _map_commit_range(
+    repo_path: Path,
+    start_index: int,
+    commit_hashes: list[str],
+    progress: Optional[Callable[[int], object]] = None,
+) -> dict[str, list[int]]:
+    """連続したコミット列について、Javaファイルごとの変更コミット番号を取得する
+
+    `git log --no-walk=unsorted --stdin` に commit_hashes をこの順で渡し、
+    `--name-only -z` の出力を少しずつ読み込む。`git diff-tree` と同じく、
+    名前の変更は検出せず（変更前と変更後のパスの両方を数える）、
+    親のないコミットとマージコミットの変更ファイルは数えない。
+
+    Args:
+        repo_path (Path): リポジトリのパス
+        start_index (int): commit_hashes[0] のコミット番号
+        commit_hashes (list[str]): コミットハッシュの列
+        progress (Optional[Callable[[int], object]], optional): コミットを1つ読むごとに呼ぶ関数
+
+    Returns:
+        dict[str, list[int]]: ファイルパスと変更コミット番号のリスト
+    """
+    file_commit_map: dict[str, list[int]] = defaultdict(list)
+    records = stream_cmd(
+        [
+            "git",
+            "log",
+            "--no-walk=unsorted",
+            "--stdin",
+            "--name-only",
+            "--no-renames",
+            "--no-ext-diff",
+            "-z",
+            "--pretty=format:%x01%H %P",
+        ],
+        cwd=repo_path,
+        separator="\0",
+        input_lines=commit_hashes,
+    )
+
+    index = start_index - 1
+    counted = False
+    for record in records:
+        if record.startswith(_COMMIT_MARKER):
+            # "<印><ハッシュ> <親...>\n<最初のファイル>"
+            header, _, record = record.partition("\n")
+            index += 1
+            # 親が1つのコミットのみ diff-tree と同じく変更ファイルを数える
+            counted = len(header.split()) == 2
+            if progress is not None:
+                progress(1)
+        if record and counted and record.endswith(".java"):
+            file_commit_map[record].append(index)
+    return dict(file_commit_map)
 
 
 class StabilityCalculator:
@@ -33,19 +97,51 @@ class StabilityCalculator:
         self.commit_hashes = log.splitlines()
         print(f"Total commits: {len(self.commit_hashes)}")
 
-    def map_file_changes(self):
-        for idx, commit_hash in tqdm(
-            enumerate(self.commit_hashes),
-            total=len(self.commit_hashes),
-            desc="Mapping file changes",
-        ):
-            diff = self.run_git_command(
-                ["diff-tree", "--no-commit-id", "--name-only", "-r", commit_hash]
-            )
-            files = diff.splitlines()
-            for file in files:
-                if file.endswith(".java"):
-                    self.file_commit_map[file].append(idx)
+    def map_file_changes(self, jobs: int = 1):
+        """各ファイルが変更されたコミットの番号を記録する
+
+        コミットごとに `git diff-tree` を実行する代わりに、`git log --name-only -z`
+        の1つの出力を逐次読み込む。jobs が2以上の場合はコミット列を連続した
+        区間に分割し、区間ごとに別プロセスで読み込む。
+
+        Args:
+            jobs (int, optional): 並列に読み込むプロセス数. Defaults to 1.
+        """
+        if not self.commit_hashes:
+            return
+
+        n_shards = max(1, min(jobs, len(self.commit_hashes)))
+        shard_size = -(-len(self.commit_hashes) // n_shards)
+        shards = [
+            (start, self.commit_hashes[start : start + shard_size])
+            for start in range(0, len(self.commit_hashes), shard_size)
+        ]
+
+        with tqdm(total=len(self.commit_hashes), desc="Mapping file changes") as bar:
+            if len(shards) == 1:
+                shard_maps = [
+                    _map_commit_range(self.repo_path, 0, self.commit_hashes, bar.update)
+                ]
+            else:
+                with ProcessPoolExecutor(
+                    max_workers=len(shards),
+                    mp_context=multiprocessing.get_context("spawn"),
+                ) as executor:
+                    futures = [
+                        executor.submit(
+                            _map_commit_range, self.repo_path, start, hashes
+                        )
+                        for start, hashes in shards
+                    ]
+                    shard_maps = []
+                    for (_, hashes), future in zip(shards, futures):
+                        shard_maps.append(future.result())
+                        bar.update(len(hashes))
+
+        # 区間はコミット順に並んでいるので、番号は昇順に追加される
+        for shard_map in shard_maps:
+            for file, indexes in shard_map.items():
+                self.file_commit_map[file].extend(indexes)
 
     def calculate_stability_scores(self):
         n_total = len(self.commit_hashes)
@@ -91,16 +187,22 @@ class StabilityCalculator:
                 writer.writerow([file, f"{score:.6f}"])
         print(f"Saved stability scores to {path}")
 
-    def analyze(self):
+    def analyze(self, jobs: int = 1):
         self.extract_commits()
-        self.map_file_changes()
+        self.map_file_changes(jobs=jobs)
         return self.calculate_stability_scores()
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ファイルの安定度を計算する")
+    parser.add_argument(
+        "--jobs", type=int, default=1, help="変更履歴の読み込みに使うプロセス数"
+    )
+    args = parser.parse_args()
+
     repo_path = path_config.REPO_DIR
     calculator = StabilityCalculator(repo_path)
-    scores = calculator.analyze()
+    scores = calculator.analyze(jobs=args.jobs)
     calculator.save_commit_weights(
         Path(path_config.STABILITY_DATA_DIR / "commit_weights.csv")
     )
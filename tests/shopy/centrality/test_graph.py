@@ -0,0 +1,53 @@
+import numpy as np
+
+from shopy.centrality import DependencyGraphBuilder, SymbolTable
+
+
+def _dependency(edges):
+    dependency = {}
+    for fqn, imports in edges.items():
+        dependency[f"{fqn}.java"] = {"fqn": fqn, "imp": imports}
+    return dependency
+
+
+def test_symbol_table_keeps_ids_across_save_and_load(tmp_path):
+    symbols = SymbolTable(["a.A", "a.B"])
+    assert symbols.intern_many(["a.B", "a.C", "a.A"]).tolist() == [1, 2, 0]
+    assert symbols.id_of("a.Z") is None
+
+    symbols.save(tmp_path / "symbols.txt")
+    loaded = SymbolTable.load(tmp_path / "symbols.txt")
+
+    assert len(loaded) == 3
+    assert loaded.names(range(3)) == ["a.A", "a.B", "a.C"]
+    assert loaded.id_of("a.C") == 2
+
+
+def test_graph_builder_shares_symbols_across_snapshots():
+    dependency = _dependency(
+        {
+            "a.A": ["a.B", "a.C", "a.C"],
+            "a.B": ["a.C"],
+            "a.C": ["a.A", "ext.Lib"],
+            "a.D": ["a.D"],
+            "a.E": [],
+        }
+    )
+    builder = DependencyGraphBuilder()
+    first = builder.build(dependency)
+    second = builder.build(_dependency({"a.B": ["a.A", "a.Z"]}))
+
+    assert first.src.dtype == np.int32
+    assert builder.symbols.names(second.nodes) == ["a.B", "a.A", "a.Z"]
+    assert second.nodes[:2].tolist() == [
+        builder.symbols.id_of("a.B"),
+        builder.symbols.id_of("a.A"),
+    ]
+    # ノードは FQN、依存先の順に追加される
+    graph = first.to_networkx()
+    assert list(graph.nodes) == ["a.A", "a.B", "a.C", "ext.Lib", "a.D", "a.E"]
+    assert set(graph.edges) == {
+        (info["fqn"], imp) for info in dependency.values() for imp in info["imp"]
+    }
+    src, dst = first.local_edges()
+    assert src.max() < first.num_nodes and dst.max() < first.num_nodes
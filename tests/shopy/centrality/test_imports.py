@@ -0,0 +1,79 @@
+from shopy.centrality import DependencyGraphBuilder, ImportIndex
+
+DEPENDENCY = {
+    "util/Assert.java": {"fqn": "org.example.util.Assert", "imp": []},
+    "util/Strings.java": {"fqn": "org.example.util.Strings", "imp": ["java.util"]},
+    "core/Outer.java": {
+        "fqn": "org.example.core.Outer",
+        "imp": ["org.example.util", "java.util.List"],
+    },
+    "core/Main.java": {
+        "fqn": "org.example.core.Main",
+        "imp": [
+            "org.example.util.Assert.notNull",
+            "org.example.core.Outer.Inner",
+            "org.example.core",
+            "org.example.missing.Gone",
+        ],
+    },
+}
+
+
+def test_import_index_resolves_wildcard_static_and_nested_imports():
+    index = ImportIndex.from_dependency(DEPENDENCY, package_prefix="org.example")
+
+    assert index.resolve("org.example.util") == (
+        "org.example.util.Assert",
+        "org.example.util.Strings",
+    )
+    assert index.resolve("org.example.util.Assert.notNull") == (
+        "org.example.util.Assert",
+    )
+    assert index.resolve("org.example.core.Outer.Inner") == ("org.example.core.Outer",)
+    assert index.resolve("org.example.missing.Gone") == ("org.example.missing.Gone",)
+    assert index.resolve("java.util.List") == ()
+    assert ImportIndex.from_dependency(DEPENDENCY).resolve("java.util") == (
+        "java.util",
+    )
+
+
+def test_graph_builder_import_modes():
+    raw = DependencyGraphBuilder(imports="raw").build(DEPENDENCY).to_networkx()
+    assert "org.example.util" in raw
+
+    graph = (
+        DependencyGraphBuilder(imports="internal", package_prefix="org.example")
+        .build(DEPENDENCY)
+        .to_networkx()
+    )
+    assert set(graph.successors("org.example.core.Main")) == {
+        "org.example.util.Assert",
+        "org.example.core.Outer",
+        "org.example.missing.Gone",
+    }
+    assert set(graph.successors("org.example.core.Outer")) == {
+        "org.example.util.Assert",
+        "org.example.util.Strings",
+    }
+    assert "java.util" not in graph and "org.example.util" not in graph
+
+
+def test_graph_builder_adds_same_package_references():
+    dependency = {
+        "core/Main.java": {
+            "fqn": "org.example.core.Main",
+            "imp": ["org.other.Helper"],
+            # import した Helper は解析時に "ref" から除かれている
+            "ref": ["Main", "Outer", "String", "Assert"],
+        },
+        "core/Outer.java": {"fqn": "org.example.core.Outer", "imp": [], "ref": []},
+        "core/Helper.java": {"fqn": "org.example.core.Helper", "imp": [], "ref": []},
+        "util/Assert.java": {"fqn": "org.example.util.Assert", "imp": []},
+    }
+
+    graph = DependencyGraphBuilder(same_package=True).build(dependency).to_networkx()
+
+    assert list(graph.successors("org.example.core.Main")) == [
+        "org.other.Helper",
+        "org.example.core.Outer",
+    ]
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from shopy.centrality import CentralityMatrix
+from shopy.config import path_config
+
+
+def _write_scores(input_dir, timestamp, scores):
+    output = input_dir / str(pd.Timestamp(timestamp, tz="UTC"))
+    output.mkdir(parents=True)
+    pd.DataFrame(
+        {
+            path_config.FULL_PACKAGE_COLUMNS: list(scores),
+            path_config.CENTRALITY_COLUMNS: list(scores.values()),
+        }
+    ).to_csv(output / path_config.CENTRALITY_CSV, index=False)
+
+
+@pytest.fixture
+def matrix(tmp_path):
+    _write_scores(tmp_path / "in", "2023-01-01", {"a.A": 0.5, "a.B": 0.3})
+    _write_scores(tmp_path / "in", "2023-02-01", {"a.B": 0.6, "a.C": 0.1})
+    _write_scores(tmp_path / "in", "2023-03-01", {"a.A": 0.2, "a.C": 0.7})
+    return CentralityMatrix.build(tmp_path / "in", tmp_path / "store")
+
+
+def test_history_has_nan_for_missing_months(matrix):
+    history = matrix.history("a.B", metric=path_config.CENTRALITY_COLUMNS)
+
+    assert history.iloc[:, 0].tolist()[:2] == pytest.approx([0.3, 0.6])
+    assert np.isnan(history.iloc[2, 0])
+
+
+def test_top_n_uses_latest_month_at_or_before(matrix):
+    top = matrix.top_n("2023-02-15", n=1)
+
+    assert top.index.tolist() == ["a.B"]
+
+
+def test_window_is_inclusive_and_reopens(matrix, tmp_path):
+    window = CentralityMatrix(tmp_path / "store").window("2023-02-01", "2023-03-01")
+
+    assert window.shape == (3, 2)
+    assert window.loc["a.C"].tolist() == pytest.approx([0.1, 0.7])
+
+
+def test_update_appends_only_new_months(matrix, tmp_path):
+    _write_scores(tmp_path / "in", "2023-04-01", {"a.D": 0.9, "a.A": 0.1})
+    # 取り込み済みの時点の CSV は読み込まれない
+    for csv in (tmp_path / "in").glob("2023-0[123]*/*.csv"):
+        csv.write_text("broken")
+
+    updated = CentralityMatrix.update(tmp_path / "in", tmp_path / "store")
+
+    assert len(updated.timestamps) == 4
+    history = updated.history("a.D").iloc[:, 0]
+    assert np.isnan(history.iloc[:3]).all()
+    assert history.iloc[3] == pytest.approx(0.9)
+    assert updated.history("a.A").iloc[0, 0] == pytest.approx(0.5)
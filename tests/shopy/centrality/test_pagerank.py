@@ -0,0 +1,59 @@
+import networkx as nx
+import pytest
+
+from shopy.centrality import PageRankEngine
+
+
+def _dependency(edges):
+    dependency = {}
+    for fqn, imports in edges.items():
+        dependency[f"{fqn}.java"] = {"fqn": fqn, "imp": imports}
+    return dependency
+
+
+def _networkx_pagerank(dependency):
+    graph = nx.DiGraph()
+    for info in dependency.values():
+        graph.add_node(info["fqn"])
+        for imp in info["imp"]:
+            graph.add_edge(info["fqn"], imp)
+    return nx.pagerank(graph)
+
+
+@pytest.fixture
+def dependency():
+    return _dependency(
+        {
+            "a.A": ["a.B", "a.C", "a.C"],
+            "a.B": ["a.C"],
+            "a.C": ["a.A", "ext.Lib"],
+            "a.D": ["a.D"],
+            "a.E": [],
+        }
+    )
+
+
+def test_rank_matches_networkx(dependency):
+    expected = _networkx_pagerank(dependency)
+
+    actual = PageRankEngine(warm_start=False).rank(dependency)
+
+    assert list(actual) == list(expected)
+    assert actual == pytest.approx(expected, abs=1e-12)
+
+
+def test_warm_start_converges_faster_and_matches(dependency):
+    engine = PageRankEngine()
+    engine.rank(dependency)
+    cold_iterations = engine.last_iterations
+
+    next_month = dict(dependency)
+    next_month["a/F.java"] = {"fqn": "a.F", "imp": ["a.A"]}
+    actual = engine.rank(next_month)
+
+    assert engine.last_iterations < cold_iterations
+    assert actual == pytest.approx(_networkx_pagerank(next_month), abs=1e-4)
+
+
+def test_rank_empty_dependency():
+    assert PageRankEngine().rank({}) == {}
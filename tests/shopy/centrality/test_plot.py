@@ -0,0 +1,32 @@
+import pandas as pd
+
+from shopy.centrality import CentralityPlotRenderer, select_classes
+
+
+def _scores():
+    columns = pd.date_range("2023-01-01", periods=3, freq="MS", tz="UTC")
+    return pd.DataFrame(
+        [[0.01, 0.01, 0.01], [0.01, 0.04, 0.01], [0.02, 0.02, 0.03]],
+        index=["a.Flat", "a.Spike", "a.High"],
+        columns=columns,
+    )
+
+
+def test_select_classes_by_top_k_and_volatility():
+    df = _scores()
+
+    assert select_classes(df, top_k=2) == ["a.Spike", "a.High"]
+    assert select_classes(df, min_volatility=0.01) == ["a.Spike"]
+    assert select_classes(df, top_k=1, min_volatility=0.001) == ["a.Spike"]
+
+
+def test_render_writes_one_png_per_selected_class(tmp_path):
+    rendered = CentralityPlotRenderer(chunk_size=1).render(
+        _scores(), "centrality_score", tmp_path, classes=["a.Flat", "a.High"]
+    )
+
+    assert rendered == 2
+    assert sorted(path.name for path in tmp_path.glob("*.png")) == [
+        "a.Flat.png",
+        "a.High.png",
+    ]
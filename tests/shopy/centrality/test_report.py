@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+
+from shopy.centrality import CentralityMatrix, lttb, write_centrality_report
+from shopy.config import path_config
+
+
+def _write_scores(input_dir, timestamp, scores):
+    output = input_dir / str(pd.Timestamp(timestamp, tz="UTC"))
+    output.mkdir(parents=True)
+    pd.DataFrame(
+        {
+            path_config.FULL_PACKAGE_COLUMNS: list(scores),
+            path_config.CENTRALITY_COLUMNS: list(scores.values()),
+        }
+    ).to_csv(output / path_config.CENTRALITY_CSV, index=False)
+
+
+def test_lttb_keeps_endpoints_and_peaks():
+    x = np.arange(100, dtype=float)
+    y = np.zeros(100)
+    y[37] = 5.0
+
+    kept = lttb(x, y, 10)
+
+    assert len(kept) == 10
+    assert kept[0] == 0 and kept[-1] == 99
+    assert 37 in kept
+
+
+def test_write_centrality_report_embeds_classes(tmp_path):
+    _write_scores(tmp_path / "in", "2023-01-01", {"a.A": 0.5, "a.B": 0.3})
+    _write_scores(tmp_path / "in", "2023-02-01", {"a.B": 0.6, "a.C": 0.1})
+    matrix = CentralityMatrix.build(tmp_path / "in", tmp_path / "store")
+
+    write_centrality_report(matrix, tmp_path / "report.html")
+
+    text = (tmp_path / "report.html").read_text(encoding="utf-8")
+    assert '"classes": ["a.A", "a.B", "a.C"]' in text
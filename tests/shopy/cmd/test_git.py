@@ -0,0 +1,118 @@
+import os
+import subprocess
+from datetime import datetime, timezone
+
+import pytest
+
+from shopy.cmd.git import get_last_commit_date, get_monthly_commits
+
+
+def _git(cwd, *args, env=None):
+    return subprocess.run(
+        ["git", *args],
+        cwd=cwd,
+        check=True,
+        capture_output=True,
+        text=True,
+        env=None if env is None else {**os.environ, **env},
+    ).stdout.strip()
+
+
+def _commit(repo, name, author_date, committer_date=None):
+    (repo / f"{name}.java").write_text(f"class {name} {{}}\n")
+    _git(repo, "add", "-A")
+    _git(
+        repo,
+        "commit",
+        "-qm",
+        name,
+        env={
+            "GIT_AUTHOR_DATE": author_date,
+            "GIT_COMMITTER_DATE": committer_date or author_date,
+        },
+    )
+    return _git(repo, "rev-parse", "HEAD")
+
+
+@pytest.fixture
+def repo(tmp_path):
+    _git(tmp_path, "init", "-q", "-b", "main")
+    _git(tmp_path, "config", "user.email", "test@example.com")
+    _git(tmp_path, "config", "user.name", "test")
+
+    commits = {
+        "old": _commit(tmp_path, "Old", "2022-12-31T12:00:00+00:00"),
+        "jan": _commit(tmp_path, "Jan", "2023-01-05T00:00:00+00:00"),
+        # 作者日時は1月だが、コミット日時で2月に振り分ける
+        "feb": _commit(
+            tmp_path, "Feb", "2023-01-20T00:00:00+00:00", "2023-02-02T00:00:00+00:00"
+        ),
+    }
+    _git(tmp_path, "checkout", "-qb", "topic")
+    # first-parent の履歴に含まれないため、3月の最後のコミットにはならない
+    commits["topic"] = _commit(tmp_path, "Topic", "2023-03-25T00:00:00+00:00")
+    _git(tmp_path, "checkout", "-q", "main")
+    commits["mar"] = _commit(tmp_path, "Mar", "2023-03-15T00:00:00+00:00")
+    # Mar と同じ週（2023-W11）
+    date = "2023-03-17T00:00:00+00:00"
+    _git(
+        tmp_path,
+        "merge",
+        "-q",
+        "--no-ff",
+        "--no-edit",
+        "topic",
+        env={"GIT_AUTHOR_DATE": date, "GIT_COMMITTER_DATE": date},
+    )
+    commits["merge"] = _git(tmp_path, "rev-parse", "HEAD")
+    # UTC では4月1日
+    commits["apr1"] = _commit(tmp_path, "Apr1", "2023-03-31T23:30:00-02:00")
+    commits["apr10"] = _commit(tmp_path, "Apr10", "2023-04-10T00:00:00+00:00")
+    return tmp_path, commits
+
+
+def test_monthly_commits_takes_last_first_parent_commit(repo):
+    path, commits = repo
+    hashes, dates = get_monthly_commits(
+        path, start_date="2023-01-01", end_date="2023-12-31"
+    )
+
+    assert hashes == [commits[k] for k in ["jan", "feb", "merge", "apr10"]]
+    # 日時は作者日時（UTC）を返す
+    assert dates[1] == datetime(2023, 1, 20, tzinfo=timezone.utc)
+    assert dates[3] == datetime(2023, 4, 10, tzinfo=timezone.utc)
+
+
+@pytest.mark.parametrize(
+    "granularity, expected",
+    [
+        ("day", ["jan", "feb", "mar", "merge", "apr1", "apr10"]),
+        ("week", ["jan", "feb", "merge", "apr1", "apr10"]),
+        ("quarter", ["merge", "apr10"]),
+    ],
+)
+def test_monthly_commits_granularity(repo, granularity, expected):
+    path, commits = repo
+    hashes, _ = get_monthly_commits(
+        path, start_date="2023-01-01", end_date="2023-12-31", granularity=granularity
+    )
+    assert hashes == [commits[k] for k in expected]
+
+
+def test_monthly_commits_filters_range_and_rejects_unknown_granularity(repo):
+    path, commits = repo
+    hashes, _ = get_monthly_commits(
+        path, start_date="2023-02-01", end_date="2023-03-31"
+    )
+    assert hashes == [commits["feb"], commits["merge"]]
+
+    with pytest.raises(ValueError):
+        get_monthly_commits(path, granularity="year")
+
+
+def test_last_commit_date_before_year(repo):
+    path, commits = repo
+    assert get_last_commit_date(path, "2023") == (
+        commits["old"],
+        "2022-12-31T12:00:00+00:00",
+    )
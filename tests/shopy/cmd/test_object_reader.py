@@ -0,0 +1,77 @@
+import subprocess
+
+import pytest
+
+from shopy.cmd.object_reader import GitObjectReader
+
+
+def _git(cwd, *args):
+    return subprocess.run(
+        ["git", *args], cwd=cwd, check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+@pytest.fixture
+def repo(tmp_path):
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "config", "user.email", "test@example.com")
+    _git(tmp_path, "config", "user.name", "test")
+    (tmp_path / "src").mkdir()
+    for i in range(300):
+        (tmp_path / "src" / f"F{i}.java").write_text(f"class F{i} {{}}\n" * 50)
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-qm", "init")
+    return tmp_path
+
+
+def test_read_returns_raw_bytes(repo):
+    with GitObjectReader(repo) as reader:
+        assert reader.read("HEAD:src/F1.java", obj_type="blob") == (
+            b"class F1 {}\n" * 50
+        )
+
+
+def test_read_raises_key_error_for_missing_object(repo):
+    with GitObjectReader(repo) as reader:
+        with pytest.raises(KeyError):
+            reader.read("HEAD:no/such/File.java")
+
+
+def test_read_many_keeps_request_order(repo):
+    oids = [f"HEAD:src/F{i}.java" for i in range(300)] * 4
+    with GitObjectReader(repo) as reader:
+        contents = list(reader.read_blobs(oids))
+    assert contents == [(f"class F{i} {{}}\n" * 50).encode() for i in range(300)] * 4
+
+
+def test_read_many_recovers_after_abandoned_iteration(repo):
+    with GitObjectReader(repo) as reader:
+        contents = reader.read_blobs(f"HEAD:src/F{i}.java" for i in range(300))
+        next(contents)
+        contents.close()
+        assert reader.read("HEAD:src/F7.java") == b"class F7 {}\n" * 50
+
+
+def test_read_many_rejects_unexpected_type(repo):
+    with GitObjectReader(repo) as reader:
+        with pytest.raises(ValueError):
+            list(reader.read_blobs(["HEAD"]))
+
+
+def test_info_many_and_read_trees(repo):
+    with GitObjectReader(repo) as reader:
+        commit, missing = reader.info_many(["HEAD", "HEAD:missing"])
+        [entries] = reader.read_trees(["HEAD:src"])
+
+    assert commit.type == "commit"
+    assert missing is None
+    assert len(entries) == 300
+    assert {entry.name for entry in entries} >= {b"F0.java", b"F299.java"}
+    assert entries[0].oid == _git(
+        repo, "rev-parse", f"HEAD:src/{entries[0].name.decode()}"
+    )
+
+
+def test_for_repo_shares_instance(repo):
+    assert GitObjectReader.for_repo(repo) is GitObjectReader.for_repo(repo / ".")
+    GitObjectReader.close_all()
@@ -0,0 +1,43 @@
+import sys
+
+import pytest
+
+from shopy.cmd.shell import CommandFailedError, CommandTimeoutError, stream_cmd
+
+
+def _python(code):
+    return [sys.executable, "-c", code]
+
+
+def test_stream_cmd_yields_records(tmp_path):
+    stream = stream_cmd(_python("print('a|1'); print('b|2')"), cwd=tmp_path)
+
+    assert list(stream) == ["a|1", "b|2"]
+    assert stream.bytes_read == len(b"a|1\nb|2\n")
+
+
+def test_stream_cmd_splits_on_separator_and_passes_input(tmp_path):
+    code = "import sys; sys.stdout.write('\\0'.join(sys.stdin.read().split()))"
+    stream = stream_cmd(
+        _python(code), cwd=tmp_path, separator="\0", input_lines=["x y", "z"]
+    )
+
+    assert list(stream) == ["x", "y", "z"]
+
+
+def test_stream_cmd_raises_on_failure(tmp_path):
+    code = "import sys; print('partial'); sys.stderr.write('boom'); sys.exit(3)"
+
+    with pytest.raises(CommandFailedError) as excinfo:
+        list(stream_cmd(_python(code), cwd=tmp_path))
+    assert excinfo.value.returncode == 3
+    assert excinfo.value.stderr == "boom"
+
+
+def test_stream_cmd_raises_on_timeout(tmp_path):
+    with pytest.raises(CommandTimeoutError):
+        list(
+            stream_cmd(
+                _python("import time; time.sleep(10)"), cwd=tmp_path, timeout=0.2
+            )
+        )
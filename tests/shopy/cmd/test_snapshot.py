@@ -0,0 +1,49 @@
+import subprocess
+
+import pytest
+
+from shopy.cmd.snapshot import FileChange, GitSnapshotReader
+
+
+def _git(cwd, *args):
+    return subprocess.run(
+        ["git", *args], cwd=cwd, check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+@pytest.fixture
+def repo(tmp_path):
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "config", "user.email", "test@example.com")
+    _git(tmp_path, "config", "user.name", "test")
+    (tmp_path / "A.java").write_text("class A { int a; int b; int c; }\n")
+    (tmp_path / "B.java").write_text("class B {}\n")
+    (tmp_path / "notes.txt").write_text("notes\n")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-qm", "first")
+    return tmp_path
+
+
+def test_list_files_returns_java_blobs(repo):
+    files = GitSnapshotReader(repo).list_files("HEAD")
+
+    assert [file_path for file_path, _ in files] == ["A.java", "B.java"]
+    assert files[0][1] == _git(repo, "rev-parse", "HEAD:A.java")
+
+
+def test_diff_files_reports_java_changes(repo):
+    _git(repo, "mv", "A.java", "Renamed.java")
+    _git(repo, "mv", "B.java", "B.txt")
+    (repo / "C.java").write_text("class C {}\n")
+    _git(repo, "add", ".")
+    _git(repo, "commit", "-qm", "second")
+
+    changes = GitSnapshotReader(repo).diff_files("HEAD~1", "HEAD")
+
+    assert sorted(changes) == [
+        FileChange("A", None, "C.java", _git(repo, "rev-parse", "HEAD:C.java")),
+        FileChange(
+            "R", "A.java", "Renamed.java", _git(repo, "rev-parse", "HEAD:Renamed.java")
+        ),
+        FileChange("R", "B.java", None, None),
+    ]
@@ -0,0 +1,30 @@
+import os
+
+import pytest
+
+from shopy.cmd.snapshot_scheduler import SnapshotScheduler, split_blocks
+
+
+def _label_block(block, suffix):
+    if "bad" in block:
+        raise ValueError("bad")
+    return [(item + suffix, block[0], os.getpid()) for item in block]
+
+
+def test_split_blocks_is_contiguous():
+    assert split_blocks(10, 3) == [range(0, 4), range(4, 7), range(7, 10)]
+    assert split_blocks(2, 5) == [range(0, 1), range(1, 2)]
+    assert split_blocks(0, 4) == []
+
+
+def test_scheduler_returns_results_in_order():
+    items = [f"c{i}" for i in range(7)]
+    results = SnapshotScheduler(workers=3).run(_label_block, items, suffix="!")
+
+    assert [label for label, _, _ in results] == [f"{item}!" for item in items]
+    # 各ブロックは連続したコミットで、先頭から順に処理される
+    assert [first for _, first, _ in results] == ["c0"] * 3 + ["c3"] * 2 + ["c5"] * 2
+    assert len({pid for _, _, pid in results}) > 1
+
+    with pytest.raises(ValueError):
+        SnapshotScheduler(workers=2).run(_label_block, ["a", "b", "bad"], suffix="")
@@ -0,0 +1,108 @@
+import dataclasses
+
+import pandas as pd
+
+from shopy.config import path_config
+from shopy.metrics import calc
+from shopy.metrics.file_metrics import FileMetrics, FileMetricsEngine, measure_file
+
+JAVA = b"""package org.example;
+
+/*
+ * header
+ */
+import java.util.List; // list
+
+public class Foo { /* inline */
+    // comment
+    String s = "a // b /* c";
+    /** doc */ int x = 1;
+}
+"""
+
+
+def test_measure_file_counts_lines(tmp_path):
+    path = tmp_path / "Foo.java"
+    path.write_bytes(JAVA)
+
+    metrics = measure_file(path)
+    assert metrics == FileMetrics(
+        lines=12, loc=6, blank_lines=2, comment_lines=4, bytes=len(JAVA), tokens=27
+    )
+    # mmap で読んでも同じ結果になる
+    assert measure_file(path, mmap_threshold=0) == metrics
+
+    # 末尾の改行の有無で行数は変わらない
+    path.write_bytes(JAVA.rstrip(b"\n"))
+    assert measure_file(path).lines == 12
+    assert measure_file(path, mmap_threshold=0).lines == 12
+
+    path.write_bytes(b"")
+    assert measure_file(path) == FileMetrics(0, 0, 0, 0, 0, 0)
+
+
+def test_engine_returns_typed_frame(tmp_path):
+    paths = []
+    for i in range(5):
+        path = tmp_path / f"src_F{i}.java"
+        path.write_bytes(b"class F {}\n" * (i + 1))
+        paths.append(path)
+
+    df = FileMetricsEngine(jobs=2, chunk_size=2).measure(paths)
+    assert df[path_config.FILE_NAME_COLUMNS].tolist() == [p.name for p in paths]
+    assert df["lines"].tolist() == [1, 2, 3, 4, 5]
+    assert df[path_config.FILE_NAME_COLUMNS].dtype == "string"
+    assert (df.dtypes[list(FileMetrics._fields)] == "int64").all()
+
+    assert FileMetricsEngine(jobs=1).measure(paths).equals(df)
+
+
+def test_calc_metrics_joins_file_info(tmp_path, monkeypatch):
+    config = dataclasses.replace(
+        path_config,
+        DELETED_FILES=tmp_path / "deleted",
+        EXISTING_FILES=tmp_path / "existing",
+        DELETED_FILES_INFO_CSV=tmp_path / "deleted.csv",
+        EXISTING_FILES_INFO_CSV=tmp_path / "existing.csv",
+        FILE_METRICS_CSV=tmp_path / "file_metrics.csv",
+    )
+    monkeypatch.setattr(calc, "path_config", config)
+    config.DELETED_FILES.mkdir()
+    config.EXISTING_FILES.mkdir()
+    (config.DELETED_FILES / "src_A.java").write_bytes(b"class A {}\n")
+    (config.EXISTING_FILES / "src_B.java").write_bytes(b"class B {}\n\n")
+    pd.DataFrame(
+        {
+            config.DELETED_FILE_COLUMNS: ["src/A.java", "src/Missing.java"],
+            config.IS_DELETED_COLUMNS: [True, True],
+        }
+    ).to_csv(config.DELETED_FILES_INFO_CSV, index=False)
+    pd.DataFrame(
+        {
+            config.EXISTING_FILE_COLUMNS: ["src/B.java"],
+            config.IS_DELETED_COLUMNS: [False],
+        }
+    ).to_csv(config.EXISTING_FILES_INFO_CSV, index=False)
+
+    measured = []
+    measure = calc.FileMetricsEngine.measure
+
+    def counting_measure(self, paths):
+        measured.append(list(paths))
+        return measure(self, measured[-1])
+
+    monkeypatch.setattr(calc.FileMetricsEngine, "measure", counting_measure)
+
+    df = calc.CalcMetrics().main(jobs=1)
+    # 両方のディレクトリを1回の measure で計測する
+    assert len(measured) == 1 and len(measured[0]) == 2
+    assert df[config.FILE_PATH_COLUMNS].tolist() == [
+        "src/A.java",
+        "src/Missing.java",
+        "src/B.java",
+    ]
+    assert df[config.IS_DELETED_COLUMNS].tolist() == [True, True, False]
+    assert df["lines"].dtype == "Int64"
+    assert df["lines"].tolist() == [1, pd.NA, 2]
+    assert df["blank_lines"].tolist() == [0, pd.NA, 1]
+    assert config.FILE_METRICS_CSV.exists()
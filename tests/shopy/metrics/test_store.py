@@ -0,0 +1,100 @@
+import dataclasses
+import subprocess
+
+import pandas as pd
+import pytest
+
+from shopy.cmd.hash import GitHash
+from shopy.config import path_config
+from shopy.metrics import store
+from shopy.metrics.store import StoreFiles
+
+
+def _git(cwd, *args):
+    return subprocess.run(
+        ["git", *args], cwd=cwd, check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    _git(repo, "init", "-q", "-b", "main")
+    _git(repo, "config", "user.email", "test@example.com")
+    _git(repo, "config", "user.name", "test")
+
+    def commit(message):
+        _git(repo, "add", "-A")
+        _git(repo, "commit", "-qm", message)
+
+    (repo / "pkg").mkdir()
+    (repo / "pkg/A.java").write_text("class A {}\n")
+    (repo / "pkg/B.java").write_text("class B {}\n")
+    (repo / "Gone.java").write_text("class Gone {}\n")
+    commit("first")
+    (repo / "pkg/A.java").write_text("class A { int a; }\n")
+    commit("second")
+    _git(repo, "checkout", "-qb", "topic")
+    (repo / "pkg/C.java").write_text("class C {}\n")
+    commit("topic")
+    _git(repo, "checkout", "-q", "main")
+    (repo / "pkg/A.java").write_text("class A { int a; int b; }\n")
+    commit("third")
+    _git(repo, "merge", "-q", "--no-edit", "topic")
+    (repo / "pkg/C.java").write_text("class C { int c; }\n")
+    _git(repo, "rm", "-q", "Gone.java")
+    commit("delete")
+
+    config = dataclasses.replace(
+        path_config,
+        REPO_DIR=repo,
+        DELETED_FILES=tmp_path / "deleted",
+        EXISTING_FILES=tmp_path / "existing",
+        DELETED_FILES_INFO_CSV=tmp_path / "deleted.csv",
+        EXISTING_FILES_INFO_CSV=tmp_path / "existing.csv",
+    )
+    monkeypatch.setattr(store, "path_config", config)
+    return repo
+
+
+def test_previous_commits_match_git_log_per_file(repo):
+    paths = ["pkg/A.java", "pkg/B.java", "pkg/C.java", "Gone.java", "Missing.java"]
+    previous = StoreFiles()._previous_commits(paths)
+
+    for path in paths:
+        hashes = GitHash.get_commit_hashes(None, file_path=path, cwd=repo)
+        assert previous[path] == (hashes[1] if len(hashes) >= 2 else None)
+    assert previous["pkg/B.java"] is None
+
+
+@pytest.mark.parametrize("workers", [None, 2])
+def test_save_files_bulk(repo, workers):
+    config = store.path_config
+    pd.DataFrame(
+        {
+            config.COMMIT_ID_COLUMNS: [_git(repo, "rev-parse", "HEAD")] * 3,
+            # ディレクトリは blob ではないため、存在しないパスと同じく保存しない
+            config.DELETED_FILE_COLUMNS: ["Gone.java", "Missing.java", "pkg"],
+        }
+    ).to_csv(config.DELETED_FILES_INFO_CSV, index=False)
+    pd.DataFrame(
+        {config.EXISTING_FILE_COLUMNS: ["pkg/A.java", "pkg/B.java", "pkg/C.java"]}
+    ).to_csv(config.EXISTING_FILES_INFO_CSV, index=False)
+
+    files = StoreFiles()
+    assert files.save_deleted_files_bulk(workers=workers) == 1
+    assert sorted(p.name for p in config.DELETED_FILES.iterdir()) == ["Gone.java"]
+
+    # 最後から2番目に変更したコミットの内容（B は1回しか変更されていない）
+    assert files.save_existing_files_bulk(workers=workers) == 2
+    saved = {p.name: p.read_text() for p in config.EXISTING_FILES.iterdir()}
+    assert saved == {
+        "pkg_A.java": "class A { int a; }\n",
+        "pkg_C.java": "class C {}\n",
+    }
+
+    assert files.save_existing_files_bulk(revision="HEAD", workers=workers) == 3
+    assert (config.EXISTING_FILES / "pkg_A.java").read_text() == (
+        "class A { int a; int b; }\n"
+    )
@@ -0,0 +1,52 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import shopy
+
+# import shopy にかけてよい時間（秒）。重い依存を読み込むと 1 秒を超える
+IMPORT_BUDGET = 0.5
+
+# 公開名が参照されるまで読み込まないモジュール
+HEAVY_MODULES = ["pandas", "numpy", "matplotlib", "networkx", "javalang", "tqdm"]
+
+SCRIPT = f"""
+import sys, time
+start = time.perf_counter()
+import shopy
+elapsed = time.perf_counter() - start
+loaded = [name for name in {HEAVY_MODULES!r} if name in sys.modules]
+print(elapsed, ",".join(loaded))
+"""
+
+
+def _run(script: str) -> str:
+    # pytest の pythonpath 設定は子プロセスに引き継がれないため明示する
+    env = {**os.environ, "PYTHONPATH": str(Path(shopy.__file__).parents[1])}
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=env,
+    )
+    return result.stdout.strip()
+
+
+def test_import_shopy_is_fast_and_lazy():
+    elapsed, _, loaded = _run(SCRIPT).partition(" ")
+
+    assert loaded == ""
+    assert float(elapsed) < IMPORT_BUDGET
+
+
+def test_public_names_resolve_on_first_use():
+    output = _run(
+        "import sys, shopy\n"
+        "from shopy import GetName, stream_cmd\n"
+        "print('javalang' in sys.modules, 'pandas' in sys.modules,"
+        " 'GetName' in dir(shopy), shopy.GetName is GetName)"
+    )
+
+    assert output == "True False True True"
@@ -0,0 +1,36 @@
+import ast
+import importlib
+import inspect
+
+import pytest
+
+PACKAGES = [
+    "shopy",
+    "shopy.centrality",
+    "shopy.cmd",
+    "shopy.metrics",
+    "shopy.search",
+    "shopy.utils",
+]
+
+
+def _type_checking_names(module) -> set[str]:
+    """if TYPE_CHECKING: の中で import している名前"""
+    tree = ast.parse(inspect.getsource(module))
+    names = set()
+    for node in tree.body:
+        if isinstance(node, ast.If) and ast.unparse(node.test) == "TYPE_CHECKING":
+            for statement in node.body:
+                names.update(alias.asname or alias.name for alias in statement.names)
+    return names
+
+
+@pytest.mark.parametrize("package", PACKAGES)
+def test_exports_match_type_checking_imports(package):
+    module = importlib.import_module(package)
+
+    assert _type_checking_names(module) == set(module._EXPORTS)
+    assert set(module._EXPORTS) <= set(module.__all__)
+    assert set(module.__all__) <= set(dir(module))
+    for name in module.__all__:
+        assert getattr(module, name) is not None
@@ -0,0 +1,34 @@
+from pathlib import Path
+
+from shopy.utils.analyzer_pool import JavaAnalyzerPool
+
+
+def _files(count):
+    files = []
+    for i in range(count):
+        if i % 3 == 2:
+            # 構文エラー
+            files.append((f"Broken{i}.java", b"package p;\nclass {"))
+        else:
+            files.append((f"C{i}.java", f"package p;\nclass C{i} {{}}\n".encode()))
+    return files
+
+
+def test_pool_returns_results_in_submission_order():
+    files = _files(10)
+    with JavaAnalyzerPool(jobs=2, chunk_size=1, max_in_flight=3) as pool:
+        infos = list(pool.analyze(Path("."), files))
+        # 同じプールで2回目の解析もできる
+        again = list(pool.analyze(Path("."), files[:2]))
+
+    assert [info.path for info in infos] == [path for path, _ in files]
+    assert [info.parsed for info in infos] == [i % 3 != 2 for i in range(10)]
+    assert infos[0].type_names == ["C0"]
+    assert [info.path for info in again] == ["C0.java", "C1.java"]
+
+    stats = pool.worker_stats.values()
+    assert 1 <= len(stats) <= 2
+    assert sum(stat.files for stat in stats) == 12
+    assert sum(stat.errors for stat in stats) == 3
+    assert all(stat.seconds >= 0 for stat in stats)
+    assert pool.report().count("worker") == len(stats)
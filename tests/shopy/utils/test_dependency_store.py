@@ -0,0 +1,54 @@
+import numpy as np
+
+from shopy.utils.dependency_store import (
+    export_dependency_json,
+    read_dependency,
+    write_dependency,
+)
+from shopy.utils.json import read_json
+
+
+def test_dependency_round_trip(tmp_path):
+    # Arrange
+    dependency = {
+        "src/a/A.java": {"fqn": "a.A", "imp": ["a.B", "x.Y"]},
+        "src/a/B.java": {"fqn": "a.B", "imp": ["a.A"]},
+        "src/a/package-info.java": {"fqn": None, "imp": []},
+    }
+
+    # Act
+    write_dependency(dependency, tmp_path / "dep")
+    result = read_dependency(tmp_path / "dep")
+
+    # Assert
+    assert dict(result) == dependency
+    assert list(result) == list(dependency)
+    assert result["src/a/B.java"] == {"fqn": "a.B", "imp": ["a.A"]}
+    assert "src/a/C.java" not in result
+    # FQN は1回だけ保存される
+    assert len(result.string_offsets) - 1 == 6
+    assert isinstance(result.imports, np.memmap)
+
+
+def test_dependency_round_trip_with_references(tmp_path):
+    dependency = {
+        "A.java": {"fqn": "a.A", "imp": [], "ref": ["B", "List"]},
+        "B.java": {"fqn": "a.B", "imp": ["a.A"], "ref": []},
+    }
+    write_dependency(dependency, tmp_path / "dep")
+    assert dict(read_dependency(tmp_path / "dep")) == dependency
+
+    # "ref" のない依存関係で上書きすると "ref" は残らない
+    write_dependency({"A.java": {"fqn": "a.A", "imp": []}}, tmp_path / "dep")
+    assert dict(read_dependency(tmp_path / "dep")) == {
+        "A.java": {"fqn": "a.A", "imp": []}
+    }
+
+
+def test_export_dependency_json(tmp_path):
+    dependency = {"A.java": {"fqn": "A", "imp": []}}
+    write_dependency(dependency, tmp_path / "dep")
+
+    export_dependency_json(tmp_path / "dep", tmp_path / "dep.json")
+
+    assert read_json(tmp_path / "dep.json") == dependency
@@ -0,0 +1,123 @@
+from pathlib import Path
+
+from shopy.utils.get_name import GetName, JavaImport
+
+SOURCE = """package org.springframework.util;
+
+import java.util.List;
+import java.util.*;
+import static org.springframework.util.Assert.notNull;
+
+public class StringUtils {
+    class Inner {}
+}
+
+interface Helper {}
+"""
+
+
+def test_analyze_collects_header_in_one_pass():
+    info = GetName().analyze(Path("."), Path("StringUtils.java"), SOURCE.encode())
+
+    assert info.parsed
+    assert info.package == "org.springframework.util"
+    assert info.type_names == ["StringUtils", "Helper"]
+    assert info.imports == [
+        JavaImport("java.util.List"),
+        JavaImport("java.util", wildcard=True),
+        JavaImport("org.springframework.util.Assert.notNull", static=True),
+    ]
+    assert info.fqn("org.springframework") == "org.springframework.util.StringUtils"
+    assert info.fqn("com.example") is None
+
+
+def test_analyze_reads_from_disk_with_legacy_encoding(tmp_path):
+    source = "package a;\n// 日本語のコメント\nclass A {}\n"
+    (tmp_path / "A.java").write_bytes(source.encode("shift_jis"))
+
+    info = GetName().analyze(tmp_path, Path("A.java"))
+
+    assert info.fqn("") == "a.A"
+
+
+def test_analyze_reports_parse_error():
+    info = GetName().analyze(Path("."), Path("Broken.java"), b"class {")
+
+    assert not info.parsed
+    assert info.error.startswith("JavaSyntaxError")
+    assert info.fqn("") is None
+    assert info.import_paths == []
+
+
+def test_safe_read_java_remembers_detected_encoding(tmp_path):
+    get_name = GetName()
+    source = "package a;\n// 日本語のコメント\nclass A {}\n"
+    (tmp_path / "A.java").write_bytes(source.encode("euc_jp"))
+
+    assert get_name._safe_read_java(tmp_path, Path("A.java")) == source
+    assert get_name._encodings["A.java"] == "euc_jp"
+
+    # 次のスナップショットでは前回のエンコーディングだけでデコードする
+    decoded = []
+
+    class RecordingBytes(bytes):
+        def decode(self, encoding="utf-8", errors="strict"):
+            decoded.append(encoding)
+            return super().decode(encoding, errors)
+
+    content = RecordingBytes(source.encode("euc_jp"))
+    assert get_name._safe_read_java(tmp_path, Path("A.java"), content) == source
+    assert decoded == ["euc_jp"]
+
+    # UTF-8 に変わったファイルは UTF-8 として読み、以降は UTF-8 から試す
+    assert get_name._safe_read_java(tmp_path, Path("A.java"), source.encode()) == source
+    assert "A.java" not in get_name._encodings
+    latin = "package a;\n// café à la crème\nclass B {}\n"
+    text = get_name._safe_read_java(tmp_path, Path("B.java"), latin.encode("cp1252"))
+    assert "class B" in text
+
+
+def test_safe_read_java_reads_utf8_after_a_guessed_encoding(tmp_path):
+    get_name = GetName()
+    latin = "package a;\n// café crème\nclass A {}\n"
+
+    text = get_name._safe_read_java(tmp_path, Path("A.java"), latin.encode("cp1252"))
+    assert "class A" in text
+
+    # 推定したエンコーディングを UTF-8 より先に試さない
+    assert get_name._safe_read_java(tmp_path, Path("A.java"), latin.encode()) == latin
+
+
+def test_analyze_collects_references_from_the_same_tokens():
+    source = b"""package a;
+import b.Imported;
+import b.*;
+import static b.Util.Wild;
+import static b.Constants.*;
+class A extends Base {
+    Helper h = new Helper();
+    org.other.Qualified q;
+    Outer.Inner inner;
+    Imported i; Wild w; Constants c; Util u;
+    int count;
+}
+"""
+
+    full = GetName().analyze(Path("."), Path("A.java"), source, references=True)
+    header = GetName().analyze(
+        Path("."), Path("A.java"), source, parser="header", references=True
+    )
+
+    # 修飾された名前の後ろ側と、単一型の import と同じ名前は除く
+    assert full.references == [
+        "A",
+        "Base",
+        "Helper",
+        "Outer",
+        "Wild",
+        "Constants",
+        "Util",
+    ]
+    assert header.references == full.references
+    assert header.fqn("") == "a.A"
+    assert GetName().analyze(Path("."), Path("A.java"), source).references is None
@@ -0,0 +1,74 @@
+from pathlib import Path
+
+import pytest
+
+from shopy.utils.get_name import GetName
+from shopy.utils.java_header import scan_java_header
+from shopy.utils.java_info import JavaImport
+
+SOURCE = """/*
+ * Licensed under the Apache License
+ */
+package org.springframework.util;
+
+import java.util.*;
+import static org.springframework.util.Assert.notNull;
+
+/** Utility methods. */
+@SuppressWarnings({"unchecked", "rawtypes"})
+@Deprecated
+public abstract class StringUtils<T extends Comparable<T>> {
+    private static final String X = "import fake.Import;";
+}
+"""
+
+
+def test_scan_java_header_stops_at_first_type_name():
+    info = scan_java_header("StringUtils.java", SOURCE)
+
+    assert info.package == "org.springframework.util"
+    assert info.type_names == ["StringUtils"]
+    assert info.imports == [
+        JavaImport("java.util", wildcard=True),
+        JavaImport("org.springframework.util.Assert.notNull", static=True),
+    ]
+
+
+@pytest.mark.parametrize(
+    "source, type_names",
+    [
+        ("package a;\npublic @interface Marker {}", ["Marker"]),
+        ("@NonNullApi\npackage a;\n", []),
+        ("package a;\n;\nenum E { A }", ["E"]),
+    ],
+)
+def test_scan_java_header_handles_declaration_forms(source, type_names):
+    info = scan_java_header("X.java", source)
+
+    assert info.package == "a"
+    assert info.type_names == type_names
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "package a;\nrecord R(int x) {}",
+        "module a.b { requires c; }",
+        "package a\nclass A {}",
+        "package a; class 'unterminated",
+    ],
+)
+def test_scan_java_header_gives_up_on_ambiguous_headers(source):
+    assert scan_java_header("X.java", source) is None
+
+
+def test_header_parser_agrees_with_full_parser():
+    get_name = GetName()
+    files = [
+        ("StringUtils.java", SOURCE.encode()),
+        ("R.java", b"package a;\nrecord R(int x) {}"),
+    ]
+
+    assert list(get_name.check_parser_consistency(Path("."), files, "")) == []
+    header = get_name.analyze(Path("."), Path("S.java"), SOURCE.encode(), "header")
+    assert header.fqn("org.springframework") == "org.springframework.util.StringUtils"
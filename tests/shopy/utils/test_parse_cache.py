@@ -0,0 +1,52 @@
+from shopy.utils.get_name import JavaFileInfo, JavaImport
+from shopy.utils.parse_cache import ParseCache
+
+
+def _info(name):
+    return JavaFileInfo(
+        "ignored.java",
+        package="org.example",
+        type_names=[name],
+        imports=[JavaImport("java.util", wildcard=True)],
+    )
+
+
+def test_get_many_returns_stored_infos(tmp_path):
+    with ParseCache(tmp_path / "cache.sqlite") as cache:
+        cache.put_many({"a" * 40: _info("A")})
+        found = cache.get_many(["a" * 40, "b" * 40])
+
+    assert list(found) == ["a" * 40]
+    assert found["a" * 40].fqn("org") == "org.example.A"
+    assert found["a" * 40].imports == [JavaImport("java.util", wildcard=True)]
+
+
+def test_entries_persist_and_are_separated_by_variant(tmp_path):
+    with ParseCache(tmp_path / "cache.sqlite") as cache:
+        cache.put_many({"a" * 40: _info("A")})
+
+    with ParseCache(tmp_path / "cache.sqlite", variant="header") as cache:
+        assert cache.get_many(["a" * 40]) == {}
+    with ParseCache(tmp_path / "cache.sqlite") as cache:
+        assert "a" * 40 in cache.get_many(["a" * 40])
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    with ParseCache(tmp_path / "cache.sqlite", max_entries=2) as cache:
+        cache.put_many({"a": _info("A"), "b": _info("B")})
+        cache.get_many(["a"])
+        cache.put_many({"c": _info("C")})
+
+        assert len(cache) == 2
+        assert set(cache.get_many(["a", "b", "c"])) == {"a", "c"}
+
+
+def test_references_from_an_older_version_are_dropped():
+    info = _info("A")
+    info.references = ["Helper"]
+    data = info.to_dict()
+    assert JavaFileInfo.from_dict(data).references == ["Helper"]
+
+    # 集め方が変わる前に保存された references は解析し直させる
+    del data["references_version"]
+    assert JavaFileInfo.from_dict(data).references is None
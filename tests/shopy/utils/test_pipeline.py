@@ -0,0 +1,81 @@
+import pytest
+
+from shopy.utils.pipeline import PipelineRunner, Stage
+
+
+def _stages(tmp_path, calls, fail=()):
+    source = tmp_path / "source.txt"
+
+    def run_copy(key):
+        calls.append(("copy", key))
+        if key in fail:
+            raise RuntimeError(key)
+        (tmp_path / f"{key}.txt").write_text(source.read_text() + key)
+
+    def run_join(key):
+        calls.append(("join", key))
+        (tmp_path / "joined.txt").write_text(
+            "".join((tmp_path / f"{k}.txt").read_text() for k in ["a", "b"])
+        )
+
+    return [
+        Stage(
+            name="copy",
+            run=run_copy,
+            outputs=lambda key: [tmp_path / f"{key}.txt"],
+            inputs=lambda key: [source],
+            keys=lambda: ["a", "b"],
+            finish=lambda: calls.append(("copy", "finish")),
+        ),
+        Stage(
+            name="join",
+            run=run_join,
+            outputs=lambda key: [tmp_path / "joined.txt"],
+            inputs=lambda key: [tmp_path / "a.txt", tmp_path / "b.txt"],
+        ),
+    ]
+
+
+def test_pipeline_skips_completed_and_reruns_on_change(tmp_path):
+    (tmp_path / "source.txt").write_text("x")
+    manifest = tmp_path / "manifest.json"
+    calls = []
+
+    summary = PipelineRunner(manifest, _stages(tmp_path, calls)).run()
+    assert summary["done"] == 3
+    assert (tmp_path / "joined.txt").read_text() == "xaxb"
+    assert calls[2] == ("copy", "finish")
+
+    calls.clear()
+    summary = PipelineRunner(manifest, _stages(tmp_path, calls)).run()
+    assert calls == [("copy", "finish")]
+    assert summary["skipped"] == 3
+
+    # 入力が変わったものだけ再実行する
+    (tmp_path / "source.txt").write_text("y")
+    calls.clear()
+    PipelineRunner(manifest, _stages(tmp_path, calls)).run(["copy"])
+    assert calls == [("copy", "a"), ("copy", "b"), ("copy", "finish")]
+
+    calls.clear()
+    PipelineRunner(manifest, _stages(tmp_path, calls), force=True).run(["join"])
+    assert calls == [("join", "-")]
+
+
+def test_pipeline_resumes_after_failure(tmp_path):
+    (tmp_path / "source.txt").write_text("x")
+    manifest = tmp_path / "manifest.json"
+    calls = []
+
+    summary = PipelineRunner(manifest, _stages(tmp_path, calls, fail={"b"})).run()
+    assert summary == {"done": 1, "skipped": 0, "failed": 1, "missing_input": 1}
+    runner = PipelineRunner(manifest, [])
+    assert runner.manifest.get("copy", "b")["status"] == "failed"
+
+    calls.clear()
+    summary = PipelineRunner(manifest, _stages(tmp_path, calls)).run()
+    assert calls == [("copy", "b"), ("copy", "finish"), ("join", "-")]
+    assert summary["skipped"] == 1
+
+    with pytest.raises(ValueError):
+        PipelineRunner(manifest, _stages(tmp_path, calls)).run(["unknown"])
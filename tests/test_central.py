@@ -0,0 +1,117 @@
+import subprocess
+
+import pandas as pd
+import pytest
+
+import central
+from shopy.config import path_config
+from shopy.utils import read_json
+
+
+def _git(cwd, *args):
+    return subprocess.run(
+        ["git", *args], cwd=cwd, check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+@pytest.fixture
+def repo(tmp_path):
+    repo = tmp_path / "repo"
+    base = repo / "src/org/springframework/core"
+    base.mkdir(parents=True)
+    _git(repo, "init", "-q")
+    _git(repo, "config", "user.email", "test@example.com")
+    _git(repo, "config", "user.name", "test")
+
+    for i in range(6):
+        (base / f"C{i}.java").write_text(
+            "package org.springframework.core;\n"
+            f"import org.springframework.core.C{(i + 1) % 6};\n"
+            f"class C{i} {{}}\n"
+        )
+    (base / "Broken.java").write_text("package org.springframework.core;\nclass {")
+    _git(repo, "add", "-A")
+    _git(repo, "commit", "-qm", "first")
+    (base / "C6.java").write_text(
+        "package org.springframework.core;\nimport java.util.List;\nclass C6 {}\n"
+    )
+    _git(repo, "add", "-A")
+    _git(repo, "commit", "-qm", "second")
+    return repo
+
+
+def test_dependency_series_with_jobs_matches_sequential(repo, tmp_path, monkeypatch):
+    commits = _git(repo, "rev-list", "--reverse", "HEAD").split()
+    created = []
+
+    class CountingPool(central.JavaAnalyzerPool):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            created.append(self)
+
+    monkeypatch.setattr(central, "JavaAnalyzerPool", CountingPool)
+
+    results = {}
+    for jobs in (1, 2):
+        output_dirs = [tmp_path / f"jobs{jobs}" / f"{c}.json" for c in commits]
+        central.CalcCentrality().build_dependency_series(
+            commits, output_dirs, input_dir=repo, jobs=jobs
+        )
+        results[jobs] = [read_json(output_dir) for output_dir in output_dirs]
+
+    assert results[2] == results[1]
+    assert results[2][1]["src/org/springframework/core/C6.java"]["imp"] == [
+        "java.util.List"
+    ]
+    # 系列全体で1つのプールを使い、パースに失敗したファイルも数える
+    assert len(created) == 1
+    stats = created[0].worker_stats.values()
+    assert sum(stat.files for stat in stats) == 8
+    assert sum(stat.errors for stat in stats) == 1
+    assert created[0]._executor is None
+
+
+def test_plot_reads_the_centrality_store(tmp_path):
+    for timestamp, scores in [
+        ("2023-01-01", {"a.A": 0.01, "a.B": 0.03}),
+        ("2023-02-01", {"a.A": 0.02, "a.C": 0.04}),
+    ]:
+        output = tmp_path / "in" / str(pd.Timestamp(timestamp, tz="UTC"))
+        output.mkdir(parents=True)
+        pd.DataFrame(
+            {
+                path_config.FULL_PACKAGE_COLUMNS: list(scores),
+                path_config.CENTRALITY_COLUMNS: list(scores.values()),
+            }
+        ).to_csv(output / path_config.CENTRALITY_CSV, index=False)
+
+    calc = central.CalcCentrality()
+    calc.write_centrality_matrix(tmp_path / "in", tmp_path / "store")
+    calc.plot_all_centralities_per_class(
+        store_dir=tmp_path / "store", output_base_dir=tmp_path / "plots", top_k=2
+    )
+
+    plots = tmp_path / "plots" / path_config.CENTRALITY_COLUMNS
+    assert sorted(path.name for path in plots.glob("*.png")) == ["a.B.png", "a.C.png"]
+
+
+@pytest.mark.parametrize("export_csv", [False, True])
+def test_timeseries_stage_exports_csv_only_on_request(export_csv, monkeypatch):
+    calls = []
+    calc = central.CalcCentrality()
+    monkeypatch.setattr(
+        calc, "write_centrality_matrix", lambda **_: calls.append("store")
+    )
+    monkeypatch.setattr(
+        calc, "load_centrality_timeseries", lambda **_: calls.append("csv")
+    )
+
+    stages = {
+        stage.name: stage for stage in calc.pipeline_stages(export_csv=export_csv)
+    }
+    stages["timeseries"].run("timeseries")
+
+    assert calls == (["store", "csv"] if export_csv else ["store"])
+    outputs = stages["timeseries"].outputs("timeseries")
+    assert outputs[0] == path_config.CENTRALITY_STORE_DIR
+    assert len(outputs) == (2 if export_csv else 1)
@@ -0,0 +1,89 @@
+import subprocess
+
+import pytest
+
+from stability import StabilityCalculator, _map_commit_range
+
+
+def _git(cwd, *args):
+    return subprocess.run(
+        ["git", *args], cwd=cwd, check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+@pytest.fixture
+def repo(tmp_path):
+    _git(tmp_path, "init", "-q", "-b", "main")
+    _git(tmp_path, "config", "user.email", "test@example.com")
+    _git(tmp_path, "config", "user.name", "test")
+    # diff.renames の設定があっても名前の変更を検出しないことを確かめる
+    _git(tmp_path, "config", "diff.renames", "true")
+
+    def commit(message):
+        _git(tmp_path, "add", "-A")
+        _git(tmp_path, "commit", "-qm", message)
+
+    (tmp_path / "A.java").write_text("class A {}\n")
+    (tmp_path / "B.java").write_text("class B { int a; int b; int c; }\n")
+    commit("root")
+    (tmp_path / "A.java").write_text("class A { int a; }\n")
+    (tmp_path / "notes.txt").write_text("notes\n")
+    commit("modify")
+    _git(tmp_path, "checkout", "-qb", "topic")
+    (tmp_path / "C.java").write_text("class C {}\n")
+    commit("topic")
+    _git(tmp_path, "checkout", "-q", "main")
+    _git(tmp_path, "mv", "B.java", "Renamed.java")
+    commit("rename")
+    _git(tmp_path, "merge", "-q", "--no-edit", "topic")
+    _git(tmp_path, "rm", "-q", "A.java")
+    commit("delete")
+    (tmp_path / "C.java").write_text("class C { int c; }\n")
+    commit("modify merged")
+    return tmp_path
+
+
+def _per_commit_map(repo, commit_hashes):
+    """以前の実装と同じく、コミットごとに git diff-tree を実行する"""
+    file_commit_map = {}
+    for index, commit_hash in enumerate(commit_hashes):
+        files = _git(
+            repo, "diff-tree", "--no-commit-id", "--name-only", "-r", commit_hash
+        )
+        for file in files.splitlines():
+            if file.endswith(".java"):
+                file_commit_map.setdefault(file, []).append(index)
+    return file_commit_map
+
+
+def test_map_commit_range_matches_diff_tree(repo):
+    calculator = StabilityCalculator(str(repo))
+    calculator.extract_commits()
+    hashes = calculator.commit_hashes
+    expected = _per_commit_map(repo, hashes)
+
+    assert _map_commit_range(repo, 0, hashes) == expected
+    # 名前の変更は変更前と変更後の両方に数える
+    assert "B.java" in expected and "Renamed.java" in expected
+
+    # 区間に分けても同じコミット番号になる
+    shards = [
+        _map_commit_range(repo, 0, hashes[:3]),
+        _map_commit_range(repo, 3, hashes[3:]),
+    ]
+    merged = {}
+    for shard in shards:
+        for file, indexes in shard.items():
+            merged.setdefault(file, []).extend(indexes)
+    assert merged == expected
+
+
+@pytest.mark.parametrize("jobs", [1, 3])
+def test_map_file_changes_matches_diff_tree(repo, jobs):
+    calculator = StabilityCalculator(str(repo))
+    calculator.extract_commits()
+    calculator.map_file_changes(jobs=jobs)
+
+    assert dict(calculator.file_commit_map) == _per_commit_map(
+        repo, calculator.commit_hashes
+    )